@@ -11,13 +11,14 @@
 
 import os
 import pathlib
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from monailabel.config import settings
@@ -29,15 +30,20 @@ from monailabel.endpoints import (
     info,
     login,
     logs,
+    metrics,
     model,
     ohif,
+    profile,
+    progress,
     proxy,
     scoring,
     session,
     train,
     wsi_infer,
 )
+from monailabel.interfaces.exception import InsufficientMemoryException, MONAILabelError, MONAILabelException
 from monailabel.interfaces.utils.app import app_instance, clear_cache
+from monailabel.utils.others.metrics import observe_http
 
 origins = [str(origin) for origin in settings.MONAI_LABEL_CORS_ORIGINS] if settings.MONAI_LABEL_CORS_ORIGINS else ["*"]
 print(f"Allow Origins: {origins}")
@@ -92,11 +98,36 @@ app.include_router(activelearning.router, prefix=settings.MONAI_LABEL_API_STR)
 app.include_router(scoring.router, prefix=settings.MONAI_LABEL_API_STR)
 app.include_router(datastore.router, prefix=settings.MONAI_LABEL_API_STR)
 app.include_router(logs.router, prefix=settings.MONAI_LABEL_API_STR)
+app.include_router(metrics.router, prefix=settings.MONAI_LABEL_API_STR)
+app.include_router(profile.router, prefix=settings.MONAI_LABEL_API_STR)
+app.include_router(progress.router, prefix=settings.MONAI_LABEL_API_STR)
 app.include_router(ohif.router, prefix=settings.MONAI_LABEL_API_STR)
 app.include_router(proxy.router, prefix=settings.MONAI_LABEL_API_STR)
 app.include_router(session.router, prefix=settings.MONAI_LABEL_API_STR)
 
 
+@app.middleware("http")
+async def observe_request_latency(request: Request, call_next):
+    start = time.time()
+    response = await call_next(request)
+
+    route = request.scope.get("route")
+    observe_http(request.method, route.path if route else "unknown", response.status_code, time.time() - start)
+    return response
+
+
+@app.exception_handler(InsufficientMemoryException)
+async def insufficient_memory_handler(request: Request, e: InsufficientMemoryException):
+    return JSONResponse(status_code=503, content={"detail": e.msg}, headers={"Retry-After": "30"})
+
+
+@app.exception_handler(MONAILabelException)
+async def invalid_input_handler(request: Request, e: MONAILabelException):
+    if e.error != MONAILabelError.INVALID_INPUT:
+        raise e
+    return JSONResponse(status_code=400, content={"detail": e.msg})
+
+
 @app.get("/", include_in_schema=False)
 async def custom_swagger_ui_html():
     html = get_swagger_ui_html(openapi_url=app.openapi_url, title=app.title + " - APIs")
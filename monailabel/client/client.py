@@ -455,6 +455,59 @@ class MONAILabelClient:
         logging.debug(f"Response: {response}")
         return json.loads(response)
 
+    def task_progress(self, task_id, since=0, timeout=None):
+        """
+        Stream progress events of a task (Server-Sent Events) until the task is finished
+
+        :param task_id: Task id (or method name e.g. train, batch_infer, scoring for latest task of the method)
+        :param since: Only events after this sequence number
+        :param timeout: Max time (in seconds) to stream the events
+        :return: generator of progress events (json)
+        """
+        params = {"since": since}
+        if timeout:
+            params["timeout"] = timeout
+        selector = f"/progress/{MONAILabelUtils.urllib_quote_plus(task_id)}?{urlencode(params)}"
+
+        conn = MONAILabelUtils.http_connection(self._server_url)
+        try:
+            path = urlparse(self._server_url).path.rstrip("/")
+            headers = dict(self._headers) if self._headers else {}
+            headers["Accept"] = "text/event-stream"
+            conn.request("GET", path + selector, headers=headers)
+
+            response = conn.getresponse()
+            if response.status != 200:
+                raise MONAILabelClientException(
+                    MONAILabelError.SERVER_ERROR,
+                    f"Status: {response.status}; Response: {bytes_to_str(response.read())}",
+                    status_code=response.status,
+                )
+
+            data = []
+            for line in response:
+                line = bytes_to_str(line).rstrip("\r\n")
+                if line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif not line and data:
+                    yield json.loads("\n".join(data))
+                    data = []
+        finally:
+            conn.close()
+
+    def wait_for_task(self, task_id, timeout=None):
+        """
+        Wait for a task to finish (using progress events instead of polling the status)
+
+        :param task_id: Task id (or method name e.g. train, batch_infer, scoring for latest task of the method)
+        :param timeout: Max time (in seconds) to wait
+        :return: last progress event of the task
+        """
+        event = None
+        for event in self.task_progress(task_id, timeout=timeout):
+            logging.debug(f"Progress: {event}")
+        return event
+
 
 class MONAILabelError:
     """
@@ -501,15 +554,9 @@ class MONAILabelUtils:
         selector = path + "/" + selector.lstrip("/")
         logging.debug(f"URI Path: {selector}")
 
-        parsed = urlparse(server_url)
-        if parsed.scheme == "https":
-            logger.debug("Using HTTPS mode")
-            # noinspection PyProtectedMember
-            conn = http.client.HTTPSConnection(parsed.hostname, parsed.port, context=ssl._create_unverified_context())
-        else:
-            conn = http.client.HTTPConnection(parsed.hostname, parsed.port)
+        conn = MONAILabelUtils.http_connection(server_url)
 
-        headers = headers if headers else {}
+        headers = dict(headers) if headers else {}
         if body:
             if not content_type:
                 if isinstance(body, dict):
@@ -522,6 +569,15 @@ class MONAILabelUtils:
         conn.request(method, selector, body=body, headers=headers)
         return MONAILabelUtils.send_response(conn)
 
+    @staticmethod
+    def http_connection(server_url):
+        parsed = urlparse(server_url)
+        if parsed.scheme == "https":
+            logger.debug("Using HTTPS mode")
+            # noinspection PyProtectedMember
+            return http.client.HTTPSConnection(parsed.hostname, parsed.port, context=ssl._create_unverified_context())
+        return http.client.HTTPConnection(parsed.hostname, parsed.port)
+
     @staticmethod
     def http_upload(method, server_url, selector, fields, files, headers=None):
         logging.debug(f"{method} {server_url}{selector}")
@@ -543,7 +599,7 @@ class MONAILabelUtils:
         logging.debug(f"{method} {server_url}{selector}")
 
         content_type, body = MONAILabelUtils.encode_multipart_formdata(fields, files)
-        headers = headers if headers else {}
+        headers = dict(headers) if headers else {}
         headers.update({"content-type": content_type, "content-length": str(len(body))})
 
         parsed = urlparse(server_url)
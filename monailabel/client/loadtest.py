@@ -0,0 +1,322 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from monailabel.client.client import MONAILabelClient
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("infer", "infer_upload", "datastore", "activelearning", "session")
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Percentile (linear interpolation between closest ranks) of the values
+    """
+    v = sorted(values)
+    if not v:
+        return 0.0
+    k = (len(v) - 1) * q / 100.0
+    f, c = math.floor(k), math.ceil(k)
+    return v[int(k)] if f == c else v[f] + (v[c] - v[f]) * (k - f)
+
+
+def latency_stats(values: Sequence[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    return {
+        "mean": round(sum(values) / len(values), 4),
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "p99": round(percentile(values, 99), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse operation mix; e.g. "infer=8,datastore=1,activelearning=1"
+    """
+    result = {}
+    for item in mix.split(","):
+        if not item.strip():
+            continue
+        op, _, weight = item.partition("=")
+        op = op.strip()
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{op}'; supported: {OPERATIONS}")
+        result[op] = float(weight) if weight else 1.0
+    return result
+
+
+class LoadTest:
+    """
+    HTTP load generator for a running MONAI Label server (built on MONAILabelClient).
+
+    Replays a weighted mix of operations (infer, infer with image upload, datastore, activelearning, session upload)
+    either in closed loop (`concurrency` users sending next request when previous one is finished + think time) or
+    in open loop (Poisson arrivals at `rate` requests/sec, independent of server response time).
+
+    In open loop, latency is measured from the scheduled arrival time, so time spent waiting for a free client
+    (when server can't keep up) is included instead of being hidden (coordinated omission).
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        mix: Optional[Dict[str, float]] = None,
+        model: Optional[str] = None,
+        images: Optional[Sequence[str]] = None,
+        image_file: Optional[str] = None,
+        strategy: str = "random",
+        params: Optional[Dict[str, Any]] = None,
+        mode: str = "closed",
+        concurrency: int = 4,
+        rate: float = 1.0,
+        duration: float = 30.0,
+        requests: Optional[int] = None,
+        think_time: float = 0.0,
+        seed: int = 0,
+        client_factory: Optional[Callable[[str, str], MONAILabelClient]] = None,
+    ):
+        self.server_url = server_url
+        self.mix = mix if mix else {"infer": 1.0}
+        self.model = model
+        self.images = list(images) if images else []
+        self.image_file = image_file
+        self.strategy = strategy
+        self.params = params if params else {}
+        self.mode = mode
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.duration = duration
+        self.requests = requests
+        self.think_time = think_time
+        self.seed = seed
+        self.client_factory = client_factory if client_factory else MONAILabelClient
+
+        if mode not in ("closed", "open"):
+            raise ValueError(f"Unknown mode '{mode}'; supported: closed, open")
+        if any(op in self.mix for op in ("infer_upload", "session")) and not image_file:
+            raise ValueError("image_file is required for infer_upload/session operations")
+
+        self._lock = threading.Lock()
+        self._records: List[Dict[str, Any]] = []
+        self._issued = 0
+        self._local = threading.local()
+        self._tmpdir = ""
+
+    def client(self) -> MONAILabelClient:
+        # one client per thread; client keeps headers/result files which are not thread safe
+        c = getattr(self._local, "client", None)
+        if c is None:
+            c = self.client_factory(self.server_url, tempfile.mkdtemp(dir=self._tmpdir))
+            self._local.client = c
+        return c
+
+    def setup(self):
+        c = self.client_factory(self.server_url, self._tmpdir)
+        if any(op.startswith("infer") for op in self.mix) and not self.model:
+            models = list(c.info().get("models", {}).keys())
+            if not models:
+                raise ValueError("No model available on server to run infer")
+            self.model = models[0]
+        if "infer" in self.mix and not self.images:
+            self.images = list(c.datastore().get("objects", {}).keys())
+            if not self.images:
+                raise ValueError("No image available in datastore to run infer")
+
+    def run_op(self, op: str, rng: random.Random):
+        c = self.client()
+        if op == "infer":
+            result_file, _ = c.infer(self.model, rng.choice(self.images), dict(self.params))
+            if result_file and os.path.exists(result_file):
+                os.unlink(result_file)
+        elif op == "infer_upload":
+            image_id = os.path.basename(self.image_file)
+            result_file, _ = c.infer(self.model, image_id, dict(self.params), file=self.image_file)
+            if result_file and os.path.exists(result_file):
+                os.unlink(result_file)
+        elif op == "datastore":
+            c.datastore()
+        elif op == "activelearning":
+            c.next_sample(self.strategy, {})
+        elif op == "session":
+            session = c.create_session(self.image_file)
+            c.remove_session(session["session_id"])
+
+    def _next(self) -> bool:
+        with self._lock:
+            if self.requests is not None and self._issued >= self.requests:
+                return False
+            self._issued += 1
+            return True
+
+    def _execute(self, op: str, rng: random.Random, scheduled: Optional[float] = None):
+        start = time.perf_counter()
+        error = None
+        try:
+            self.run_op(op, rng)
+        except Exception as e:
+            error = type(e).__name__
+            logger.debug(f"{op} failed: {e}")
+        end = time.perf_counter()
+
+        record = {
+            "op": op,
+            "start": start,
+            "latency": end - (scheduled if scheduled is not None else start),
+            "service": end - start,
+            "error": error,
+        }
+        with self._lock:
+            self._records.append(record)
+
+    def _user(self, uid: int, deadline: float):
+        rng = random.Random(self.seed + uid)
+        ops, weights = list(self.mix.keys()), list(self.mix.values())
+        while time.perf_counter() < deadline and self._next():
+            self._execute(rng.choices(ops, weights)[0], rng)
+            if self.think_time > 0:
+                time.sleep(rng.expovariate(1.0 / self.think_time))
+
+    def _run_closed(self, deadline: float):
+        threads = [threading.Thread(target=self._user, args=(i, deadline), daemon=True) for i in range(self.concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def _run_open(self, deadline: float):
+        rng = random.Random(self.seed)
+        ops, weights = list(self.mix.keys()), list(self.mix.values())
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="LoadTest") as executor:
+            scheduled = time.perf_counter()
+            while self._next():
+                scheduled += rng.expovariate(self.rate)
+                if scheduled >= deadline:
+                    break
+                time.sleep(max(0.0, scheduled - time.perf_counter()))
+                op_rng = random.Random(rng.random())
+                executor.submit(self._execute, rng.choices(ops, weights)[0], op_rng, scheduled)
+
+    def run(self) -> Dict[str, Any]:
+        self._tmpdir = tempfile.mkdtemp(prefix="monailabel-loadtest-")
+        self._records = []
+        self._issued = 0
+        try:
+            self.setup()
+            start = time.perf_counter()
+            deadline = start + self.duration if self.duration else math.inf
+            if self.mode == "open":
+                self._run_open(deadline)
+            else:
+                self._run_closed(deadline)
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        def summary(records):
+            errors = [r for r in records if r["error"]]
+            ok = [r for r in records if not r["error"]]
+            by_type: Dict[str, int] = {}
+            for r in errors:
+                by_type[r["error"]] = by_type.get(r["error"], 0) + 1
+            return {
+                "count": len(records),
+                "errors": len(errors),
+                "error_rate": round(len(errors) / len(records), 4) if records else 0.0,
+                "throughput": round(len(ok) / elapsed, 4) if elapsed else 0.0,
+                "latency": latency_stats([r["latency"] for r in ok]),
+                "service": latency_stats([r["service"] for r in ok]),
+                "error_types": by_type,
+            }
+
+        ops = sorted({r["op"] for r in self._records})
+        return {
+            "config": {
+                "server_url": self.server_url,
+                "mode": self.mode,
+                "mix": self.mix,
+                "model": self.model,
+                "concurrency": self.concurrency,
+                "rate": self.rate if self.mode == "open" else None,
+                "duration": self.duration,
+                "requests": self.requests,
+                "think_time": self.think_time,
+            },
+            "elapsed": round(elapsed, 4),
+            **summary(self._records),
+            "ops": {op: summary([r for r in self._records if r["op"] == op]) for op in ops},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser("monailabel.client.loadtest")
+    parser.add_argument("-s", "--server", default="http://127.0.0.1:8000", help="MONAI Label Server URL")
+    parser.add_argument("--mix", default="infer=1", help=f"Weighted mix of operations {OPERATIONS}; e.g. infer=8,datastore=1")
+    parser.add_argument("-m", "--model", default=None, help="Model for infer (default: first model)")
+    parser.add_argument("-i", "--images", nargs="+", default=None, help="Image ids for infer (default: all)")
+    parser.add_argument("-f", "--image_file", default=None, help="Image file for infer_upload/session operations")
+    parser.add_argument("--strategy", default="random", help="Active learning strategy")
+    parser.add_argument("--params", default="{}", help="Additional infer params (json)")
+    parser.add_argument("--mode", default="closed", choices=["closed", "open"], help="Arrival mode")
+    parser.add_argument("-c", "--concurrency", default=4, type=int, help="Users (closed) or max in-flight (open)")
+    parser.add_argument("-r", "--rate", default=1.0, type=float, help="Arrival rate (requests/sec) in open mode")
+    parser.add_argument("-d", "--duration", default=30.0, type=float, help="Duration (seconds)")
+    parser.add_argument("-n", "--requests", default=None, type=int, help="Max number of requests")
+    parser.add_argument("--think_time", default=0.0, type=float, help="Mean think time (seconds) in closed mode")
+    parser.add_argument("--seed", default=0, type=int, help="Random seed")
+    parser.add_argument("-o", "--output", default=None, help="Output json file (default: print to stdout)")
+    args = parser.parse_args()
+
+    result = LoadTest(
+        server_url=args.server,
+        mix=parse_mix(args.mix),
+        model=args.model,
+        images=args.images,
+        image_file=args.image_file,
+        strategy=args.strategy,
+        params=json.loads(args.params),
+        mode=args.mode,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        requests=args.requests,
+        think_time=args.think_time,
+        seed=args.seed,
+    ).run()
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as fc:
+            fc.write(output)
+        print(f"Load test result is saved at: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
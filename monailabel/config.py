@@ -46,6 +46,12 @@ class Settings(BaseSettings):
     MONAI_LABEL_TASKS_STRATEGY: bool = True
     MONAI_LABEL_TASKS_SCORING: bool = True
     MONAI_LABEL_TASKS_BATCH_INFER: bool = True
+    MONAI_LABEL_TASKS_BATCH_INFER_JOURNAL_PATH: str = ""  # progress journals (resume); default ~/.cache/monailabel
+    MONAI_LABEL_TASKS_BATCH_INFER_JOURNAL_EXPIRY: int = 7 * 24 * 3600  # seconds since last update; 0 => never
+    MONAI_LABEL_TASKS_WORKERS: bool = False  # run scoring/batch infer in warm (long-lived) app processes
+    MONAI_LABEL_TASKS_WORKER_MAX_TASKS: int = 20  # recycle worker after these many tasks
+    MONAI_LABEL_TASKS_WORKER_MAX_MEMORY_GROWTH: int = 4096  # MB; recycle worker if RSS grows beyond (vs first task)
+    MONAI_LABEL_TASKS_WORKER_IDLE_TIMEOUT: int = 600  # seconds; idle worker (holding models) is stopped
 
     MONAI_LABEL_DATASTORE: str = ""
     MONAI_LABEL_DATASTORE_URL: str = ""
@@ -88,6 +94,8 @@ class Settings(BaseSettings):
     MONAI_LABEL_CORS_ORIGINS: List[AnyHttpUrl] = []
 
     MONAI_LABEL_AUTO_UPDATE_SCORING: bool = True
+    MONAI_LABEL_AUTO_UPDATE_SCORING_DEBOUNCE: float = 5  # seconds; triggers within are merged into one run
+    MONAI_LABEL_AUTO_UPDATE_SCORING_MIN_INTERVAL: float = 60  # seconds; min gap between auto scoring runs
 
     MONAI_LABEL_SESSIONS: bool = True
     MONAI_LABEL_SESSION_PATH: str = ""
@@ -95,6 +103,38 @@ class Settings(BaseSettings):
 
     MONAI_LABEL_INFER_CONCURRENCY: int = -1
     MONAI_LABEL_INFER_TIMEOUT: int = 600
+    MONAI_LABEL_INFER_RESULT_CACHE: bool = False
+    MONAI_LABEL_INFER_RESULT_CACHE_PATH: str = ""
+    MONAI_LABEL_INFER_RESULT_CACHE_SIZE: int = 1024  # MB; 0 => no limit
+    MONAI_LABEL_INFER_DATA_CACHE_SIZE: int = 2048  # MB; in-memory cache of pre-processed input; 0 => no limit
+    MONAI_LABEL_INFER_MEMORY_INTERVAL: float = 0.005  # memory sampling interval (admission/profiling); 0 => per stage
+    MONAI_LABEL_INFER_ADMISSION: bool = False  # admit/queue/reject infer requests based on estimated memory
+    MONAI_LABEL_INFER_ADMISSION_HEADROOM: float = 0.1  # fraction of available memory kept free
+    MONAI_LABEL_INFER_ADMISSION_TIMEOUT: float = 60.0  # max seconds a request waits for memory before rejected
+    MONAI_LABEL_WSI_SLIDE_POOL_SIZE: int = 16  # max slides kept open (shared handles); 0 => open per read
+    MONAI_LABEL_WSI_READ_AHEAD: int = 4  # tiles read ahead while model runs on current tile; 0 => disable
+    MONAI_LABEL_WSI_TISSUE_THRESHOLD: float = 0.0  # skip tiles with less tissue (fraction); 0 => infer all tiles
+    MONAI_LABEL_WSI_BATCH_SIZE: int = 1  # tiles per forward (<= max_workers); 0 => auto (free gpu memory); 1 => off
+    MONAI_LABEL_WSI_ANNOTATIONS_GZIP: bool = False  # write wsi annotations (dsa/asap) as .gz
+    MONAI_LABEL_WSI_MERGE_SEAMS: bool = False  # merge polygons cut at tile borders (across adjacent tiles)
+    MONAI_LABEL_WSI_TILE_CACHE: bool = False  # cache results (contours) per tile; tiles are aligned to slide grid
+    MONAI_LABEL_WSI_TILE_CACHE_PATH: str = ""
+    MONAI_LABEL_WSI_TILE_CACHE_SIZE: int = 512  # MB; 0 => no limit
+
+    MONAI_LABEL_MODELS_MAX_MEMORY: int = 0  # MB; 0 => no limit (LRU eviction beyond this)
+    MONAI_LABEL_MODELS_MAX_LOADED: int = 16  # max networks (model x device x backend) loaded; 0 => no limit
+    MONAI_LABEL_MODELS_WATCH: bool = True
+    MONAI_LABEL_MODELS_WARMUP: bool = False
+    MONAI_LABEL_MODELS_LOAD_WORKERS: int = 1
+    MONAI_LABEL_METRICS: bool = True  # prometheus metrics at /metrics
+    MONAI_LABEL_METRICS_MULTIPROC_DIR: str = ""  # shared by all workers; temp dir is used if not set
+    MONAI_LABEL_METRICS_TOKEN: str = ""  # bearer token for scrapers at /metrics (in addition to admin role)
+    MONAI_LABEL_METRICS_PUBLIC: bool = False  # /metrics without auth (e.g. server only on a private network)
+    MONAI_LABEL_PROFILE_PATH: str = ""
+    MONAI_LABEL_PROFILE_SAMPLE_RATE: float = 0.0  # fraction of infer requests profiled automatically
+    MONAI_LABEL_PROFILE_MIN_INTERVAL: float = 60.0  # seconds between two captures
+    MONAI_LABEL_PROFILE_MAX_FILES: int = 20
+    MONAI_LABEL_PROFILE_STACK_INTERVAL: float = 0.01  # python stack sampling interval (seconds); 0 => disable
     MONAI_LABEL_TRACKING_ENABLED: bool = True
     MONAI_LABEL_TRACKING_URI: str = ""
 
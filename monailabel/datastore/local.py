@@ -20,7 +20,7 @@ import shutil
 import tempfile
 import time
 import zipfile
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from filelock import FileLock
 from pydantic import BaseModel
@@ -483,10 +483,35 @@ class LocalDatastore(Datastore):
         :param label_info: additional info for the label
         :return: the label id for the given label filename
         """
+        return self._save_labels([(image_id, label_filename, label_tag, label_info)])[0]
+
+    def save_labels(self, labels: Sequence[Tuple[str, str, str, Dict[str, Any]]]) -> List[str]:
+        """
+        Save multiple labels with a single update of the datastore file
+
+        :param labels: list of (image_id, label_filename, label_tag, label_info)
+        :return: the label ids for the given labels
+        """
+        # sub-class (e.g. DICOMWeb) saves label in its own way
+        if type(self).save_label is not LocalDatastore.save_label:
+            return super().save_labels(labels)
+        return self._save_labels(labels)
+
+    def _save_labels(self, labels: Sequence[Tuple[str, str, str, Dict[str, Any]]]) -> List[str]:
+        for image_id, _, _, _ in labels:
+            if not self._datastore.objects.get(image_id):
+                raise ImageNotFoundException(f"Image {image_id} not found")
+
+        with FileLock(self._lock_file):
+            logger.debug("Acquired the lock!")
+            label_ids = [self._add_label(*label) for label in labels]
+            self._update_datastore_file(lock=False)
+        logger.debug("Release the lock!")
+        return label_ids
+
+    def _add_label(self, image_id: str, label_filename: str, label_tag: str, label_info: Dict[str, Any]) -> str:
         logger.info(f"Saving Label for Image: {image_id}; Tag: {label_tag}; Info: {label_info}")
-        obj = self._datastore.objects.get(image_id)
-        if not obj:
-            raise ImageNotFoundException(f"Image {image_id} not found")
+        obj = self._datastore.objects[image_id]
 
         _, label_ext = self._to_id(os.path.basename(label_filename))
         label_id = image_id
@@ -496,20 +521,16 @@ class LocalDatastore(Datastore):
         name = self._filename(image_id, label_ext)
         dest = os.path.join(label_path, name)
 
-        with FileLock(self._lock_file):
-            logger.debug("Acquired the lock!")
-            os.makedirs(label_path, exist_ok=True)
-            shutil.copy(label_filename, dest)
+        os.makedirs(label_path, exist_ok=True)
+        shutil.copy(label_filename, dest)
 
-            label_info = label_info if label_info else {}
-            label_info["ts"] = int(time.time())
-            # label_info["checksum"] = file_checksum(dest)
-            label_info["name"] = name
+        label_info = label_info if label_info else {}
+        label_info["ts"] = int(time.time())
+        # label_info["checksum"] = file_checksum(dest)
+        label_info["name"] = name
 
-            obj.labels[label_tag] = DataModel(info=label_info, ext=label_ext)
-            logger.info(f"Label Info: {label_info}")
-            self._update_datastore_file(lock=False)
-        logger.debug("Release the lock!")
+        obj.labels[label_tag] = DataModel(info=label_info, ext=label_ext)
+        logger.info(f"Label Info: {label_info}")
         return label_id
 
     def remove_label(self, label_id: str, label_tag: str) -> None:
@@ -20,7 +20,7 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from fastapi.background import BackgroundTasks
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from requests_toolbelt import MultipartEncoder
 
 from monailabel.config import RBAC_USER, settings
@@ -109,8 +109,26 @@ def send_response(datastore, result, output, background_tasks):
         logger.info(f"Return only Result Json as Result Image is not available: {res_img}")
         return res_json
 
+    # Stream multipart body (label is read from disk in chunks) instead of building it in memory
     return_message = MultipartEncoder(fields=res_fields)
-    return Response(content=return_message.to_string(), media_type=return_message.content_type)
+    return StreamingResponse(
+        stream_multipart(return_message),
+        media_type=return_message.content_type,
+        headers={"Content-Length": str(return_message.len)},
+    )
+
+
+def stream_multipart(encoder: MultipartEncoder, chunk_size=1024 * 1024):
+    try:
+        while True:
+            chunk = encoder.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        for field in encoder.fields.values():
+            if hasattr(field[1], "close"):
+                field[1].close()
 
 
 def run_inference(
@@ -165,6 +183,7 @@ def run_inference(
         if session:
             request["image"] = session.image
             request["session"] = session.to_json()
+            request["session_id"] = session_id
 
     logger.info(f"Infer Request: {request}")
     result = instance.infer(request)
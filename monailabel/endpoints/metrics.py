@@ -0,0 +1,59 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
+
+from monailabel.config import RBAC_ADMIN, settings
+from monailabel.endpoints.user.auth import RBAC, get_current_user
+from monailabel.utils.others.metrics import generate_latest, server_metrics
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Others"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+def get_metrics():
+    if server_metrics() is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+
+    content, media_type = generate_latest()
+    return Response(content=content, media_type=media_type)
+
+
+async def metrics_access(request: Request):
+    """
+    Access to metrics: admin role (default), scrape token (`MONAI_LABEL_METRICS_TOKEN`) sent as bearer token or
+    anyone if `MONAI_LABEL_METRICS_PUBLIC` is set e.g. for a prometheus scrape config::
+
+        authorization:
+          credentials: <MONAI_LABEL_METRICS_TOKEN>
+    """
+    if settings.MONAI_LABEL_METRICS_PUBLIC or not settings.MONAI_LABEL_AUTH_ENABLE:
+        return
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    token = token.strip() if scheme.lower() == "bearer" else ""
+    scrape_token = settings.MONAI_LABEL_METRICS_TOKEN
+    if scrape_token and token and hmac.compare_digest(token.encode(), scrape_token.encode()):
+        return
+
+    user = await get_current_user(token)
+    await RBAC(settings.MONAI_LABEL_AUTH_ROLE_ADMIN)(user)
+
+
+@router.get("/", summary=f"{RBAC_ADMIN}Get Server Metrics (Prometheus); or use scrape token")
+async def api_get_metrics(access=Depends(metrics_access)):
+    return get_metrics()
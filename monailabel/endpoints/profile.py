@@ -0,0 +1,86 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.background import BackgroundTasks
+from fastapi.responses import FileResponse
+
+from monailabel.config import RBAC_ADMIN, settings
+from monailabel.endpoints.user.auth import RBAC, User
+from monailabel.interfaces.app import MONAILabelApp
+from monailabel.interfaces.utils.app import app_instance
+from monailabel.utils.others.generic import remove_file
+from monailabel.utils.others.profiler import profiler
+
+router = APIRouter(
+    prefix="/profile",
+    tags=["Others"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+def list_profiles():
+    return {"armed": profiler().armed(), "profiles": profiler().list()}
+
+
+def arm_profile(model: str, count: int = 1):
+    instance: MONAILabelApp = app_instance()
+    if model not in instance.info()["models"]:
+        raise HTTPException(status_code=404, detail=f"Model '{model}' NOT Found")
+    return {"armed": profiler().arm(model, count)}
+
+
+def download_profile(background_tasks: BackgroundTasks, profile_id: str):
+    path = profiler().get(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' NOT Found")
+
+    archive = shutil.make_archive(os.path.join(tempfile.mkdtemp(), profile_id), "zip", path)
+    background_tasks.add_task(remove_file, os.path.dirname(archive))
+    return FileResponse(archive, media_type="application/zip", filename=os.path.basename(archive))
+
+
+def remove_profile(profile_id: str):
+    if not profiler().remove(profile_id):
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' NOT Found")
+    return {}
+
+
+@router.get("/", summary=f"{RBAC_ADMIN}List captured Profiles")
+async def api_list_profiles(user: User = Depends(RBAC(settings.MONAI_LABEL_AUTH_ROLE_ADMIN))):
+    return list_profiles()
+
+
+@router.put("/model/{model}", summary=f"{RBAC_ADMIN}Profile next N infer requests of the model")
+async def api_arm_profile(
+    model: str,
+    count: int = 1,
+    user: User = Depends(RBAC(settings.MONAI_LABEL_AUTH_ROLE_ADMIN)),
+):
+    return arm_profile(model, count)
+
+
+@router.get("/{profile_id}", summary=f"{RBAC_ADMIN}Download Profile (trace, stacks and summary as ZIP archive)")
+async def api_download_profile(
+    background_tasks: BackgroundTasks,
+    profile_id: str,
+    user: User = Depends(RBAC(settings.MONAI_LABEL_AUTH_ROLE_ADMIN)),
+):
+    return download_profile(background_tasks, profile_id)
+
+
+@router.delete("/{profile_id}", summary=f"{RBAC_ADMIN}Remove Profile")
+async def api_remove_profile(profile_id: str, user: User = Depends(RBAC(settings.MONAI_LABEL_AUTH_ROLE_ADMIN))):
+    return remove_profile(profile_id)
@@ -0,0 +1,72 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
+
+from monailabel.config import RBAC_USER, settings
+from monailabel.endpoints.user.auth import RBAC, User
+from monailabel.utils.async_tasks.progress import progress_tracker
+from monailabel.utils.async_tasks.utils import tasks
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/progress",
+    tags=["Others"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+def resolve_task_id(task_id: str) -> str:
+    # method name (train, batch_infer, scoring) => latest task of the method
+    t = tasks(task_id)
+    return t[-1]["id"] if t else task_id
+
+
+async def sse_events(task_id: str, since: int = 0, timeout: Optional[float] = None, keepalive: float = 15.0):
+    # async generator; an open stream does not hold a threadpool thread while waiting for events
+    async for event in progress_tracker().aevents(task_id, since=since, timeout=timeout, keepalive=keepalive):
+        if event is None:
+            yield ": keep-alive\n\n"
+            continue
+        yield f"id: {event['seq']}\nevent: progress\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def progress(task_id: str, since: int = 0, timeout: Optional[float] = None, last_event_id: Optional[str] = None):
+    task_id = resolve_task_id(task_id)
+    if progress_tracker().last(task_id) is None:
+        raise HTTPException(status_code=404, detail=f"Task '{task_id}' NOT Found")
+
+    # resume from the last event received by client (on reconnect)
+    if last_event_id and last_event_id.isdigit():
+        since = max(since, int(last_event_id))
+
+    return StreamingResponse(
+        sse_events(task_id, since, timeout),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{task_id}", summary=f"{RBAC_USER}Stream Progress of Task (Server-Sent Events)")
+async def api_progress(
+    task_id: str,
+    since: int = 0,
+    timeout: Optional[float] = None,
+    last_event_id: Optional[str] = Header(None),
+    user: User = Depends(RBAC(settings.MONAI_LABEL_AUTH_ROLE_USER)),
+):
+    return progress(task_id, since, timeout, last_event_id)
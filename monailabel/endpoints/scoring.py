@@ -49,7 +49,12 @@ def run(params: Optional[dict] = None, run_sync: Optional[bool] = False):
     return result
 
 
-def run_method(method: str, params: Optional[dict] = None, run_sync: Optional[bool] = False):
+def run_method(method: str, params: Optional[dict] = None, run_sync: Optional[bool] = False, debounce: bool = False):
+    if debounce:
+        instance: MONAILabelApp = app_instance()
+        images = params.get("images") if params else None
+        return instance.auto_scoring(images, method)
+
     res, detail = AsyncTask.run("scoring", request={"method": method}, params=params, force_sync=run_sync)
     if res is None:
         raise HTTPException(status_code=429, detail=detail)
@@ -88,9 +93,10 @@ async def api_run_method(
     method: str,
     params: Optional[dict] = None,
     run_sync: Optional[bool] = False,
+    debounce: bool = False,
     user: User = Depends(RBAC(settings.MONAI_LABEL_AUTH_ROLE_ANNOTATOR)),
 ):
-    return run_method(method, params, run_sync)
+    return run_method(method, params, run_sync, debounce)
 
 
 @router.delete("/", summary=f"{RBAC_ANNOTATOR}Stop Scoring Task")
@@ -8,6 +8,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import gzip
 import json
 import logging
 import os
@@ -17,9 +18,9 @@ import tempfile
 from enum import Enum
 from typing import Optional, Sequence, Union
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from fastapi.background import BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from monailabel.config import RBAC_USER, settings
@@ -52,7 +53,20 @@ class ResultType(str, Enum):
     json = "json"
 
 
-def send_response(datastore, result, output, background_tasks):
+def accepts_gzip(request: Optional[Request]) -> bool:
+    return request is not None and "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def _read_gzip(file, chunk_size=1024 * 1024):
+    with gzip.open(file, "rb") as fp:
+        while True:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def send_response(datastore, result, output, background_tasks, accept_gzip=False):
     res_img = result.get("file") if result.get("file") else result.get("label")
     res_json = result.get("params")
 
@@ -65,6 +79,15 @@ def send_response(datastore, result, output, background_tasks):
     if not res_img or output == "json":
         return res_json
 
+    # gzip annotations are sent as is (content-encoding) if client accepts; otherwise decompressed on the fly
+    if res_img.endswith(".gz"):
+        filename = os.path.basename(res_img)[:-3]
+        m_type = get_mime_type(filename)
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+        if accept_gzip:
+            return FileResponse(res_img, media_type=m_type, headers={**headers, "Content-Encoding": "gzip"})
+        return StreamingResponse(_read_gzip(res_img), media_type=m_type, headers=headers)
+
     m_type = get_mime_type(res_img)
     return FileResponse(res_img, media_type=m_type, filename=os.path.basename(res_img))
 
@@ -77,6 +100,7 @@ def run_wsi_inference(
     file: Union[UploadFile, None] = None,
     wsi: WSIInput = WSIInput(),
     output: Optional[ResultType] = ResultType.dsa,
+    accept_gzip: bool = False,
 ):
     request = {"model": model, "image": image, "output": output.value if output else None}
 
@@ -111,7 +135,7 @@ def run_wsi_inference(
     result = instance.infer_wsi(request)
     if result is None:
         raise HTTPException(status_code=500, detail="Failed to execute wsi infer")
-    return send_response(instance.datastore(), result, output, background_tasks)
+    return send_response(instance.datastore(), result, output, background_tasks, accept_gzip)
 
 
 @router.post(
@@ -121,6 +145,7 @@ def run_wsi_inference(
     deprecated=True,
 )
 async def api_run_wsi_inference(
+    request: Request,
     background_tasks: BackgroundTasks,
     model: str,
     image: str = "",
@@ -129,11 +154,12 @@ async def api_run_wsi_inference(
     output: Optional[ResultType] = None,
     user: User = Depends(RBAC(settings.MONAI_LABEL_AUTH_ROLE_USER)),
 ):
-    return run_wsi_inference(background_tasks, model, image, session_id, None, wsi, output)
+    return run_wsi_inference(background_tasks, model, image, session_id, None, wsi, output, accepts_gzip(request))
 
 
 @router.post("/wsi_v2/{model}", summary=f"{RBAC_USER}Run WSI Inference for supported model")
 async def api_run_wsi_v2_inference(
+    request: Request,
     background_tasks: BackgroundTasks,
     model: str,
     image: str = "",
@@ -144,4 +170,4 @@ async def api_run_wsi_v2_inference(
     user: User = Depends(RBAC(settings.MONAI_LABEL_AUTH_ROLE_USER)),
 ):
     w = WSIInput.parse_obj(json.loads(wsi))
-    return run_wsi_inference(background_tasks, model, image, session_id, file, w, output)
+    return run_wsi_inference(background_tasks, model, image, session_id, file, w, output, accepts_gzip(request))
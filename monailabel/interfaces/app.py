@@ -17,10 +17,11 @@ import platform
 import random
 import shutil
 import tempfile
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
-from typing import Any, Callable, Dict, Optional, Sequence, Union
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
 
 import requests
 import schedule
@@ -45,10 +46,16 @@ from monailabel.interfaces.tasks.infer_v2 import InferTask
 from monailabel.interfaces.tasks.scoring import ScoringMethod
 from monailabel.interfaces.tasks.strategy import Strategy
 from monailabel.interfaces.tasks.train import TrainTask
-from monailabel.interfaces.utils.wsi import create_infer_wsi_tasks
+from monailabel.interfaces.utils.wsi import coarse_regions, create_infer_wsi_tasks, filter_wsi_tasks
 from monailabel.tasks.activelearning.random import Random
+from monailabel.tasks.infer.basic_infer import BasicInferTask
+from monailabel.tasks.infer.batching import DynamicBatcher, register_batcher, unregister_batcher
+from monailabel.tasks.infer.precision import InferPrecision
 from monailabel.tasks.train.bundle import BundleTrainTask
+from monailabel.transform.writer import label_encoding
+from monailabel.utils.async_tasks.progress import progress_tracker, report_progress
 from monailabel.utils.async_tasks.task import AsyncTask
+from monailabel.utils.async_tasks.trigger import CoalescingTrigger
 from monailabel.utils.others.generic import (
     file_checksum,
     handle_torch_linalg_multithread,
@@ -56,7 +63,11 @@ from monailabel.utils.others.generic import (
     name_to_device,
     strtobool,
 )
-from monailabel.utils.others.pathology import create_asap_annotations_xml, create_dsa_annotations_json
+from monailabel.utils.others.memory import image_voxels, memory_admission
+from monailabel.utils.others.metrics import infer_queued, observe_cache, observe_infer, time_datastore, track_inflight
+from monailabel.utils.others.pathology import ASAPAnnotationWriter, DSAAnnotationWriter, SeamMerger, filter_region
+from monailabel.utils.others.result_cache import content_digest, result_cache, slide_fingerprint, tile_cache
+from monailabel.utils.others.slides import TileReadAhead, slide_pool
 from monailabel.utils.sessions import Sessions
 
 logger = logging.getLogger(__name__)
@@ -105,6 +116,14 @@ class MONAILabelApp:
         self._batch_infer = self.init_batch_infer() if settings.MONAI_LABEL_TASKS_BATCH_INFER else {}
 
         self._auto_update_scoring = settings.MONAI_LABEL_AUTO_UPDATE_SCORING
+        self._scoring_trigger = CoalescingTrigger(
+            self._run_auto_scoring,
+            debounce=settings.MONAI_LABEL_AUTO_UPDATE_SCORING_DEBOUNCE,
+            min_interval=settings.MONAI_LABEL_AUTO_UPDATE_SCORING_MIN_INTERVAL,
+            busy=self._auto_scoring_busy,
+        )
+        self._scoring_tasks: Dict[Hashable, Any] = {}
+        self._scoring_models: Optional[Tuple] = None
         self._sessions = self._load_sessions(load=settings.MONAI_LABEL_SESSIONS)
 
         self._infers_threadpool = (
@@ -277,16 +296,24 @@ class MONAILabelApp:
                 f"Inference Task is not Initialized. There is no model '{model}' available",
             )
 
-        request = copy.deepcopy(request)
+        # pre-transformed data (batch infer) is shared as is
+        request = {k: v if k == "_prepared" else copy.deepcopy(v) for k, v in request.items()}
         request["description"] = task.description
 
+        datastore = datastore if datastore else self.datastore()
+        cache_key = self._result_cache_key(task, request, datastore)
+        cached = result_cache().get(cache_key) if cache_key else None
+        if cache_key:
+            observe_cache("result", cached is not None)
+
         image_id = request["image"]
         if isinstance(image_id, str):
-            datastore = datastore if datastore else self.datastore()
             if os.path.exists(image_id):
                 request["save_label"] = False
-            else:
-                request["image"] = datastore.get_image_uri(request["image"])
+            elif cached is None:
+                with time_datastore("get_image_uri"):
+                    request["image"] = datastore.get_image_uri(request["image"])
+                request["image_id"] = image_id
 
             if os.path.isdir(request["image"]):
                 logger.info("Input is a Directory; Consider it as DICOM")
@@ -294,31 +321,96 @@ class MONAILabelApp:
             logger.debug(f"Image => {request['image']}")
         else:
             request["save_label"] = False
-
-        if self._infers_threadpool:
-
-            def run_infer_in_thread(t, r):
-                handle_torch_linalg_multithread(r)
-                return t(r)
-
-            f = self._infers_threadpool.submit(run_infer_in_thread, t=task, r=request)
-            result_file_name, result_json = f.result(request.get("timeout", settings.MONAI_LABEL_INFER_TIMEOUT))
-        else:
-            result_file_name, result_json = task(request)
+        label_encoding(request)
+
+        # reserve (learned) memory footprint of the request; waits or rejects when server is running out of memory
+        admission = None
+        if cached is None and strtobool(request.get("admission", settings.MONAI_LABEL_INFER_ADMISSION)):
+            admission = memory_admission()
+        voxels = image_voxels(request) if admission else None
+        admission_wait = time.time()
+        ticket = admission.admit(model, voxels, request.get("device", "cuda")) if admission else None
+        admission_wait = time.time() - admission_wait
+
+        try:
+            if cached is not None:
+                logger.info(f"Using cached result for model: {model}; image: {image_id}")
+                result_file_name, result_json = cached
+                result_json["result_cache"] = "hit"
+            elif self._infers_threadpool:
+
+                def run_infer_in_thread(t, r):
+                    infer_queued(-1)
+                    handle_torch_linalg_multithread(r)
+                    with track_inflight(model):
+                        return t(r)
+
+                infer_queued(1)
+                f = self._infers_threadpool.submit(run_infer_in_thread, t=task, r=request)
+                result_file_name, result_json = f.result(request.get("timeout", settings.MONAI_LABEL_INFER_TIMEOUT))
+            else:
+                with track_inflight(model):
+                    result_file_name, result_json = task(request)
+        except Exception:
+            observe_infer(model, None, status="error")
+            raise
+        finally:
+            if admission:
+                admission.release(ticket)
+        observe_infer(model, result_json, status="cache_hit" if cached is not None else "ok")
+
+        if admission:
+            admission.learn_from_result(model, voxels, result_json, ticket)
+            latencies = result_json.get("latencies") if isinstance(result_json, dict) else None
+            if ticket and ticket.need and isinstance(latencies, dict):
+                latencies["admission_wait"] = round(admission_wait, 2)
+
+        if cache_key and cached is None:
+            result_cache().put(cache_key, model, _model_version(task), result_file_name, result_json)
 
         label_id = None
         if result_file_name and os.path.exists(result_file_name):
             tag = request.get("label_tag", DefaultLabelTag.ORIGINAL)
             save_label = request.get("save_label", False)
             if save_label:
-                label_id = datastore.save_label(
-                    image_id, result_file_name, tag, {"model": model, "params": result_json}
-                )
+                with time_datastore("save_label"):
+                    label_id = datastore.save_label(
+                        image_id, result_file_name, tag, {"model": model, "params": result_json}
+                    )
             else:
                 label_id = result_file_name
 
         return {"label": label_id, "tag": DefaultLabelTag.ORIGINAL, "file": result_file_name, "params": result_json}
 
+    def _result_cache_key(self, task, request, datastore) -> Optional[str]:
+        """
+        Key to memoize infer result (model version + image content + params); None if result should not be cached
+        """
+        if not strtobool(request.get("result_cache", settings.MONAI_LABEL_INFER_RESULT_CACHE)):
+            return None
+
+        image = request.get("image")
+        version = _model_version(task)
+        # uploaded label/session state makes result depend on more than image and params
+        if not version or not isinstance(image, str) or request.get("label") or request.get("session_id"):
+            return None
+        if strtobool(request.get("profile", False)):
+            return None
+
+        try:
+            if os.path.exists(image):
+                image_key = content_digest(image)
+            elif isinstance(datastore, (DICOMWebDatastore, DSADatastore, XNATDatastore)):
+                # content of remote image is immutable; avoid fetching it
+                image_key = f"{datastore.__class__.__name__}:{image}"
+            else:
+                image_key = content_digest(datastore.get_image_uri(image))
+        except Exception as e:
+            logger.info(f"Result cache ignored; failed to compute image checksum: {e}")
+            return None
+
+        return result_cache().key(request["model"], version, image_key, request)
+
     def batch_infer(self, request, datastore=None):
         """
         Run batch inference for an existing pre-trained model.
@@ -342,7 +434,22 @@ class MONAILabelApp:
         Returns:
             JSON containing `label` and `params`
         """
-        return self._batch_infer(request, datastore if datastore else self.datastore(), self.infer)
+        # progress journal (resume) is only valid for the same model checkpoint
+        version = _model_version(self._infers.get(request.get("model")))
+        if version:
+            request = {**request, "model_version": version}
+        return self._batch_infer(
+            request, datastore if datastore else self.datastore(), self.infer, prepare=self.prepare_infer
+        )
+
+    def prepare_infer(self, request) -> Optional[Dict[str, Any]]:
+        """
+        Run pre transforms for the infer request ahead (if the model supports it); pass the result as `_prepared` in
+        the request to `infer`. Used by batch infer to overlap loading/decoding of next images with infer.
+        """
+        task = self._infers.get(request.get("model"))
+        prepare = getattr(task, "prepare", None)
+        return prepare(request) if callable(prepare) else None
 
     def scoring(self, request, datastore=None):
         """
@@ -422,9 +529,9 @@ class MONAILabelApp:
         request = copy.deepcopy(request)
         result = task(request, self.datastore())
 
-        # Run all scoring methods
+        # Run all scoring methods (model has changed)
         if self._auto_update_scoring:
-            self.async_scoring(None)
+            self.auto_scoring()
         return result
 
     def next_sample(self, request):
@@ -459,18 +566,28 @@ class MONAILabelApp:
 
         res["path"] = self._datastore.get_image_uri(res["id"])
 
-        # Run all scoring methods
+        # Run all scoring methods (only if model has changed since last run)
         if self._auto_update_scoring:
-            self.async_scoring(None)
+            self.auto_scoring([])
 
         return res
 
     def on_init_complete(self):
         logger.info("App Init - completed")
 
+        # Load/Warm up models in background
+        if settings.MONAI_LABEL_MODELS_WARMUP:
+            for task in self._infers.values():
+                task.warmup()
+
+        # Calibrate (static int8) models in background using sample images from datastore
+        for task in self._infers.values():
+            if isinstance(task, BasicInferTask) and task.precision == InferPrecision.INT8_STATIC:
+                threading.Thread(target=task.calibrate, args=(self.datastore(),), daemon=True).start()
+
         # Run all scoring methods
         if self._auto_update_scoring:
-            self.async_scoring(None)
+            self.auto_scoring()
 
         # Run Cleanup Jobs
         def cleanup_sessions(instance):
@@ -492,6 +609,10 @@ class MONAILabelApp:
         """
         logger.info(f"New label saved for: {image_id} => {label_id}")
 
+        # Update scores for this image (merged with other saves in a single scoring run)
+        if self._auto_update_scoring:
+            self.auto_scoring([image_id])
+
     # TODO :: Allow model files to be monitored and call this method when it is published (during training)
     # def on_model_published(self, model):
     #    pass
@@ -517,6 +638,62 @@ class MONAILabelApp:
                 result[m] = self._local_request(url, p, "Scoring")
         return result[method] if method else result
 
+    def auto_scoring(self, images: Optional[Sequence[str]] = None, method: Optional[str] = None):
+        """
+        Trigger debounced scoring (all methods if method is None) for images whose labels have changed.
+
+        Triggers are coalesced into at most one pending run per method and rate limited; `images=None` scores all
+        images; empty list runs (all images) only if any model has changed since the last run. Changed labels only
+        trigger label dependent methods (e.g. dice); a run with nothing to score is skipped.
+        """
+        if not self._scoring_methods or (method and method not in self._scoring_methods):
+            return {}
+
+        methods = [method] if method else list(self._scoring_methods.keys())
+        if self._server_mode and images is not None and self._models_signature() != self._scoring_models:
+            images = None
+        if images:
+            methods = [m for m in methods if getattr(self._scoring_methods[m], "label_dependent", False)]
+
+        if not self._server_mode:
+            # e.g. train running in a separate process; let the server debounce it
+            p = {"images": list(images)} if images is not None else None
+            for m in methods:
+                self._local_request(f"/scoring/{m}?debounce=true", p, "Scoring")
+            return {}
+
+        if images is not None and not len(images):
+            return self._scoring_trigger.stats()
+
+        for m in methods:
+            self._scoring_trigger.trigger(m, images)
+        return self._scoring_trigger.stats()
+
+    def _run_auto_scoring(self, method: Hashable, images: Optional[List[str]]) -> bool:
+        request = {"method": method}
+        if images is not None:
+            request["images"] = images
+            task = self._scoring_methods.get(method)
+            if isinstance(task, ScoringMethod) and not task.scope(request, self.datastore()):
+                logger.info(f"Skip auto scoring for {method}; none of the {len(images)} images is in its scope")
+                return False
+
+        self._scoring_models = self._models_signature()
+        res, _ = AsyncTask.run("scoring", request=request, enqueue=True)
+        self._scoring_tasks[method] = res
+        return True
+
+    def _auto_scoring_busy(self, method: Hashable) -> bool:
+        task = self._scoring_tasks.get(method)
+        return bool(task) and task.get("status") in ("SUBMITTED", "RUNNING")
+
+    def _models_signature(self) -> Tuple:
+        signature = []
+        for name, task in sorted(self._infers.items()):
+            path = task.get_path() if isinstance(task, BasicInferTask) else None
+            signature.append((name, os.path.getmtime(path) if path and os.path.exists(path) else None))
+        return tuple(signature)
+
     def async_training(self, model, params=None, enqueue=False):
         if not model and not self._trainers:
             return {}
@@ -639,8 +816,20 @@ class MONAILabelApp:
             logger.info(f"Latencies: {res.get('params', {}).get('latencies')}")
             return res
 
+        # results of tiles (aligned to slide grid) are reused by subsequent overlapping requests (e.g. panned viewport)
+        version = _model_version(task)
+        use_tile_cache = bool(version) and strtobool(request.get("tile_cache", settings.MONAI_LABEL_WSI_TILE_CACHE))
+        region = None
+        if use_tile_cache:
+            request["tile_align"] = True
+            # aligned tiles can extend beyond the requested region; polygons outside of it are dropped from the output
+            size = request.get("size")
+            if size and sum(size) > 0 and not request.get("wsi_tiles"):
+                region = (request.get("location", [0, 0]), size)
+
         start = time.time()
-        infer_tasks = create_infer_wsi_tasks(request, image)
+        tiles = {}
+        infer_tasks = create_infer_wsi_tasks(request, image, tiles)
         if len(infer_tasks) > 1:
             logger.info(f"WSI Infer Request (final): {request}")
 
@@ -655,6 +844,10 @@ class MONAILabelApp:
         device = name_to_device(request.get("device", "cuda"))
         device_ids = [f"cuda:{id}" for id in gpus] if multi_gpu else [device]
 
+        # cascade: infer only the tiles (at requested level) around regions found by a low resolution pass
+        if request.get("coarse_level") is not None and len(infer_tasks) > 1:
+            infer_tasks = self._infer_wsi_coarse(request, image, infer_tasks, tiles, device_ids)
+
         res_json = {"annotations": [None] * len(infer_tasks)}
         for idx, t in enumerate(infer_tasks):
             t["logging"] = request["logging"]
@@ -664,46 +857,139 @@ class MONAILabelApp:
                 else device_ids[random.randint(0, len(device_ids) - 1)]
             )
 
+        cache_keys = self._wsi_tile_cache_keys(model, version, image, infer_tasks) if use_tile_cache else {}
+        cached = {}
+        for tid, key in cache_keys.items():
+            hit = tile_cache().get(key)
+            if hit is not None:
+                latencies = {"total": 0, "pre": 0, "infer": 0, "post": 0}
+                cached[tid] = {**hit[1], "latencies": latencies, "tile_cache": "hit"}
+        if cache_keys:
+            tiles["cached"] = len(cached)
+            logger.info(f"WSI Tile Cache: {len(cached)} / {len(infer_tasks)} tiles are available")
+        pending_tasks = [t for t in infer_tasks if t["id"] not in cached]
+
         total = len(infer_tasks)
         max_workers = request.get("max_workers", 0)
         max_workers = max_workers if max_workers else max(1, multiprocessing.cpu_count() // 2)
         max_workers = min(max_workers, multiprocessing.cpu_count())
 
-        if len(infer_tasks) > 1 and (max_workers == 0 or max_workers > 1):
-            logger.info(f"MultiGpu: {multi_gpu}; Using Device(s): {device_ids}; Max Workers: {max_workers}")
-            futures = {}
-            with ThreadPoolExecutor(max_workers if max_workers else None, "WSI Infer") as executor:
-                for t in infer_tasks:
-                    futures[t["id"]] = t, executor.submit(self._run_infer_wsi_task, t)
-
-                for tid, (t, future) in futures.items():
-                    res = future.result()
-                    res_json["annotations"][tid] = res
-                    finished = len([a for a in res_json["annotations"] if a])
-                    logger.info(
-                        f"{img_id} => {tid} => {t['device']} => {finished} / {total}; Latencies: {res.get('latencies')}"
-                    )
-        else:
+        # progress of (long-running) wsi infer can be streamed by client using /progress/{progress_id}
+        progress_id = request.get("progress_id")
+        if progress_id:
+            progress_tracker().start(progress_id, "infer_wsi")
+            report_progress(progress_id, status="RUNNING", done=0, total=total, unit="tiles", image=img_id)
+
+        # decode next tiles (shared slide handles) while model runs on the current ones
+        read_ahead = None
+        if len(pending_tasks) > 1:
+            regions = [{} if t["id"] in cached else t for t in infer_tasks]
+            read_ahead = TileReadAhead(regions, request.get("read_ahead", settings.MONAI_LABEL_WSI_READ_AHEAD))
+            read_ahead.start()
+
+        # tiles (pre/post transforms in worker threads) share batched forward passes
+        batch_id = None
+        batch_size = int(request.get("tile_batch_size", settings.MONAI_LABEL_WSI_BATCH_SIZE))
+        if len(pending_tasks) > 1 and batch_size != 1 and max_workers > 1:
+            # a batch is filled by concurrent workers; so it never exceeds max_workers
+            batch_id = register_batcher(DynamicBatcher(min(batch_size, max_workers), max_batch_size=max_workers))
             for t in infer_tasks:
-                tid = t["id"]
-                res = self._run_infer_wsi_task(t, multi_thread=False)
-                res_json["annotations"][tid] = res
-                finished = len([a for a in res_json["annotations"] if a])
-                logger.info(
-                    f"{img_id} => {tid} => {t['device']} => {finished} / {total}; Latencies: {res.get('latencies')}"
-                )
-
-        latency_total = time.time() - start
-        logger.debug(f"WSI Infer Time Taken: {latency_total:.4f}")
+                t["tile_batch"] = batch_id
 
-        bbox = request.get("location", [0, 0])
-        bbox.extend(request.get("size", [0, 0]))
+        bbox = [*request.get("location", [0, 0]), *request.get("size", [0, 0])]
         res_json["name"] = f"MONAILabel Annotations - {model} for {bbox}"
         res_json["description"] = task.description
         res_json["model"] = request.get("model")
         res_json["location"] = request.get("location")
         res_json["size"] = request.get("size")
 
+        # polygons of finished tiles are streamed into the annotations file (only latencies are kept in memory)
+        output = request.get("output", "dsa")
+        logger.debug(f"+++ WSI Inference Output Type: {output}")
+        writer_class = {"asap": ASAPAnnotationWriter, "dsa": DSAAnnotationWriter}.get(output)
+        writer = (
+            writer_class(
+                name=res_json["name"],
+                description=res_json["description"],
+                model=res_json["model"],
+                location=res_json["location"],
+                size=res_json["size"],
+                compress=request.get("compress", settings.MONAI_LABEL_WSI_ANNOTATIONS_GZIP),
+            )
+            if writer_class
+            else None
+        )
+
+        # polygons near tile borders are held back and merged (across tiles) once all the tiles are done
+        merger = None
+        if len(infer_tasks) > 1 and strtobool(request.get("merge_seams", settings.MONAI_LABEL_WSI_MERGE_SEAMS)):
+            merger = SeamMerger()
+
+        finished = 0
+
+        def on_result(t, res):
+            nonlocal finished
+            finished += 1
+            if t["id"] in cache_keys and t["id"] not in cached:
+                compact = {"annotation": res.get("annotation"), "latencies": res.get("latencies")}
+                tile_cache().put(cache_keys[t["id"]], model, version, None, compact)
+            if merger:
+                res = merger.split(t["location"], t["size"], res)
+            if region:
+                res = filter_region(res, *region)
+            if writer:
+                writer.add(res)
+                res = {"latencies": res.get("latencies")}
+            res_json["annotations"][t["id"]] = res
+            logger.info(
+                f"{img_id} => {t['id']} => {t['device']} => {finished} / {total}; Latencies: {res.get('latencies')}"
+            )
+            if progress_id:
+                report_progress(progress_id, done=finished, total=total)
+
+        try:
+            for tid, res in cached.items():
+                on_result(infer_tasks[tid], res)
+
+            if len(pending_tasks) > 1 and (max_workers == 0 or max_workers > 1):
+                logger.info(f"MultiGpu: {multi_gpu}; Using Device(s): {device_ids}; Max Workers: {max_workers}")
+                with ThreadPoolExecutor(max_workers if max_workers else None, "WSI Infer") as executor:
+                    futures = {executor.submit(self._run_infer_wsi_task, t, True, read_ahead): t for t in pending_tasks}
+                    for future in as_completed(futures):
+                        on_result(futures[future], future.result())
+            else:
+                for t in pending_tasks:
+                    on_result(t, self._run_infer_wsi_task(t, multi_thread=False, read_ahead=read_ahead))
+
+            if merger:
+                merge_start = time.time()
+                seams = {"annotation": merger.merge(), "latencies": {"total": 0, "pre": 0, "infer": 0, "post": 0}}
+                if region:
+                    seams = filter_region(seams, *region)
+                if writer:
+                    writer.add(seams)
+                    seams = {"latencies": seams["latencies"]}
+                res_json["annotations"].append(seams)
+                tiles["seams"] = {**merger.stats(), "latency": round(time.time() - merge_start, 2)}
+                logger.info(f"Merged polygons at tile seams: {tiles['seams']}")
+        except Exception as e:
+            if writer:
+                writer.abort()
+            if progress_id:
+                report_progress(progress_id, status="ERROR", error=str(e))
+            raise
+        finally:
+            if read_ahead:
+                read_ahead.close()
+            batcher = unregister_batcher(batch_id) if batch_id else None
+            if batcher:
+                logger.info(f"Batched Forward: {batcher.stats()}")
+
+        latency_total = time.time() - start
+        logger.debug(f"WSI Infer Time Taken: {latency_total:.4f}")
+
+        res_json["tiles"] = {**tiles, "inferred": len(infer_tasks)}
+
         res_json["latencies"] = {
             "total": round(latency_total, 2),
             "tsum": round(sum(a["latencies"]["total"] for a in res_json["annotations"]) / max(1, max_workers), 2),
@@ -713,19 +999,12 @@ class MONAILabelApp:
         }
 
         res_file = None
-        output = request.get("output", "dsa")
-        logger.debug(f"+++ WSI Inference Output Type: {output}")
-
-        loglevel = request.get("logging", "INFO").upper()
-        if output == "asap":
-            logger.info("+++ Generating ASAP XML Annotation")
-            res_file, total_annotations = create_asap_annotations_xml(res_json, loglevel)
-        elif output == "dsa":
-            logger.info("+++ Generating DSA JSON Annotation")
-            res_file, total_annotations = create_dsa_annotations_json(res_json, loglevel)
+        total_annotations = -1
+        if writer:
+            res_file, total_annotations = writer.close(res_json["latencies"])
+            logger.info(f"+++ Generated {output.upper()} Annotation: {res_file}")
         else:
             logger.info("+++ Return Default JSON Annotation")
-            total_annotations = -1
 
         if len(infer_tasks) > 1:
             logger.info(
@@ -734,9 +1013,76 @@ class MONAILabelApp:
                 f"Total Annotations: {total_annotations}; "
                 f"Latencies: {res_json['latencies']}"
             )
+        if progress_id:
+            report_progress(progress_id, status="DONE", annotations=total_annotations)
         return {"file": res_file, "params": res_json}
 
-    def _run_infer_wsi_task(self, task, multi_thread=True):
+    def _wsi_tile_cache_keys(self, model, version, image, infer_tasks):
+        try:
+            slide = slide_fingerprint(image)
+        except OSError as e:
+            logger.info(f"WSI tile cache ignored; failed to compute slide fingerprint: {e}")
+            return {}
+
+        keys = {}
+        for t in infer_tasks:
+            key = tile_cache().tile_key(model, version, slide, t)
+            if key:
+                keys[t["id"]] = key
+        return keys
+
+    def _infer_wsi_coarse(self, request, image, infer_tasks, stats, device_ids):
+        downsamples = slide_pool().level_downsamples(image)
+        level = min(int(request["coarse_level"]), len(downsamples) - 1)
+        downsample = downsamples[level] / downsamples[min(int(request.get("level", 0)), level)]
+        if downsample <= 1:
+            logger.info(f"Coarse level {level} is not lower resolution (downsample: {downsample}); skip cascade")
+            return infer_tasks
+
+        start = time.time()
+        req = copy.deepcopy(request)
+        req.update({"model": request.get("coarse_model", request["model"]), "level": level, "output": "json"})
+        if request.get("min_poly_area"):
+            req["min_poly_area"] = request["min_poly_area"] / (downsample * downsample)
+        for k in ("coarse_level", "foreground", "background", "progress_id", "wsi_tiles"):
+            req.pop(k, None)
+
+        coarse_tasks = create_infer_wsi_tasks(req, image, downsample=downsample)
+        for idx, t in enumerate(coarse_tasks):
+            t["device"] = device_ids[idx % len(device_ids)]
+
+        max_workers = request.get("max_workers", 0)
+        max_workers = min(max_workers if max_workers else max(1, multiprocessing.cpu_count() // 2), len(coarse_tasks))
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers, "WSI Coarse Infer") as executor:
+                results = list(executor.map(self._run_infer_wsi_task, coarse_tasks))
+        else:
+            results = [self._run_infer_wsi_task(t, multi_thread=False) for t in coarse_tasks]
+
+        # margin (level 0) so that objects cut at the coarse boundary are fully covered by the fine tiles
+        margin = request.get("coarse_margin", max(request.get("tile_size", (0, 0))) // 4)
+        boxes = coarse_regions(coarse_tasks, results, downsample, margin)
+        fine_tasks = filter_wsi_tasks(infer_tasks, boxes)
+
+        stats["coarse"] = {
+            "level": level,
+            "downsample": round(downsample, 2),
+            "tiles": len(coarse_tasks),
+            "regions": len(boxes),
+            "latency": round(time.time() - start, 2),
+        }
+        stats["fine_skipped"] = len(infer_tasks) - len(fine_tasks)
+        stats["reduction"] = round(1 - len(fine_tasks) / len(infer_tasks), 4)
+        logger.info(
+            f"Coarse Infer (level: {level}; downsample: {downsample:.1f}) => {len(boxes)} regions; "
+            f"Fine Tiles: {len(fine_tasks)} / {len(infer_tasks)}; Latency: {stats['coarse']['latency']}"
+        )
+        return fine_tasks
+
+    def _run_infer_wsi_task(self, task, multi_thread=True, read_ahead=None):
+        if read_ahead:
+            read_ahead.advance(task["id"])
+
         req = copy.deepcopy(task)
         req["result_write_to_file"] = False
 
@@ -767,3 +1113,7 @@ class MONAILabelApp:
         if train_stats:
             info["train_stats"] = train_stats
         return info
+
+
+def _model_version(task):
+    return task.model_version() if isinstance(task, BasicInferTask) else None
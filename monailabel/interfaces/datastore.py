@@ -11,7 +11,7 @@
 
 from abc import ABCMeta, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 class DefaultLabelTag(str, Enum):
@@ -235,6 +235,15 @@ class Datastore(metaclass=ABCMeta):
         """
         pass
 
+    def save_labels(self, labels: Sequence[Tuple[str, str, str, Dict[str, Any]]]) -> List[str]:
+        """
+        Save multiple labels (e.g. results of batch infer) and return the newly saved labels' ids
+
+        :param labels: list of (image_id, label_filename, label_tag, label_info)
+        :return: the label ids for the given labels
+        """
+        return [self.save_label(*label) for label in labels]
+
     @abstractmethod
     def remove_label(self, label_id: str, label_tag: str) -> None:
         """
@@ -27,6 +27,7 @@ class MONAILabelError(Enum):
         APP_INFERENCE_FAILED -    Inference Failed
         APP_TRAIN_FAILED -        Train Failed
         APP_ERROR APP -           General Error
+        APP_RESOURCE_ERROR -      Not enough resources (e.g. memory) to run the request
     """
 
     SERVER_ERROR = "SERVER_ERROR"
@@ -41,6 +42,7 @@ class MONAILabelError(Enum):
     APP_INFERENCE_FAILED = "APP_INFERENCE_FAILED"
     APP_TRAIN_FAILED = "APP_TRAIN_FAILED"
     APP_ERROR = "APP_ERROR"
+    APP_RESOURCE_ERROR = "APP_RESOURCE_ERROR"
 
 
 class MONAILabelException(Exception):
@@ -63,3 +65,8 @@ class ImageNotFoundException(MONAILabelException):
 class LabelNotFoundException(MONAILabelException):
     def __init__(self, msg: str):
         super().__init__(MONAILabelError.APP_ERROR, msg)
+
+
+class InsufficientMemoryException(MONAILabelException):
+    def __init__(self, msg: str):
+        super().__init__(MONAILabelError.APP_RESOURCE_ERROR, msg)
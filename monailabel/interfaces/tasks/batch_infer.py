@@ -9,18 +9,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import copy
+import json
 import logging
 import multiprocessing
+import os
+import pathlib
+import queue
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Callable
+from typing import Any, Callable, Dict, List, Optional
 
 import torch
 
+from monailabel.config import settings
 from monailabel.interfaces.datastore import Datastore, DefaultLabelTag
-from monailabel.utils.others.generic import handle_torch_linalg_multithread, name_to_device, remove_file
+from monailabel.utils.async_tasks.progress import report_progress
+from monailabel.utils.others.generic import handle_torch_linalg_multithread, md5_digest, name_to_device, remove_file
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +38,111 @@ class BatchInferImageType(str, Enum):
     IMAGES_UNLABELED = "unlabeled"
 
 
+class BatchInferJournal:
+    """
+    Progress journal (json lines) of a batch infer run.
+
+    Every image whose label is committed to the datastore is appended to the journal; so a re-run of the same request
+    (e.g. after a crash) skips images completed earlier. Journal is keyed by request, images and model version (so a
+    new checkpoint starts over) and is removed once all the images are done; journals of abandoned runs expire.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def for_request(request, image_ids: List[str]) -> "BatchInferJournal":
+        volatile = ("device", "gpus", "multi_gpu", "max_workers", "logging", "resume")
+        params = {k: v for k, v in request.items() if k not in volatile}
+        key = md5_digest(json.dumps({"params": params, "images": image_ids}, sort_keys=True, default=str))
+
+        path = settings.MONAI_LABEL_TASKS_BATCH_INFER_JOURNAL_PATH
+        path = path if path else os.path.join(pathlib.Path.home(), ".cache", "monailabel", "batch_infer")
+        BatchInferJournal.cleanup(path, settings.MONAI_LABEL_TASKS_BATCH_INFER_JOURNAL_EXPIRY)
+        return BatchInferJournal(os.path.join(path, f"{key}.jsonl"))
+
+    @staticmethod
+    def cleanup(path: str, expiry: int):
+        """
+        Remove journals not updated in last `expiry` seconds (0 => never)
+        """
+        if expiry <= 0 or not os.path.isdir(path):
+            return
+        now = time.time()
+        for f in pathlib.Path(path).glob("*.jsonl"):
+            try:
+                if now - f.stat().st_mtime > expiry:
+                    logger.info(f"Remove expired batch infer journal: {f}")
+                    remove_file(str(f))
+            except OSError:
+                continue
+
+    def completed(self) -> Dict[str, Any]:
+        """
+        Images (and their label ids) completed by previous runs
+        """
+        done: Dict[str, Any] = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path) as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                    done[entry["image"]] = entry.get("label")
+                except (ValueError, KeyError):
+                    continue  # partially written (last) line of an interrupted run
+        return done
+
+    def record(self, entries: List[Dict[str, Any]]):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a") as fp:
+                fp.write("".join(json.dumps(e, default=str) + "\n" for e in entries))
+                fp.flush()
+                os.fsync(fp.fileno())
+
+    def remove(self):
+        remove_file(self.path)
+
+
+class _Stage:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def timed(self, items=1):
+        start = time.time()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.busy += time.time() - start
+                self.items += items
+
+    def stats(self, elapsed: float) -> Dict[str, Any]:
+        utilization = self.busy / (elapsed * self.workers) if elapsed > 0 else 0
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy": round(self.busy, 2),
+            "utilization": round(utilization, 3),
+        }
+
+
 class BatchInferTask:
     """
     Basic Batch Infer Task
+
+    Images run through a pipeline of stages connected by bounded queues:
+        load (fetch image from datastore + pre transforms) => infer (model on device + post transforms)
+        => write (batched label commit).
+    Pre transforms run in the load stage only if `prepare` is provided; otherwise they run as part of infer.
+    Completed images are recorded in a progress journal; re-running the same request resumes from there.
     """
 
     def get_images(self, request, datastore: Datastore):
@@ -52,7 +161,7 @@ class BatchInferTask:
             return datastore.list_images()
         return images
 
-    def __call__(self, request, datastore: Datastore, infer: Callable):
+    def __call__(self, request, datastore: Datastore, infer: Callable, prepare: Optional[Callable] = None):
         image_ids = sorted(self.get_images(request, datastore))
         max_batch_size = request.get("max_batch_size", 0)
         label_tag = request.get("label_tag", DefaultLabelTag.ORIGINAL)
@@ -72,67 +181,188 @@ class BatchInferTask:
         device = name_to_device(request.get("device", "cuda"))
         device_ids = [f"cuda:{id}" for id in gpus] if multi_gpu else [device]
 
+        journal = BatchInferJournal.for_request(request, image_ids) if request.get("resume", True) else None
+        completed = journal.completed() if journal else {}
+        if completed:
+            logger.info(f"Resume batch inference; skip {len(completed)} images completed earlier ({journal.path})")
+
         result: dict = {}
         infer_tasks = []
         for idx, image_id in enumerate(image_ids):
+            if image_id in completed:
+                result[image_id] = {"label": completed[image_id], "tag": label_tag, "resumed": True}
+                continue
+
             req = copy.deepcopy(request)
+            req.pop("model_version", None)
             req["_id"] = idx
             req["_image_id"] = image_id
 
             req["image"] = image_id
-            req["save_label"] = True
+            req["save_label"] = False  # committed (in batches) by the writer stage
             req["label_tag"] = label_tag
             req["logging"] = request.get("logging", "INFO")
-            req["device"] = device_ids[idx % len(device_ids)]
+            req["device"] = device_ids[len(infer_tasks) % len(device_ids)]
 
             infer_tasks.append(req)
             result[image_id] = None
 
-        total = len(infer_tasks)
+        total = len(image_ids)
         max_workers = request.get("max_workers", 0)
         max_workers = max_workers if max_workers else max(1, multiprocessing.cpu_count() // 4)
-        max_workers = min(max_workers, multiprocessing.cpu_count())
+        max_workers = min(max_workers, multiprocessing.cpu_count(), max(1, len(infer_tasks)))
+        logger.info(f"MultiGpu: {multi_gpu}; Using Device(s): {device_ids}; Max Workers: {max_workers}")
 
-        if len(infer_tasks) > 1 and (max_workers == 0 or max_workers > 1):
-            logger.info(f"MultiGpu: {multi_gpu}; Using Device(s): {device_ids}; Max Workers: {max_workers}")
-            futures = {}
-            with ThreadPoolExecutor(max_workers if max_workers else None, "WSI Infer") as executor:
-                for t in infer_tasks:
-                    futures[t["_id"]] = t, executor.submit(run_infer_task, t, datastore, infer)
+        stages = {
+            "load": _Stage("load", max(1, int(request.get("prefetch_workers", 2)))),
+            "infer": _Stage("infer", max_workers),
+            "write": _Stage("write", 1),
+        }
+        depth = max(1, int(request.get("queue_size", 2 * max_workers)))
+        load_q: queue.Queue = queue.Queue(depth)
+        write_q: queue.Queue = queue.Queue(depth)
+        tasks_q: queue.Queue = queue.Queue()
+        for t in infer_tasks:
+            tasks_q.put(t)
 
-                for tid, (t, future) in futures.items():
-                    image_id = t["_image_id"]
+        def loader():
+            while True:
+                try:
+                    t = tasks_q.get_nowait()
+                except queue.Empty:
+                    break
+                with stages["load"].timed():
                     try:
-                        res = future.result()
-                        result[image_id] = res
+                        uri = datastore.get_image_uri(t["_image_id"])
+                        # local copy (e.g. downloaded from remote datastore) is used by infer; else infer fetches by id
+                        if isinstance(uri, str) and os.path.exists(uri):
+                            t["image"] = uri
                     except Exception:
-                        logger.warning(f"Failed to finish Infer Task: {tid} => {image_id}", exc_info=True)
+                        logger.warning(f"Failed to fetch image: {t['_image_id']}; infer will retry", exc_info=True)
+
+                    # decode + pre transforms of next images overlap infer of the current ones (queue is bounded)
+                    if prepare and t["image"] != t["_image_id"]:
+                        try:
+                            handle_torch_linalg_multithread(t)
+                            prepared = prepare(t)
+                            if prepared is not None:
+                                t["_prepared"] = prepared
+                        except Exception:
+                            logger.warning(f"Failed to prepare: {t['_image_id']}; infer will retry", exc_info=True)
+                load_q.put(t)
+
+        def worker():
+            while True:
+                t = load_q.get()
+                if t is None:
+                    write_q.put(None)
+                    break
+                try:
+                    handle_torch_linalg_multithread(t)
+                    logger.info(f"Running inference for image id {t['_image_id']}")
+                    with stages["infer"].timed():
+                        res, error = infer(t, datastore), None
+                except Exception as e:
+                    res, error = None, e
+                t.pop("_prepared", None)  # release pre-transformed data (not needed for commit)
+                write_q.put((t, res, error))
+
+        loaders = [threading.Thread(target=loader, name=f"BatchInfer-Load-{i}") for i in range(stages["load"].workers)]
+        workers = [threading.Thread(target=worker, name=f"BatchInfer-Infer-{i}") for i in range(max_workers)]
+        for th in loaders + workers:
+            th.daemon = True
+            th.start()
+
+        def end_of_loading():
+            for th in loaders:
+                th.join()
+            for _ in workers:
+                load_q.put(None)
+
+        threading.Thread(target=end_of_loading, name="BatchInfer-Load", daemon=True).start()
+
+        finished = len(completed)
+        commit_size = max(1, int(request.get("commit_size", 8)))
+        pending: List[Any] = []
+
+        def commit():
+            nonlocal finished
+            if not pending:
+                return
+            with stages["write"].timed(len(pending)):
+                label_ids = self._save_labels(datastore, label_tag, pending)
+                entries = []
+                for (t, res), label_id in zip(pending, label_ids):
+                    image_id = t["_image_id"]
+                    if res.get("file"):
+                        remove_file(res.pop("file"))
+                    if label_id is None:
                         result[image_id] = {}
+                        continue
+                    res["label"] = label_id
+                    result[image_id] = res
+                    entries.append({"image": image_id, "label": label_id})
+                if journal and entries:
+                    journal.record(entries)
 
-                    finished = len([a for a in result.values() if a is not None])
-                    logger.info(f"{tid} => {image_id} => {t['device']} => {finished} / {total}")
-        else:
-            for t in infer_tasks:
-                tid = t["_id"]
-                res = run_infer_task(t, datastore, infer)
+            finished += len(pending)
+            for t, _ in pending:
+                logger.info(f"{t['_id']} => {t['_image_id']} => {t['device']} => {finished} / {total}")
+            report_progress(done=finished, total=total, unit="images", image=pending[-1][0]["_image_id"])
+            pending.clear()
 
-                image_id = t["_image_id"]
-                result[image_id] = res
-                finished = tid + 1
-                logger.info(f"{tid} => {image_id} => {t['device']} => {finished} / {total}")
+        running = len(workers) if infer_tasks else 0
+        while running:
+            try:
+                item = write_q.get(timeout=1.0)
+            except queue.Empty:
+                commit()  # commit whatever is ready while compute stage is busy
+                continue
+
+            if item is None:
+                running -= 1
+                continue
+
+            t, res, error = item
+            if error is not None:
+                logger.warning(f"Failed to finish Infer Task: {t['_id']} => {t['_image_id']}", exc_info=error)
+                result[t["_image_id"]] = {}
+                finished += 1
+                continue
+
+            pending.append((t, res))
+            if len(pending) >= commit_size:
+                commit()
+        commit()
 
         latency_total = time.time() - start
-        logger.info(f"Batch Infer Time Taken: {latency_total:.4f}")
+        utilization = {name: stage.stats(latency_total) for name, stage in stages.items()}
+        logger.info(f"Batch Infer Time Taken: {latency_total:.4f}; Stages: {utilization}")
+        report_progress(done=finished, total=total, unit="images", stages=utilization)
+
+        if journal and all(result.values()):
+            journal.remove()
         return result
 
+    @staticmethod
+    def _save_labels(datastore: Datastore, label_tag, pending) -> List[Optional[str]]:
+        labels = []
+        for t, res in pending:
+            label = res.get("file") if res.get("file") else res.get("label")
+            labels.append((t["_image_id"], label, label_tag, {"model": t.get("model"), "params": res.get("params")}))
 
-def run_infer_task(req, datastore, infer):
-    handle_torch_linalg_multithread(req)
+        valid = [label for label in labels if label[1] and os.path.exists(label[1])]
+        try:
+            saved = iter(datastore.save_labels(valid))
+            return [next(saved) if label[1] and os.path.exists(label[1]) else None for label in labels]
+        except Exception:
+            logger.warning("Failed to commit batch of labels; save them one by one", exc_info=True)
 
-    image_id = req.get("image")
-    logger.info(f"Running inference for image id {image_id}")
-    r = infer(req, datastore)
-    if r.get("file"):
-        remove_file(r.get("file"))
-        r.pop("file")
-    return r
+        label_ids: List[Optional[str]] = []
+        for label in labels:
+            try:
+                label_ids.append(datastore.save_label(*label) if label[1] and os.path.exists(label[1]) else None)
+            except Exception:
+                logger.warning(f"Failed to save label for image: {label[0]}", exc_info=True)
+                label_ids.append(None)
+        return label_ids
@@ -87,6 +87,9 @@ class InferTask(metaclass=ABCMeta):
     def get_path(self, validate=True):
         return None
 
+    def warmup(self, devices=None):
+        pass
+
     @abstractmethod
     def is_valid(self) -> bool:
         pass
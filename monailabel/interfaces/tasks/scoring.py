@@ -10,6 +10,7 @@
 # limitations under the License.
 
 from abc import ABCMeta, abstractmethod
+from typing import List
 
 from monailabel.interfaces.datastore import Datastore
 
@@ -19,6 +20,9 @@ class ScoringMethod(metaclass=ABCMeta):
     Basic Scoring Method
     """
 
+    # scores depend on labels (e.g. dice); such methods are re-run (auto scoring) for images whose label is saved
+    label_dependent = False
+
     def __init__(self, description):
         self.description = description
 
@@ -27,6 +31,24 @@ class ScoringMethod(metaclass=ABCMeta):
             "description": self.description,
         }
 
+    @staticmethod
+    def image_ids(request, datastore: Datastore, image_ids=None) -> List[str]:
+        """
+        Images to be scored; if request has `images` (e.g. auto scoring for labels saved since last run), only those
+        """
+        image_ids = datastore.list_images() if image_ids is None else image_ids
+        images = request.get("images")
+        if images is None:
+            return image_ids
+        images = set(images)
+        return [image_id for image_id in image_ids if image_id in images]
+
+    def scope(self, request, datastore: Datastore) -> List[str]:
+        """
+        Images the request would score (e.g. to skip a run with nothing to do)
+        """
+        return self.image_ids(request, datastore)
+
     @abstractmethod
     def __call__(self, request, datastore: Datastore):
         pass
@@ -13,10 +13,13 @@ import argparse
 import json
 import logging
 import os
+import sys
 from typing import Any, Dict
 
 from monailabel.config import settings
 from monailabel.interfaces.exception import MONAILabelError, MONAILabelException
+from monailabel.utils.async_tasks.progress import TASK_ID_ENV
+from monailabel.utils.async_tasks.worker import TASK_DONE_PREFIX, TASK_START_PREFIX
 from monailabel.utils.others.class_utils import get_class_of_subclass_from_file
 
 logger = logging.getLogger(__name__)
@@ -64,6 +67,61 @@ def save_result(result, output):
             json.dump(result, fp, indent=2)
 
 
+def run_method(a, method, request, local_rank=0):
+    if method == "infer":
+        res_img, res_json = a.infer(request=request)
+        return {"label": res_img, "params": res_json}
+    if method == "train":
+        request["local_rank"] = local_rank
+        return a.train(request)
+    if method == "info":
+        return a.info(request)
+    if method == "batch_infer":
+        return a.batch_infer(request)
+    if method == "scoring":
+        return a.scoring(request)
+    raise ValueError(f"Unsupported method: {method}")
+
+
+def run_worker(a):
+    """
+    Run tasks (json lines from stdin) one after another using the same (warm) app instance
+    """
+    logger.info(f"Task worker ready: {os.getpid()}")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        message = json.loads(line)
+        print(f"{TASK_START_PREFIX}{json.dumps({'id': message['id']})}", flush=True)
+        os.environ[TASK_ID_ENV] = message["id"]
+        status = "DONE"
+        try:
+            # labels/images could be changed (e.g. by server) since previous task
+            a.datastore().refresh()
+            result = run_method(a, message["method"], message["request"])
+            logger.info(f"Result: {json.dumps(result, default=str)}")
+        except Exception:
+            logger.exception(f"Failed to run task: {message['id']}")
+            status = "ERROR"
+        finally:
+            os.environ.pop(TASK_ID_ENV, None)
+            _release_device_memory()
+
+        sys.stderr.flush()
+        print(f"{TASK_DONE_PREFIX}{json.dumps({'id': message['id'], 'status': status})}", flush=True)
+
+
+def _release_device_memory():
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
 def run_main():
     logging.basicConfig(
         level=(logging.INFO),
@@ -73,7 +131,9 @@ def run_main():
     parser = argparse.ArgumentParser()
     parser.add_argument("-a", "--app", type=str, default=None)
     parser.add_argument("-s", "--studies", type=str, default=None)
-    parser.add_argument("-m", "--method", required=True, choices=["infer", "train", "info", "batch_infer", "scoring"])
+    parser.add_argument(
+        "-m", "--method", required=True, choices=["infer", "train", "info", "batch_infer", "scoring", "worker"]
+    )
     parser.add_argument("-r", "--request", type=str, default="{}")
     parser.add_argument("-o", "--output", type=str, default=None)
     parser.add_argument("-d", "--debug", action="store_true")
@@ -102,24 +162,12 @@ def run_main():
     )
 
     a = app_instance(app_dir=app_dir, studies=studies)
-    request = json.loads(args.request)
-    result = None
+    if args.method == "worker":
+        run_worker(a)
+        return
 
-    if args.method == "infer":
-        res_img, res_json = a.infer(request=request)
-        result = {"label": res_img, "params": res_json}
-    elif args.method == "train":
-        request["local_rank"] = args.local_rank
-        result = a.train(request)
-    elif args.method == "info":
-        result = a.info(request)
-    elif args.method == "batch_infer":
-        result = a.batch_infer(request)
-    elif args.method == "scoring":
-        result = a.scoring(request)
-    else:
-        parser.print_help()
-        exit(-1)
+    request = json.loads(args.request)
+    result = run_method(a, args.method, request, args.local_rank)
 
     save_result(result, args.output)
 
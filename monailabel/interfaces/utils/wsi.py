@@ -10,21 +10,31 @@
 # limitations under the License.
 
 import copy
-import ctypes.util
 import logging
-import platform
-from ctypes import cdll
 from math import ceil
 
 import numpy as np
-from monai.utils import optional_import
+
+from monailabel.config import settings
+from monailabel.utils.others.slides import slide_pool, tissue_detector
 
 logger = logging.getLogger(__name__)
 
 
-def create_infer_wsi_tasks(request, image):
+def create_infer_wsi_tasks(request, image, stats=None, downsample=1.0):
+    """
+    Split WSI (region) into tiles; tiles with tissue fraction below `tissue_threshold` are skipped.
+    If `stats` (dict) is provided then it is updated with number of tiles (total, skipped) and tissue fraction.
+    If `tile_align` is set then region is extended to the slide wide tile grid.
+
+    `downsample` of the (lower resolution) level to read tiles from; location and size of the region are at level 0,
+    each tile covers `tile_size * downsample` pixels at level 0 and its `size` is at the lower resolution level.
+    """
+    stats = stats if stats is not None else {}
     if request.get("wsi_tiles"):
-        return create_infer_wsi_tasks_from_tiles(request, image)
+        tasks = create_infer_wsi_tasks_from_tiles(request, image)
+        stats.update({"total": len(tasks), "skipped": 0})
+        return tasks
 
     tile_size = request.get("tile_size", (2048, 2048))
     tile_size = [int(p) for p in tile_size]
@@ -34,15 +44,7 @@ def create_infer_wsi_tasks(request, image):
     bbox = [[location[0], location[1]], [location[0] + size[0], location[1] + size[1]]]
     bbox = bbox if bbox and sum(bbox[0]) + sum(bbox[1]) > 0 else None
 
-    if platform.system() == "Windows":
-        cdll.LoadLibrary(str(ctypes.util.find_library("libopenslide-0.dll")))
-
-    openslide, has_openslide = optional_import("openslide")
-    if not has_openslide:
-        raise ImportError("Unable to find openslide, please ensure openslide library packages are correctly installed")
-
-    with openslide.OpenSlide(image) as slide:
-        w, h = slide.dimensions
+    sw, sh = w, h = slide_pool().dimensions(image)
     logger.debug(f"Input WSI Image Dimensions: ({w} x {h}); Tile Size: {tile_size}")
 
     x, y = 0, 0
@@ -51,19 +53,34 @@ def create_infer_wsi_tasks(request, image):
         w, h = int(bbox[1][0] - x), int(bbox[1][1] - y)
         logger.debug(f"WSI Region => Location: ({x}, {y}); Dimensions: ({w} x {h})")
 
-    cols = ceil(w / tile_size[0])  # COL
-    rows = ceil(h / tile_size[1])  # ROW
+    pw, ph = int(tile_size[0] * downsample), int(tile_size[1] * downsample)
+    if request.get("tile_align") and bbox:
+        # tiles on slide wide grid; so overlapping regions (e.g. panned viewport) share the same tiles
+        x1, y1 = min(sw, ceil((x + w) / pw) * pw), min(sh, ceil((y + h) / ph) * ph)
+        x, y = x // pw * pw, y // ph * ph
+        w, h = x1 - x, y1 - y
+        logger.debug(f"WSI Region (aligned to tiles) => Location: ({x}, {y}); Dimensions: ({w} x {h})")
+
+    cols = ceil(w / pw)  # COL
+    rows = ceil(h / ph)  # ROW
 
     if rows * cols > 1:
         logger.info(f"Total Tiles to infer {rows} x {cols}: {rows * cols}; Dimensions: {w} x {h}")
 
     infer_tasks = []
     count = 0
-    pw, ph = tile_size[0], tile_size[1]
 
     ignore_small_patches = request.get("ignore_small_patches", False)
     ignore_non_click_patches = request.get("ignore_non_click_patches", False)
 
+    # tiles with clicks are never skipped; so tissue detection is only used for non-interactive requests
+    tissue = None
+    tissue_threshold = float(request.get("tissue_threshold", settings.MONAI_LABEL_WSI_TISSUE_THRESHOLD) or 0)
+    if tissue_threshold > 0 and not request.get("foreground") and not request.get("background"):
+        tissue = tissue_detector().detect(image)
+        stats["tissue"] = round(tissue.tissue, 4)
+    skipped = 0
+
     for row in range(rows):
         for col in range(cols):
             tx = col * pw + x
@@ -88,6 +105,10 @@ def create_infer_wsi_tasks(request, image):
                 if not fg and not bg:
                     continue
 
+            if tissue is not None and tissue.fraction((tx, ty), (tw, th)) < tissue_threshold:
+                skipped += 1
+                continue
+
             task = copy.deepcopy(request)
             task.update(
                 {
@@ -95,11 +116,15 @@ def create_infer_wsi_tasks(request, image):
                     "image": image,
                     "tile_size": tile_size,
                     "location": (tx, ty),
-                    "size": (tw, th),
+                    "size": (tw, th) if downsample == 1 else (ceil(tw / downsample), ceil(th / downsample)),
                 }
             )
             infer_tasks.append(task)
             count += 1
+
+    if skipped:
+        logger.info(f"Skipped {skipped} / {rows * cols} tiles with tissue below {tissue_threshold}")
+    stats.update({"total": rows * cols, "skipped": skipped})
     return infer_tasks
 
 
@@ -123,3 +148,39 @@ def create_infer_wsi_tasks_from_tiles(request, image):
         )
         infer_tasks.append(task)
     return infer_tasks
+
+
+def coarse_regions(tasks, results, downsample, margin=0):
+    """
+    Bounding boxes (x0, y0, x1, y1 at level 0) of contours found by coarse (low resolution) infer tasks;
+    contours of a tile are at its level relative to the tile location (level 0)
+    """
+    boxes = []
+    for task, res in zip(tasks, results):
+        annotation = res.get("annotation") if res else None
+        if not annotation:
+            continue
+
+        location = np.array(task["location"][:2])
+        for element in annotation.get("elements", []):
+            for contour in element["contours"]:
+                points = np.asarray(contour).reshape(-1, 2)
+                if len(points):
+                    p0 = location + (points.min(axis=0) - location) * downsample
+                    p1 = location + (points.max(axis=0) + 1 - location) * downsample
+                    boxes.append([*(p0 - margin), *(p1 + margin)])
+    return np.array(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def filter_wsi_tasks(tasks, boxes):
+    """
+    Keep tiles (level 0) overlapping any of the boxes (x0, y0, x1, y1); tiles are re-numbered
+    """
+    result = []
+    for task in tasks:
+        (tx, ty), (tw, th) = task["location"], task["size"]
+        overlap = (boxes[:, 0] < tx + tw) & (boxes[:, 2] > tx) & (boxes[:, 1] < ty + th) & (boxes[:, 3] > ty)
+        if overlap.any():
+            task["id"] = len(result)
+            result.append(task)
+    return result
@@ -17,18 +17,20 @@ import pathlib
 import platform
 import shutil
 import sys
+import tempfile
 
 import uvicorn
 
 from monailabel import print_config
 from monailabel.config import settings
 from monailabel.utils.others.generic import init_log_config
+from monailabel.utils.others.metrics import MULTIPROC_DIR_ENV
 
 logger = logging.getLogger(__name__)
 
 
 class Main:
-    def __init__(self, loglevel=logging.INFO, actions=("start_server", "apps", "datasets", "plugins")):
+    def __init__(self, loglevel=logging.INFO, actions=("start_server", "apps", "datasets", "plugins", "bench")):
         self.actions = set([actions] if isinstance(actions, str) else actions)
         logging.basicConfig(
             level=loglevel,
@@ -86,6 +88,32 @@ class Main:
         parser.add_argument("-o", "--output", help="Output path to save the plugin", default=None)
         parser.add_argument("--prefix", default=None)
 
+    def args_bench(self, parser):
+        parser.add_argument(
+            "-b",
+            "--benchmarks",
+            nargs="+",
+            default=["infer", "train", "datastore", "scoring", "wsi"],
+            choices=["infer", "train", "datastore", "scoring", "wsi"],
+            help="Benchmarks to run",
+        )
+        parser.add_argument("-o", "--output", default=None, help="Output json file (default: print to stdout)")
+        parser.add_argument("--baseline", default=None, help="Baseline json (previous run) to compare against")
+        parser.add_argument("--workdir", default=None, help="Work directory for synthetic data (default: temp)")
+        parser.add_argument("--size", nargs=3, default=[128, 128, 64], type=int, help="Synthetic volume size")
+        parser.add_argument("--roi_size", nargs=3, default=[64, 64, 64], type=int, help="Infer/Train roi size")
+        parser.add_argument("--repeat", default=5, type=int, help="Number of (timed) repeats")
+        parser.add_argument("--warmup", default=1, type=int, help="Number of warmup runs (not timed)")
+        parser.add_argument("--iterations", default=20, type=int, help="Number of training iterations")
+        parser.add_argument("--batch_size", default=2, type=int, help="Training batch size")
+        parser.add_argument("--num_workers", default=0, type=int, help="Training dataloader workers")
+        parser.add_argument("--objects", default=100, type=int, help="Number of images in datastore")
+        parser.add_argument("--wsi_size", default=8192, type=int, help="Synthetic WSI size (pixels)")
+        parser.add_argument("--tile_size", default=1024, type=int, help="WSI tile size (pixels)")
+        parser.add_argument("--wsi_backend", default="tifffile", help="WSI reader backend")
+        parser.add_argument("--device", default="cpu", help="Device for infer/train")
+        parser.add_argument("--seed", default=0, type=int, help="Random seed")
+
     def args_parser(self, name="monailabel"):
         parser = argparse.ArgumentParser(name)
         parser.add_argument("-v", "--version", action="store_true", help="print version")
@@ -111,6 +139,11 @@ class Main:
             self.args_plugins(parser_d)
             parser_d.set_defaults(action="plugins")
 
+        if "bench" in self.actions:
+            parser_e = subparsers.add_parser("bench", help="run performance benchmarks over synthetic data")
+            self.args_bench(parser_e)
+            parser_e.set_defaults(action="bench")
+
         return parser
 
     def run(self):
@@ -131,6 +164,8 @@ class Main:
             self.action_datasets(args)
         elif args.action == "plugins":
             self.action_plugins(args)
+        elif args.action == "bench":
+            self.action_bench(args)
         else:
             self.action_start_server(args)
 
@@ -140,6 +175,39 @@ class Main:
     def action_plugins(self, args):
         self._action_xyz(args, "plugins", "Plugin", None, shutil.ignore_patterns("__pycache__"))
 
+    def action_bench(self, args):
+        from monailabel.utils.others.benchmark import Benchmark, compare
+
+        benchmark = Benchmark(
+            workdir=args.workdir,
+            size=args.size,
+            roi_size=args.roi_size,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            iterations=args.iterations,
+            batch_size=args.batch_size,
+            num_workers=args.num_workers,
+            objects=args.objects,
+            wsi_size=args.wsi_size,
+            tile_size=args.tile_size,
+            wsi_backend=args.wsi_backend,
+            device=args.device,
+            seed=args.seed,
+        )
+        result = benchmark.run(args.benchmarks)
+
+        if args.baseline:
+            with open(args.baseline) as fc:
+                result["compare"] = compare(result, json.load(fc))
+
+        output = json.dumps(result, indent=2)
+        if args.output:
+            with open(args.output, "w") as fc:
+                fc.write(output)
+            print(f"Benchmark result is saved at: {args.output}")
+        else:
+            print(output)
+
     def action_datasets(self, args):
         from monai.apps.datasets import DecathlonDataset
         from monai.apps.utils import download_and_extract
@@ -239,6 +307,7 @@ class Main:
         if args.dryrun:
             return
 
+        self.start_server_init_metrics(args)
         uvicorn.run(
             args.uvicorn_app,
             host=args.host,
@@ -296,6 +365,19 @@ class Main:
             logger.debug(f"ENV SETTINGS:: {k} = {'*' * len(v) if k in sensitive else v}")
         logger.info("")
 
+    def start_server_init_metrics(self, args):
+        # metrics of all workers are shared through files (prometheus_client multi-process mode)
+        if not settings.MONAI_LABEL_METRICS or not args.workers or args.workers < 2 or os.environ.get(MULTIPROC_DIR_ENV):
+            return
+
+        path = settings.MONAI_LABEL_METRICS_MULTIPROC_DIR
+        path = path if path else os.path.join(tempfile.gettempdir(), f"monailabel-metrics-{args.port}")
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+        logger.info(f"Using {path} to share metrics of {args.workers} workers")
+        os.environ[MULTIPROC_DIR_ENV] = path
+
     def start_server_init_settings(self, args):
         # namespace('conf': [['key1','value1'],['key2','value2']])
         conf = {c[0]: c[1] for c in args.conf} if args.conf else {}
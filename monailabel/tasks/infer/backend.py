@@ -0,0 +1,283 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import logging
+import os
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+import torch
+from monai.data import MetaTensor
+from monai.utils import optional_import
+
+from monailabel.tasks.infer.precision import InferPrecision, autocast, quantize_network
+from monailabel.utils.others.generic import file_checksum, md5_digest
+
+logger = logging.getLogger(__name__)
+
+
+class InferBackend(str, Enum):
+    """
+    Execution backend used to run the network during inference
+
+    Attributes:
+        EAGER -         Plain PyTorch (default)
+        COMPILE -       torch.compile
+        TORCHSCRIPT -   Traced + Frozen TorchScript (cached next to checkpoint)
+        ONNX -          ONNX Runtime (cached next to checkpoint)
+    """
+
+    EAGER: str = "eager"
+    COMPILE: str = "compile"
+    TORCHSCRIPT: str = "torchscript"
+    ONNX: str = "onnx"
+
+
+class BackendNetwork(torch.nn.Module):
+    """
+    Wrap an (eager) network to run it over a different backend and/or precision.
+
+    Conversion is done lazily for every new input signature (shape, dtype, device) the network is called with, so
+    that the actual input shape is used for tracing/exporting.  Converted outputs are checked against eager outputs
+    for the same input; in case of mismatch (or failure to convert) it falls back to eager for that signature.
+    Cached artifacts are keyed by input signature, precision and checkpoint checksum.
+
+    Reduced precision (bf16 autocast, int8 quantization) is applied on top of the eager network before
+    conversion; parity check is skipped for those (use Dice based calibration report instead).
+    """
+
+    def __init__(
+        self,
+        network: torch.nn.Module,
+        backend: str,
+        path: Optional[str] = None,
+        check_parity: bool = True,
+        atol: float = 1e-3,
+        rtol: float = 1e-3,
+        precision: str = InferPrecision.FP32,
+        calibration: Optional[Sequence[torch.Tensor]] = None,
+    ):
+        """
+        :param network: eager network (already loaded on the target device)
+        :param backend: one of :py:class:`InferBackend`
+        :param path: checkpoint path; converted artifacts are cached next to it
+        :param check_parity: compare converted outputs against eager on first input
+        :param atol: absolute tolerance for parity check
+        :param rtol: relative tolerance for parity check
+        :param precision: one of :py:class:`monailabel.tasks.infer.precision.InferPrecision`
+        :param calibration: batched (pre-processed) inputs to calibrate static int8 quantization
+        """
+        super().__init__()
+        params = list(network.parameters())
+        device_type = params[0].device.type if params else "cpu"
+
+        self.backend = InferBackend(backend)
+        self.network, self.precision = quantize_network(network, InferPrecision(precision), device_type, calibration)
+        self.path = path
+        self.check_parity = check_parity and self.precision == InferPrecision.FP32
+        self.atol = atol
+        self.rtol = rtol
+
+        self._lock = threading.Lock()
+        self._runners: Dict[Hashable, Any] = {}
+        self._checksum: Optional[str] = None
+        self._session: Any = None
+        self._stats: Dict[str, Any] = {
+            "backend": self.backend.value,
+            "precision": self.precision.value,
+            "calls": 0,
+            "time": 0.0,
+        }
+
+    def forward(self, x):
+        key = self._key(x)
+        runner = self._runners.get(key)
+        if runner is None:
+            with self._lock:
+                runner = self._runners.get(key)
+                if runner is None:
+                    runner = self._runners[key] = self._prepare(_plain(x))
+
+        start = time.time()
+        with autocast(self.precision, x.device.type):
+            outputs = runner(_plain(x))
+        if torch.is_tensor(outputs) and outputs.dtype == torch.bfloat16:
+            outputs = outputs.float()
+        self._stats["calls"] += 1
+        self._stats["time"] += time.time() - start
+        return outputs
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["avg"] = round(stats.pop("time") / max(1, stats["calls"]), 4)
+        return stats
+
+    def artifact_path(self, x) -> Optional[str]:
+        """
+        Path of the converted artifact for given input (window); None if it is not cached next to the checkpoint
+        """
+        if not self.path or self.backend not in (InferBackend.TORCHSCRIPT, InferBackend.ONNX):
+            return None
+
+        if self._checksum is None:
+            self._checksum = file_checksum(self.path, "MD5")
+
+        # exported ONNX model has dynamic axes; so only dtype matters
+        signature = self._key(x) if self.backend == InferBackend.TORCHSCRIPT else (str(x.dtype),)
+        digest = md5_digest(f"{signature}|{self.precision.value}|{self._checksum}")[:12]
+        ext = ".onnx" if self.backend == InferBackend.ONNX else ".frozen.ts"
+        return f"{os.path.splitext(self.path)[0]}.{digest}{ext}"
+
+    def _key(self, x):
+        if self.backend in (InferBackend.EAGER, InferBackend.COMPILE):
+            return None
+        return tuple(x.shape), str(x.dtype), str(x.device)
+
+    def _prepare(self, x):
+        if self.backend == InferBackend.EAGER:
+            return self.network
+
+        start = time.time()
+        expected = self.network(x) if self.check_parity or self.backend != InferBackend.COMPILE else None
+        if expected is not None and not torch.is_tensor(expected) and self.backend != InferBackend.COMPILE:
+            logger.warning(f"Backend '{self.backend.value}' supports only single tensor output; using eager")
+            return self._fallback()
+
+        try:
+            runner = self._convert(x, expected)
+        except Exception as e:
+            logger.warning(f"Failed to convert network to backend '{self.backend.value}'; using eager: {e}")
+            return self._fallback()
+
+        if self.check_parity:
+            expected = _first(expected).float()
+            actual = _first(runner(x)).float()
+            diff = (expected - actual).abs().max().item()
+            self._stats["parity"] = round(diff, 6)
+            if not torch.allclose(expected, actual, atol=self.atol, rtol=self.rtol):
+                logger.warning(
+                    f"Backend '{self.backend.value}' output does not match eager (max diff: {diff}); using eager"
+                )
+                return self._fallback()
+
+        self._stats["convert"] = round(time.time() - start, 4)
+        logger.info(f"Network converted to backend: {self.backend.value}; {tuple(x.shape)}; {self._stats}")
+        return runner
+
+    def _fallback(self):
+        self._stats["backend"] = InferBackend.EAGER.value
+        return self.network
+
+    def _convert(self, x, expected=None):
+        if self.backend == InferBackend.COMPILE:
+            return torch.compile(self.network)
+        if self.backend == InferBackend.TORCHSCRIPT:
+            return self._torchscript(x)
+        if self.backend == InferBackend.ONNX:
+            return self._onnx(x, expected)
+        return self.network
+
+    def _torchscript(self, x):
+        device = x.device
+        artifact = self.artifact_path(x)
+        if artifact and os.path.exists(artifact):
+            logger.info(f"Using cached TorchScript: {artifact}")
+            return torch.jit.load(artifact, map_location=device)
+
+        network = self.network.eval()
+        module = network if isinstance(network, torch.jit.ScriptModule) else torch.jit.trace(network, x)
+        module = torch.jit.freeze(module.eval())
+        if artifact:
+            _save_atomic(artifact, lambda f: torch.jit.save(module, f))
+            logger.info(f"TorchScript (frozen) saved at: {artifact}")
+        return module
+
+    def _onnx(self, x, expected):
+        ort, has_ort = optional_import("onnxruntime")
+        if not has_ort:
+            raise RuntimeError("onnxruntime is not installed")
+
+        if self._session is None:
+            artifact = self.artifact_path(x)
+            if not artifact or not os.path.exists(artifact):
+                artifact = artifact if artifact else os.path.join(_tmp_dir(), f"model_{id(self)}.onnx")
+                dynamic_axes = {i: f"dim_{i}" for i in range(x.ndim) if i != 1}
+                export = functools.partial(
+                    torch.onnx.export,
+                    self.network.eval(),
+                    x,
+                    input_names=["input"],
+                    output_names=["output"],
+                    dynamic_axes={"input": dynamic_axes, "output": dynamic_axes},
+                    opset_version=17,
+                )
+                _save_atomic(artifact, export)
+                logger.info(f"ONNX model saved at: {artifact}")
+            else:
+                logger.info(f"Using cached ONNX model: {artifact}")
+
+            providers = ["CPUExecutionProvider"]
+            if x.device.type == "cuda" and "CUDAExecutionProvider" in ort.get_available_providers():
+                providers.insert(0, "CUDAExecutionProvider")
+            self._session = ort.InferenceSession(artifact, providers=providers)
+
+        session = self._session
+        device = x.device if "CUDAExecutionProvider" in session.get_providers() else torch.device("cpu")
+        shape, dtype = tuple(expected.shape), expected.dtype
+
+        def run(inputs):
+            # bind (device) buffers directly; avoids host round trip of input/output for every window
+            src = inputs.detach().to(device).contiguous()
+            dst = torch.empty(shape, dtype=dtype, device=device)
+            binding = session.io_binding()
+            binding.bind_input("input", device.type, device.index or 0, _np_dtype(src), src.shape, src.data_ptr())
+            binding.bind_output("output", device.type, device.index or 0, _np_dtype(dst), dst.shape, dst.data_ptr())
+            session.run_with_iobinding(binding)
+            return dst.to(inputs.device)
+
+        return run
+
+
+def _plain(x):
+    return x.as_tensor() if isinstance(x, MetaTensor) else x
+
+
+def _first(outputs):
+    if isinstance(outputs, (list, tuple)):
+        return outputs[0]
+    if isinstance(outputs, dict):
+        return next(iter(outputs.values()))
+    return outputs
+
+
+def _np_dtype(t: torch.Tensor):
+    return np.dtype(str(t.dtype).replace("torch.", ""))
+
+
+def _save_atomic(path, save):
+    # concurrent readers (other workers) never see a partially written artifact
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        save(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _tmp_dir():
+    path = os.path.join(os.path.expanduser("~"), ".cache", "monailabel", "backend")
+    os.makedirs(path, exist_ok=True)
+    return path
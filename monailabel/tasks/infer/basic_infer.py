@@ -10,27 +10,43 @@
 # limitations under the License.
 
 import copy
+import functools
 import logging
 import os
+import random
 import time
 from abc import abstractmethod
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import torch
-from monai.data import decollate_batch
+from monai.data import MetaTensor, decollate_batch
 from monai.inferers import Inferer, SimpleInferer, SlidingWindowInferer
-from monai.utils import deprecated
+from monai.transforms import LoadImage, LoadImaged
+from monai.utils import deprecated, ensure_tuple_rep
 
+from monailabel.config import settings
 from monailabel.interfaces.exception import MONAILabelError, MONAILabelException
 from monailabel.interfaces.tasks.infer_v2 import InferTask, InferType
 from monailabel.interfaces.utils.transform import dump_data, run_transforms
-from monailabel.transform.cache import CacheTransformDatad
+from monailabel.tasks.infer.backend import BackendNetwork, InferBackend
+from monailabel.tasks.infer.batching import get_batcher
+from monailabel.tasks.infer.precision import InferPrecision, dice_score, to_labels
+from monailabel.transform.cache import CacheTransformDatad, SessionCacheDatad, session_cache_stats
+from monailabel.transform.pre import ROICropd
 from monailabel.transform.writer import ClassificationWriter, DetectionWriter, Writer
 from monailabel.utils.others.generic import device_list, device_map, name_to_device, strtobool
+from monailabel.utils.others.memory import MemoryMonitor
+from monailabel.utils.others.model_registry import model_registry
+from monailabel.utils.others.planner import SlidingWindowPlanner, free_memory
+from monailabel.utils.others.profiler import profile_infer, profiler
+from monailabel.utils.others.result_cache import content_digest
 
 logger = logging.getLogger(__name__)
 
+_sw_planner = SlidingWindowPlanner()
+
 
 class CallBackTypes(str, Enum):
     PRE_TRANSFORMS = "PRE_TRANSFORMS"
@@ -63,6 +79,13 @@ class BasicInferTask(InferTask):
         preload=False,
         train_mode=False,
         skip_writer=False,
+        release_input=True,
+        invert_output=False,
+        backend: Union[str, InferBackend] = InferBackend.EAGER,
+        precision: Union[str, InferPrecision] = InferPrecision.FP32,
+        sw_planner=False,
+        roi_mode=False,
+        roi_margin: Union[int, Sequence[int]] = 32,
     ):
         """
         :param path: Model File Path. Supports multiple paths to support versions (Last item will be picked as latest)
@@ -81,6 +104,14 @@ class BasicInferTask(InferTask):
         :param preload: Preload model/network on all available GPU devices
         :param train_mode: Run in Train mode instead of eval (when network has dropouts)
         :param skip_writer: Skip Writer and return data dictionary
+        :param release_input: Drop pre-processed input (keeps shape/meta only) once forward pass is completed;
+            set False if post transforms/writer need the input values
+        :param invert_output: Run inverse transforms and write inverted prediction back to output_label_key
+        :param backend: Default backend to run network (eager, compile, torchscript, onnx); can be set per request
+        :param precision: Default precision (fp32, bf16, int8_dynamic, int8_static); can be set per request
+        :param sw_planner: Plan sliding window (batch size, overlap, device split) based on available memory
+        :param roi_mode: Run only over (padded) ROI around guidance points (or client roi) and paste result back
+        :param roi_margin: Margin (voxels) added around guidance points to derive the ROI
         """
 
         super().__init__(type, labels, dimension, description, config)
@@ -95,8 +126,16 @@ class BasicInferTask(InferTask):
         self.roi_size = roi_size
         self.train_mode = train_mode
         self.skip_writer = skip_writer
+        self.release_input = release_input
+        self.invert_output = invert_output
+        self.backend = InferBackend(backend)
+        self.precision = InferPrecision(precision)
+        self.sw_planner = sw_planner
+        self.roi_mode = roi_mode
+        self.roi_margin = roi_margin
 
-        self._networks: Dict = {}
+        self._registry_owner = f"{self.__class__.__name__}@{id(self):x}"
+        self._calibration: List[torch.Tensor] = []
 
         self._config.update(
             {
@@ -110,13 +149,14 @@ class BasicInferTask(InferTask):
             }
         )
 
+        if self.type in (InferType.DEEPEDIT, InferType.DEEPGROW):
+            self._config["roi_mode"] = roi_mode
+
         if config:
             self._config.update(config)
 
         if preload:
-            for device in device_map().values():
-                logger.info(f"Preload Network for device: {device}")
-                self._get_network(device, None)
+            self.warmup()
 
     def info(self) -> Dict[str, Any]:
         return {
@@ -151,6 +191,13 @@ class BasicInferTask(InferTask):
                     return path
         return None
 
+    def model_version(self) -> Optional[str]:
+        """
+        Version of the current model (checksum of checkpoint); None if network is not loaded from a checkpoint
+        """
+        path = self.get_path()
+        return content_digest(path) if path else None
+
     @deprecated(since="0.8.0", msg_suffix="This feature is not supported anymore")
     def add_cache_transform(self, t, data, keys=("image", "image_meta_dict"), hash_key=("image_path", "model")):
         pass
@@ -235,9 +282,22 @@ class BasicInferTask(InferTask):
         sliding = False
         if input_shape and roi_size:
             for i in range(len(roi_size)):
-                if input_shape[-i] > roi_size[-i]:
+                if input_shape[-i - 1] > roi_size[-i - 1]:
                     sliding = True
 
+        plan = None
+        if sliding and strtobool(data.get("sw_planner", self.sw_planner)):
+            plan = self.plan_sliding_window(data)
+        if plan:
+            data["sw_plan"] = plan
+            return SlidingWindowInferer(
+                roi_size=plan["roi_size"],
+                overlap=plan["overlap"],
+                sw_batch_size=data.get("sw_batch_size", plan["sw_batch_size"]),
+                sw_device=plan["sw_device"],
+                device=plan["device"],
+            )
+
         if sliding:
             return SlidingWindowInferer(
                 roi_size=roi_size,
@@ -248,9 +308,29 @@ class BasicInferTask(InferTask):
             )
         return SimpleInferer()
 
+    def plan_sliding_window(self, data) -> Optional[Dict[str, Any]]:
+        """
+        Plan sliding window (roi tiling, overlap, sw_batch_size and sw_device/device split) for current request
+        based on input shape, measured memory per window for the model and currently free device/host memory
+        """
+        network = self._get_network(data.get("device"), data)
+        if network is None:
+            return None
+
+        key = (self._registry_owner, data.get("backend", self.backend), data.get("precision", self.precision))
+        return _sw_planner.plan(
+            key=key,
+            network=network,
+            input_shape=data[self.input_key].shape,
+            roi_size=data.get("roi_size", self.roi_size),
+            device=data.get("device"),
+            overlap=data.get("sw_overlap", 0.25),
+        )
+
     def detector(self, data=None) -> Optional[Callable]:
         return None
 
+    @profile_infer
     def __call__(
         self, request, callbacks: Union[Dict[CallBackTypes, Any], None] = None
     ) -> Tuple[Union[str, None], Dict]:
@@ -265,20 +345,23 @@ class BasicInferTask(InferTask):
         You can provide callbacks which can be useful while writing pipelines to consume intermediate outputs
         Callback function should consume data and return data (modified/updated) e.g. `def my_cb(data): return data`
 
+        Set `profile: true` in request to capture a profile (torch.profiler trace + python stacks) of the request
+
         Returns: Label (File Path) and Result Params (JSON)
         """
         begin = time.time()
-        req = copy.deepcopy(self._config)
-        req.update(request)
-
-        # device
-        device = name_to_device(req.get("device", "cuda"))
-        req["device"] = device
-
-        logger.setLevel(req.get("logging", "INFO").upper())
-        if req.get("image") is not None and isinstance(req.get("image"), str):
+        prepared = request.get("_prepared")
+        req = self._request(request)
+        device = req["device"]
+
+        if prepared is not None:
+            # pre transforms already run by `prepare`; keep their output and add request params it does not have
+            data = prepared["data"]
+            for k, v in req.items():
+                data.setdefault(k, v)
+        elif req.get("image") is not None and isinstance(req.get("image"), str):
             logger.info(f"Infer Request (final): {req}")
-            data = copy.deepcopy(req)
+            data = _copy_request(req)
             data.update({"image_path": req.get("image")})
         else:
             dump_data(req, logger.level)
@@ -293,49 +376,76 @@ class BasicInferTask(InferTask):
         callback_run_post_transforms = callbacks.get(CallBackTypes.POST_TRANSFORMS)
         callback_writer = callbacks.get(CallBackTypes.WRITER)
 
-        start = time.time()
-        pre_transforms = self.pre_transforms(data)
-        data = self.run_pre_transforms(data, pre_transforms)
-        if callback_run_pre_transforms:
-            data = callback_run_pre_transforms(data)
-        latency_pre = time.time() - start
-
-        start = time.time()
-        if self.type == InferType.DETECTION:
-            data = self.run_detector(data, device=device)
-        else:
-            data = self.run_inferer(data, device=device)
-
-        if callback_run_inferer:
-            data = callback_run_inferer(data)
-        latency_inferer = time.time() - start
-
-        start = time.time()
-        logger.info(f"Got inferred transform {data['pred'].sum()}")
-        logger.info(pre_transforms)
-        data = self.run_invert_transforms(data, pre_transforms, self.inverse_transforms(data))
-        if callback_run_invert_transforms:
-            data = callback_run_invert_transforms(data)
-        latency_invert = time.time() - start
-
-        logger.info(f"Got invert transform {data['pred'].sum()}")
-
-        start = time.time()
-        data = self.run_post_transforms(data, self.post_transforms(data))
-        if callback_run_post_transforms:
-            data = callback_run_post_transforms(data)
-        latency_post = time.time() - start
-
-        logger.info(f"Got post transform {data['pred'].sum()}")
-
-        if self.skip_writer or strtobool(data.get("skip_writer")):
-            return None, dict(data)
-
-        start = time.time()
-        result_file_name, result_json = self.writer(data)
-        if callback_writer:
-            data = callback_writer(data)
-        latency_write = time.time() - start
+        # sample memory in background only when it is consumed (admission learns from it or request is profiled)
+        sampled = strtobool(req.get("admission", settings.MONAI_LABEL_INFER_ADMISSION)) or profiler().active()
+        monitor = MemoryMonitor(device, settings.MONAI_LABEL_INFER_MEMORY_INTERVAL if sampled else 0).start()
+        try:
+            start = time.time()
+            with monitor.stage("pre"):
+                if prepared is None:
+                    data, pre_transforms, roi = self._run_pre(data)
+                else:
+                    pre_transforms, roi = prepared["pre_transforms"], prepared["roi"]
+                    start -= prepared["latency"]  # pre transforms ran earlier (in `prepare`)
+                if callback_run_pre_transforms:
+                    data = callback_run_pre_transforms(data)
+            latency_pre = time.time() - start
+
+            start = time.time()
+            with monitor.stage("infer"):
+                if self.type == InferType.DETECTION:
+                    data = self.run_detector(data, device=device)
+                else:
+                    data = self.run_inferer(data, device=device)
+
+                if callback_run_inferer:
+                    data = callback_run_inferer(data)
+            latency_inferer = time.time() - start
+
+            # tensor bytes no longer held for invert/post (estimate); measured peaks are part of `peak_memory`
+            memory = {"input": _to_mb(_nbytes(data.get(self.input_key)))}
+            estimate = 0
+            if strtobool(data.get("release_input", self.release_input)):
+                released = self.run_release_input(data)
+                memory["released"] = _to_mb(released)
+                estimate += released
+
+            start = time.time()
+            inverse_transforms = self.inverse_transforms(data)
+            if inverse_transforms is not None and strtobool(data.get("invert_output", self.invert_output)):
+                copy_avoided = sum(_nbytes(v) for v in data.values() if _is_large(v))
+                memory["invert_copy_avoided"] = _to_mb(copy_avoided)
+                estimate += copy_avoided
+            memory["estimated_reduction"] = _to_mb(estimate)
+            with monitor.stage("invert"):
+                data = self.run_invert_transforms(data, pre_transforms, inverse_transforms)
+                if callback_run_invert_transforms:
+                    data = callback_run_invert_transforms(data)
+            latency_invert = time.time() - start
+
+            start = time.time()
+            with monitor.stage("post"):
+                data = self.run_post_transforms(data, self.post_transforms(data))
+                if callback_run_post_transforms:
+                    data = callback_run_post_transforms(data)
+                if roi:
+                    data = self.run_paste_roi(data, roi)
+                for t in pre_transforms:
+                    if isinstance(t, SessionCacheDatad):
+                        t.save_result(data)
+            latency_post = time.time() - start
+
+            if self.skip_writer or strtobool(data.get("skip_writer")):
+                return None, dict(data)
+
+            start = time.time()
+            with monitor.stage("write"):
+                result_file_name, result_json = self.writer(data)
+                if callback_writer:
+                    data = callback_writer(data)
+            latency_write = time.time() - start
+        finally:
+            monitor.stop()
 
         latency_total = time.time() - begin
         logger.info(
@@ -359,6 +469,14 @@ class BasicInferTask(InferTask):
             "write": round(latency_write, 2),
             "total": round(latency_total, 2),
             "transform": data.get("latencies"),
+            "memory": memory,
+            "peak_memory": monitor.summary(),
+            "backend": data.get("infer_backend"),
+            "sw_plan": data.get("sw_plan"),
+            "roi": {k: v for k, v in roi.items() if k in ("bbox", "shape", "ratio")} if roi else None,
+            "session_cache": (
+                {"status": data["session_cache"], **session_cache_stats()} if data.get("session_cache") else None
+            ),
         }
 
         # Add Centroids to the result json to consume in OHIF v3
@@ -377,6 +495,36 @@ class BasicInferTask(InferTask):
         logger.info(f"Result Json Keys: {list(result_json.keys())}")
         return result_file_name, result_json
 
+    def _request(self, request) -> Dict[str, Any]:
+        req = _copy_request(self._config)
+        req.update({k: v for k, v in request.items() if k != "_prepared"})
+        req["device"] = name_to_device(req.get("device", "cuda"))
+        logger.setLevel(req.get("logging", "INFO").upper())
+        return req
+
+    def _run_pre(self, data: Dict[str, Any]):
+        pre_transforms = self.pre_transforms(data)
+        roi = None
+        if strtobool(data.get("roi_mode", self.roi_mode)):
+            roi = self.run_crop_roi(data, pre_transforms)
+        data = self.run_pre_transforms(data, pre_transforms)
+        if roi:
+            roi = self._roi_info(data, roi)
+        return data, pre_transforms, roi
+
+    def prepare(self, request) -> Dict[str, Any]:
+        """
+        Run (only) pre transforms for the request; passing the result as `_prepared` in the request skips them when the
+        request is run. Batch infer prepares the next images (e.g. image decode) while the current one runs on device.
+        """
+        start = time.time()
+        data = self._request(request)
+        if isinstance(data.get("image"), str):
+            data["image_path"] = data["image"]
+
+        data, pre_transforms, roi = self._run_pre(data)
+        return {"data": data, "pre_transforms": pre_transforms, "roi": roi, "latency": time.time() - start}
+
     def run_pre_transforms(self, data: Dict[str, Any], transforms):
         pre_cache: List[Any] = []
         post_cache: List[Any] = []
@@ -406,7 +554,8 @@ class BasicInferTask(InferTask):
         return run_transforms(data, transforms, log_prefix="PRE", use_compose=False)
 
     def run_invert_transforms(self, data: Dict[str, Any], pre_transforms, names):
-        if names is None:
+        # inverted prediction is used only if requested; so skip the work otherwise
+        if names is None or not strtobool(data.get("invert_output", self.invert_output)):
             return data
 
         pre_names = dict()
@@ -420,29 +569,198 @@ class BasicInferTask(InferTask):
         if len(names) > 0:
             transforms = [pre_names[n if isinstance(n, str) else n.__name__] for n in names]
 
-        d = copy.deepcopy(dict(data))
-        #d[self.input_key] = data[self.output_label_key]
+        # Minimal copy: only prediction (as input_key) + (small) meta/applied-operations needed for inverse
+        d = {k: copy.deepcopy(v) for k, v in data.items() if not _is_large(v)}
+        d[self.input_key] = self._invertible_pred(data)
 
         d = run_transforms(d, transforms, inverse=True, log_prefix="INV")
-        #data[self.output_label_key] = d[self.input_key]
+        data[self.output_label_key] = d[self.input_key]
+        data["latencies"] = d.get("latencies", data.get("latencies"))
+        return data
+
+    def _invertible_pred(self, data: Dict[str, Any]):
+        # view of the prediction (shares storage) with its own meta; so inverse does not modify prediction in data
+        pred = data[self.output_label_key]
+        if not isinstance(pred, torch.Tensor):
+            return copy.deepcopy(pred)
+
+        image = data.get(self.input_key)
+        meta = copy.deepcopy(pred.meta) if isinstance(pred, MetaTensor) else None
+        ops = pred.applied_operations if isinstance(pred, MetaTensor) else []
+        if not ops and isinstance(image, MetaTensor):
+            ops = image.applied_operations
+        tensor = pred.as_tensor() if isinstance(pred, MetaTensor) else pred
+        return MetaTensor(tensor, meta=meta, applied_operations=copy.deepcopy(ops))
+
+    def run_release_input(self, data: Dict[str, Any]) -> int:
+        """
+        Replace pre-processed input by a zero-stride placeholder (same shape, dtype and meta); the task owns `data`
+        and does not need input values after forward pass (`release_input`), so its reference is dropped.
+        Post transforms can still refer to shape/meta of input but not to its values.
+
+        :param data: data after running inferer
+        :return: number of bytes dropped from data (freed unless referenced elsewhere e.g. session cache)
+        """
+        image = data.get(self.input_key)
+        released = _nbytes(image)
+        if not released:
+            return 0
+
+        if isinstance(image, torch.Tensor):
+            placeholder = torch.zeros(1, dtype=image.dtype).expand(image.shape)
+            if isinstance(image, MetaTensor):
+                placeholder = MetaTensor(placeholder, meta=image.meta, applied_operations=image.applied_operations)
+        else:
+            placeholder = np.broadcast_to(np.zeros(1, dtype=image.dtype), image.shape)
+
+        data[self.input_key] = placeholder
+        return released
+
+    def guidance_keys(self, data: Dict[str, Any]) -> List[str]:
+        """
+        Keys in request which carry guidance points (clicks) e.g. foreground/background or label names (DeepEdit)
+        """
+        keys = ["foreground", "background"]
+        if isinstance(self.labels, dict):
+            keys.extend(self.labels.keys())
+        elif isinstance(self.labels, str):
+            keys.append(self.labels)
+        elif self.labels:
+            keys.extend(self.labels)
+        return [k for k in dict.fromkeys(keys) if isinstance(data.get(k), (list, tuple))]
+
+    def run_crop_roi(self, data: Dict[str, Any], transforms) -> Optional[Dict[str, Any]]:
+        """
+        Crop input image to (padded) bounding box of guidance points or client provided `roi` ([[start, end], ...])
+        right after it is loaded (:py:class:`monailabel.transform.pre.ROICropd` is added to pre-transforms after
+        `LoadImaged`); so that the remaining pre-transforms run only over the roi.  Guidance points are shifted to the
+        cropped image.
+
+        Note: networks which resize the input to a fixed size (e.g. DeepEdit) still run over the same size.
+
+        :param data: request
+        :param transforms: pre-transforms (updated in-place)
+        :return: roi info (used to paste the result back) or None when roi does not apply
+        """
+        keys = self.guidance_keys(data)
+        points = [p for k in keys for p in data[k] if isinstance(p, (list, tuple)) and len(p) >= 3]
+        if not points and not data.get("roi"):
+            return None
+
+        loader = next(
+            (i for i, t in enumerate(transforms) if isinstance(t, LoadImaged) and self.input_key in t.keys), None
+        )
+        if loader is None:
+            logger.info("ROI mode needs LoadImaged for input in pre-transforms; roi is ignored")
+            return None
+
+        if data.get("roi"):
+            bbox = [[max(0, int(s)), int(e)] for s, e in data["roi"]]
+        else:
+            margin = ensure_tuple_rep(data.get("roi_margin", self.roi_margin), 3)
+            p = np.array([q[:3] for q in points], dtype=int)
+            bbox = [[max(0, int(lo) - m), int(hi) + 1 + m] for lo, hi, m in zip(p.min(axis=0), p.max(axis=0), margin)]
+        if any(e <= s for s, e in bbox):
+            return None
+
+        start = [s for s, _ in bbox]
+        for k in keys:
+            data[k] = [_shift_point(q, start, -1) if isinstance(q, (list, tuple)) else q for q in data[k]]
+        data["roi_bbox"] = bbox
+
+        transforms.insert(loader + 1, ROICropd(keys=self.input_key))
+        return {"bbox": bbox}
+
+    def _roi_info(self, data: Dict[str, Any], roi: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # geometry of the original image as recorded by ROICropd (in meta of input; also for session cache hits)
+        image = data.get(self.input_key)
+        info = image.meta.get("roi") if isinstance(image, MetaTensor) else None
+        if not info:
+            logger.warning(f"ROI {roi['bbox']} is not applied on input; result is not pasted back")
+            return None
+
+        ratio = float(np.prod([e - s for s, e in info["bbox"]])) / float(max(1, np.prod(info["shape"])))
+        logger.info(f"ROI: {info['bbox']}; image: {info['shape']}; ratio: {ratio:.4f}")
+        return {**info, "ratio": round(ratio, 4)}
+
+    def run_paste_roi(self, data: Dict[str, Any], roi: Dict[str, Any]):
+        """
+        Paste result (post-processed over roi) back into previous label (if provided as `label`), previous prediction
+        of the session (see :py:class:`monailabel.transform.cache.SessionCacheDatad`) or an empty label of the
+        original image size/geometry
+
+        :param data: post-processed data
+        :param roi: roi info returned by :py:meth:`run_crop_roi`
+        """
+        pred = data[self.output_label_key]
+        pred = pred.detach().cpu().numpy() if torch.is_tensor(pred) else np.asarray(pred)
+
+        shape = tuple(roi["shape"])
+        bbox = roi["bbox"]
+        if pred.shape[-3:] != tuple(e - s for s, e in bbox):
+            logger.warning(f"Result shape {pred.shape} does not match ROI {bbox}; result is not pasted back")
+            return data
+
+        full = None
+        prev = data.get("label") if data.get("label") is not None else data.get("previous_label")
+        if isinstance(prev, str) and os.path.isfile(prev):
+            prev = LoadImage(reader="ITKReader", image_only=True)(prev)
+        if prev is not None and not isinstance(prev, str) and tuple(np.shape(prev)) == pred.shape[:-3] + shape:
+            full = np.array(prev.detach().cpu() if torch.is_tensor(prev) else prev, dtype=pred.dtype)
+        if full is None:
+            full = np.zeros(pred.shape[:-3] + shape, dtype=pred.dtype)
+
+        full[(Ellipsis,) + tuple(slice(s, e) for s, e in bbox)] = pred
+        data[self.output_label_key] = full
+
+        meta = data.get(f"{self.output_label_key}_meta_dict")
+        meta = meta if isinstance(meta, dict) else {}
+        meta["affine"] = roi["affine"]
+        data[f"{self.output_label_key}_meta_dict"] = meta
+
+        start = [s for s, _ in bbox]
+        for c in data.get("centroids") or []:
+            for k, v in c.items():
+                c[k] = v[:-3] + _shift_point(v[-3:], start, 1) if isinstance(v, list) and len(v) >= 3 else v
         return data
 
     def run_post_transforms(self, data: Dict[str, Any], transforms):
         return run_transforms(data, transforms, log_prefix="POST")
 
     def clear_cache(self):
-        self._networks.clear()
+        model_registry().remove(self._registry_owner)
+        _sw_planner.clear(self._registry_owner)
+
+    def warmup(self, devices=None):
+        """
+        Load (and warm up) network in background for the given devices (default: all available devices)
+        so that the first request does not have to pay for it
+        """
+        for device in devices if devices else device_map().values():
+            logger.info(f"Preload Network for device: {device}")
+            self._get_network(device, None, background=True)
+
+    def warmup_network(self, network, device):
+        """
+        Override to warm up a newly (re)loaded network before it is made available to requests
+        (e.g. run a dummy forward pass over an input of roi_size)
+
+        :param network: newly loaded network
+        :param device: device on which network is loaded
+        """
+        pass
 
-    def _get_network(self, device, data):
+    def _get_network(self, device, data, background=False):
         path = self.get_path()
         logger.info(f"Infer model path: {path}")
 
+        variant = None
         if data and self._config.get("model_filename"):
             model_filename = data.get("model_filename")
             model_filename = model_filename if isinstance(model_filename, str) else model_filename[0]
             user_path = os.path.join(os.path.dirname(self.path[0]), model_filename)
             if user_path and os.path.exists(user_path):
-                path = user_path
+                path = variant = user_path
                 logger.info(f"Using <User> provided model_file: {user_path}")
             else:
                 logger.info(f"Ignoring <User> provided model_file (not valid): {user_path}")
@@ -456,44 +774,112 @@ class BasicInferTask(InferTask):
                 f"Model Path ({self.path}) does not exist/valid",
             )
 
-        cached = self._networks.get(device)
-        statbuf = os.stat(path) if path else None
-        network = None
-        if cached:
-            if statbuf and statbuf.st_mtime == cached[1]:
-                network = cached[0]
-            elif statbuf:
-                logger.warning(f"Reload model from cache.  Prev ts: {cached[1]}; Current ts: {statbuf.st_mtime}")
+        backend = _infer_option(InferBackend, data.get("backend", self.backend) if data else self.backend, "backend")
+        precision = _infer_option(
+            InferPrecision, data.get("precision", self.precision) if data else self.precision, "precision"
+        )
+        if (backend != InferBackend.EAGER or precision != InferPrecision.FP32) and self.train_mode:
+            logger.warning(f"Backend/Precision '{backend.value}/{precision.value}' not supported in train mode")
+            backend, precision = InferBackend.EAGER, InferPrecision.FP32
+
+        # latest checkpoint replaces current network of the same key (in background); user selected model file is
+        # a separate network
+        key = (self._registry_owner, device, backend.value, precision.value)
+        key = key + (variant,) if variant else key
+        loader = functools.partial(self._load_network, device=device, backend=backend, precision=precision)
+        warmup = functools.partial(self.warmup_network, device=device)
+        resolve = None if variant else self.get_path
+        if background:
+            model_registry().preload(key, path, loader, warmup, resolve)
+            return None
+        return model_registry().get(key, path, loader, warmup, resolve)
 
-        if network is None:
-            if self.network:
-                network = copy.deepcopy(self.network)
-                network.to(torch.device(device))
-
-                if path:
-                    checkpoint = torch.load(path, map_location=torch.device(device), weights_only=False)
-                    model_state_dict = checkpoint.get(self.model_state_dict, checkpoint)
-                    if set(self.network.state_dict().keys()) != set(model_state_dict.keys()):
-                        logger.warning(
-                            f"Checkpoint keys don't match network.state_dict()! Items that exist in only one dict"
-                            f" but not in the other: {set(self.network.state_dict().keys()) ^ set(model_state_dict.keys())}"
-                        )
-                        logger.warning(
-                            "The run will now continue unless load_strict is set to True. "
-                            "If loading fails or the network behaves abnormally, please check the loaded weights"
-                        )
-                    network.load_state_dict(model_state_dict, strict=self.load_strict)
-            else:
-                network = torch.jit.load(path, map_location=torch.device(device))
+    def _load_network(self, path, device, backend=InferBackend.EAGER, precision=InferPrecision.FP32):
+        if self.network:
+            network = copy.deepcopy(self.network)
+            network.to(torch.device(device))
 
-            if self.train_mode:
-                network.train()
-            else:
-                network.eval()
-            self._networks[device] = (network, statbuf.st_mtime if statbuf else 0)
+            if path:
+                checkpoint = torch.load(path, map_location=torch.device(device), weights_only=False)
+                model_state_dict = checkpoint.get(self.model_state_dict, checkpoint)
+                if set(self.network.state_dict().keys()) != set(model_state_dict.keys()):
+                    logger.warning(
+                        f"Checkpoint keys don't match network.state_dict()! Items that exist in only one dict"
+                        f" but not in the other: {set(self.network.state_dict().keys()) ^ set(model_state_dict.keys())}"
+                    )
+                    logger.warning(
+                        "The run will now continue unless load_strict is set to True. "
+                        "If loading fails or the network behaves abnormally, please check the loaded weights"
+                    )
+                network.load_state_dict(model_state_dict, strict=self.load_strict)
+        else:
+            network = torch.jit.load(path, map_location=torch.device(device))
+
+        if self.train_mode:
+            network.train()
+        else:
+            network.eval()
 
+        if backend != InferBackend.EAGER or precision != InferPrecision.FP32:
+            calibration = [x.to(torch.device(device)) for x in self._calibration]
+            network = BackendNetwork(network, backend, path, precision=precision, calibration=calibration)
         return network
 
+    def calibrate(self, datastore, max_samples=4, device="cpu") -> Dict[str, Any]:
+        """
+        Collect calibration inputs (pre-processed sample images from datastore; center cropped to roi_size)
+        for static int8 quantization and compare outputs of each reduced precision profile against fp32 (Dice)
+
+        :param datastore: datastore to sample images from
+        :param max_samples: max number of images to use for calibration
+        :param device: device to run calibration
+        :return: Dice (mean over samples) against fp32 per precision profile
+        """
+        images = datastore.list_images()
+        images = random.sample(images, min(max_samples, len(images)))
+
+        inputs = []
+        for image_id in images:
+            data = _copy_request(self._config)
+            data.update({"image": datastore.get_image_uri(image_id), "device": device, "logging": "WARNING"})
+            data["image_path"] = data["image"]
+            try:
+                data = self.run_pre_transforms(data, self.pre_transforms(data))
+            except Exception as e:
+                logger.warning(f"Skip {image_id} for calibration; failed to run pre-transforms: {e}")
+                continue
+
+            x = torch.as_tensor(data[self.input_key])
+            x = x.as_tensor() if isinstance(x, MetaTensor) else x
+            inputs.append(_center_crop(x[None], self.roi_size).cpu())
+
+        self._calibration = inputs
+        # networks using calibration are re-loaded in background and swapped in (in-flight requests keep old ones)
+        int8_static = InferPrecision.INT8_STATIC.value
+        for future in model_registry().reload(self._registry_owner, lambda k: k[3] == int8_static):
+            future.result()
+        logger.info(f"Calibration inputs: {len(inputs)}; shapes: {[tuple(x.shape) for x in inputs]}")
+
+        result: Dict[str, Any] = {"samples": len(inputs)}
+        if not inputs:
+            return result
+
+        fp32 = self._get_network(device, {"backend": InferBackend.EAGER, "precision": InferPrecision.FP32})
+        with torch.no_grad():
+            expected = [to_labels(fp32(x.to(torch.device(device)))) for x in inputs]
+
+            for precision in (InferPrecision.BF16, InferPrecision.INT8_DYNAMIC, InferPrecision.INT8_STATIC):
+                network = self._get_network(device, {"backend": InferBackend.EAGER, "precision": precision})
+                actual = [to_labels(network(x.to(torch.device(device)))) for x in inputs]
+                dice = [dice_score(a, e) for a, e in zip(actual, expected)]
+                result[precision.value] = {
+                    "dice": round(sum(dice) / len(dice), 4),
+                    "precision": network.stats()["precision"] if isinstance(network, BackendNetwork) else "fp32",
+                }
+
+        logger.info(f"Calibration result (Dice against fp32): {result}")
+        return result
+
     def run_inferer(self, data: Dict[str, Any], convert_to_batch=True, device="cuda"):
         """
         Run Inferer over pre-processed Data.  Derive this logic to customize the normal behavior.
@@ -515,8 +901,15 @@ class BasicInferTask(InferTask):
             inputs = inputs[None] if convert_to_batch else inputs
             inputs = inputs.to(torch.device(device))
 
-            with torch.no_grad():
-                outputs = inferer(inputs, network)
+            # forward pass can be shared with other (concurrent) requests e.g. tiles of wsi infer
+            batcher = get_batcher(data.get("tile_batch")) if convert_to_batch else None
+            with _grad_mode(data):
+                if batcher:
+                    batcher.resolve(functools.partial(self._auto_batch_size, network, inputs, device, data))
+                    key = (device, tuple(inputs.shape), inputs.dtype, id(network))
+                    outputs = batcher.run(key, inputs, functools.partial(inferer, network=network))
+                else:
+                    outputs = inferer(inputs, network)
 
             if device.startswith("cuda"):
                 torch.cuda.empty_cache()
@@ -529,11 +922,27 @@ class BasicInferTask(InferTask):
                     outputs = outputs[0]
 
             data[self.output_label_key] = outputs
+            data["infer_backend"] = (
+                network.stats()
+                if isinstance(network, BackendNetwork)
+                else {"backend": InferBackend.EAGER.value, "precision": InferPrecision.FP32.value}
+            )
         else:
             # consider them as callable transforms
             data = run_transforms(data, inferer, log_prefix="INF", log_name="Inferer")
         return data
 
+    def _auto_batch_size(self, network, inputs, device, data) -> int:
+        """
+        Batch size for batched (multi tile) forward based on measured memory per input and free device memory.
+        Host memory of a forward can't be measured reliably (RSS), so there is no auto batching on cpu.
+        """
+        if not str(device).startswith("cuda"):
+            return 1
+        key = (self._registry_owner, data.get("backend", self.backend), data.get("precision", self.precision))
+        m = _sw_planner.measure(key, network, inputs.shape[1], inputs.shape[2:], device)
+        return int(_sw_planner.memory_fraction * free_memory(device) // max(1, m["window"]))
+
     def run_detector(self, data: Dict[str, Any], convert_to_batch=True, device="cuda"):
         """
         Run Detector over pre-processed Data.  Derive this logic to customize the normal behavior.
@@ -631,7 +1040,57 @@ class BasicInferTask(InferTask):
         return writer(data)
 
     def clear(self):
-        self._networks.clear()
+        self.clear_cache()
 
     def set_loglevel(self, level: str):
         logger.setLevel(level.upper())
+
+
+def _nbytes(v) -> int:
+    if isinstance(v, torch.Tensor):
+        return v.untyped_storage().nbytes() if v.numel() else 0
+    if isinstance(v, np.ndarray):
+        return v.itemsize if 0 in v.strides else v.nbytes
+    return 0
+
+
+def _is_large(v, threshold=65536) -> bool:
+    return _nbytes(v) >= threshold
+
+
+def _to_mb(nbytes: int) -> float:
+    return round(nbytes / (1024 * 1024), 2)
+
+
+def _grad_mode(data):
+    # inference_mode (opt-in) is faster than no_grad; but outputs can't be updated in-place by post transforms
+    return torch.inference_mode() if strtobool(data.get("inference_mode", False)) else torch.no_grad()
+
+
+def _infer_option(enum_type, value, name):
+    try:
+        return enum_type(value)
+    except ValueError:
+        raise MONAILabelException(
+            MONAILabelError.INVALID_INPUT,
+            f"Invalid {name} '{value}'; supported: {[e.value for e in enum_type]}",
+        )
+
+
+def _shift_point(p, start, sign):
+    return [int(v) + sign * s for v, s in zip(p[: len(start)], start)] + list(p[len(start) :])
+
+
+def _center_crop(x, roi_size):
+    if not roi_size:
+        return x
+    slices = [slice(None), slice(None)]
+    for s, r in zip(x.shape[2:], roi_size):
+        start = max(0, (s - r) // 2)
+        slices.append(slice(start, start + r))
+    return x[tuple(slices)].contiguous()
+
+
+def _copy_request(req: Dict[str, Any]) -> Dict[str, Any]:
+    # Deep copy request params except (large) arrays/tensors which are shared by reference
+    return {k: v if _is_large(v) else copy.deepcopy(v) for k, v in req.items()}
@@ -0,0 +1,137 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+import uuid
+from concurrent import futures
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """
+    Groups inputs submitted concurrently (e.g. by threads running tiles of a wsi infer request) into batched
+    forward passes.
+
+    Each caller submits its (batch of 1) input and waits; inputs with the same key (shape, dtype, device, network)
+    are concatenated and run together once `batch_size` inputs are pending or after `max_wait` seconds. The output
+    of each caller is sliced back from the batched output (tensor, or list/tuple/dict of tensors).
+
+    `batch_size` can be `0` (auto); then it is resolved once by the first caller (e.g. based on free memory).
+    """
+
+    def __init__(self, batch_size: int = 0, max_wait: float = 0.05, max_batch_size: int = 32):
+        self.batch_size = batch_size if batch_size > 0 else None
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, List[Tuple[torch.Tensor, Future]]] = {}
+        self._stats = {"inputs": 0, "batches": 0}
+
+    def resolve(self, auto_size: Callable[[], int]) -> int:
+        with self._lock:
+            if self.batch_size is None:
+                self.batch_size = max(1, min(self.max_batch_size, int(auto_size())))
+                logger.info(f"Dynamic Batch Size (auto): {self.batch_size}")
+            return self.batch_size
+
+    def run(self, key: Hashable, inputs: torch.Tensor, forward: Callable[[torch.Tensor], Any]) -> Any:
+        """
+        Run forward for inputs (batch dim = 1) as part of a batch; returns output (batch dim = 1) for the inputs
+        """
+        batch_size = self.batch_size if self.batch_size else 1
+        if batch_size <= 1:
+            return forward(inputs)
+
+        f: Future = Future()
+        with self._lock:
+            pending = self._pending.setdefault(key, [])
+            pending.append((inputs, f))
+            batch = self._take(key) if len(pending) >= batch_size else None
+        if batch:
+            self._forward(batch, forward)
+            return f.result()
+
+        # wait for batch to fill up (run by another caller); else run whatever is pending
+        try:
+            return f.result(timeout=self.max_wait)
+        except futures.TimeoutError:
+            pass
+
+        with self._lock:
+            batch = self._take(key) if any(x is f for _, x in self._pending.get(key, [])) else None
+        if batch:
+            self._forward(batch, forward)
+        return f.result()
+
+    def _take(self, key) -> List[Tuple[torch.Tensor, Future]]:
+        # must be called with lock
+        return self._pending.pop(key, [])
+
+    def _forward(self, batch: List[Tuple[torch.Tensor, Future]], forward: Callable[[torch.Tensor], Any]):
+        try:
+            outputs = forward(torch.cat([x for x, _ in batch]) if len(batch) > 1 else batch[0][0])
+            for i, (_, f) in enumerate(batch):
+                f.set_result(_slice(outputs, i))
+            with self._lock:
+                self._stats["inputs"] += len(batch)
+                self._stats["batches"] += 1
+        except Exception as e:
+            for _, f in batch:
+                if not f.done():
+                    f.set_exception(e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+        s["batch_size"] = self.batch_size
+        s["avg_batch"] = round(s["inputs"] / s["batches"], 2) if s["batches"] else 0
+        return s
+
+
+def _slice(outputs, i):
+    if isinstance(outputs, torch.Tensor):
+        return outputs[i : i + 1]
+    if isinstance(outputs, dict):
+        return {k: _slice(v, i) for k, v in outputs.items()}
+    if isinstance(outputs, (list, tuple)):
+        return type(outputs)(_slice(v, i) for v in outputs)
+    return outputs
+
+
+_batchers: Dict[str, DynamicBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def register_batcher(batcher: DynamicBatcher) -> str:
+    batcher_id = f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
+    with _batchers_lock:
+        _batchers[batcher_id] = batcher
+    return batcher_id
+
+
+def get_batcher(batcher_id: Optional[str]) -> Optional[DynamicBatcher]:
+    if not batcher_id:
+        return None
+    with _batchers_lock:
+        return _batchers.get(batcher_id)
+
+
+def unregister_batcher(batcher_id: str) -> Optional[DynamicBatcher]:
+    with _batchers_lock:
+        return _batchers.pop(batcher_id, None)
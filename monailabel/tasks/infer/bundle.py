@@ -158,6 +158,8 @@ class BundleInferTask(BasicInferTask):
             description=description,
             preload=strtobool(conf.get("preload", "false")),
             load_strict=load_strict,
+            backend=kwargs.pop("backend", conf.get("backend", "eager")),
+            precision=kwargs.pop("precision", conf.get("precision", "fp32")),
             **kwargs,
         )
 
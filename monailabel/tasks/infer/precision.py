@@ -0,0 +1,114 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import logging
+from enum import Enum
+from typing import Optional, Sequence, Tuple
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+class InferPrecision(str, Enum):
+    """
+    Precision profile used to run the network during inference
+
+    Attributes:
+        FP32 -           Full precision (default)
+        BF16 -           bfloat16 autocast (CPU/GPU)
+        INT8_DYNAMIC -   Dynamic int8 quantization (CPU only; Linear/RNN layers)
+        INT8_STATIC -    Static int8 quantization (CPU only; needs calibration inputs)
+    """
+
+    FP32: str = "fp32"
+    BF16: str = "bf16"
+    INT8_DYNAMIC: str = "int8_dynamic"
+    INT8_STATIC: str = "int8_static"
+
+
+def autocast(precision: InferPrecision, device_type: str):
+    if precision == InferPrecision.BF16:
+        return torch.autocast(device_type=device_type, dtype=torch.bfloat16)
+    return contextlib.nullcontext()
+
+
+def quantize_network(
+    network: torch.nn.Module,
+    precision: InferPrecision,
+    device_type: str = "cpu",
+    calibration: Optional[Sequence[torch.Tensor]] = None,
+) -> Tuple[torch.nn.Module, InferPrecision]:
+    """
+    Quantize network for int8 precision profiles
+
+    :param network: eager network
+    :param precision: precision profile
+    :param device_type: device type where network runs (int8 is supported only on cpu)
+    :param calibration: batched inputs used to calibrate static quantization
+    :return: tuple of (quantized) network and precision which is actually used
+    """
+    if precision not in (InferPrecision.INT8_DYNAMIC, InferPrecision.INT8_STATIC):
+        return network, precision
+
+    if device_type != "cpu":
+        logger.warning(f"Precision '{precision.value}' is supported only on cpu; using fp32")
+        return network, InferPrecision.FP32
+
+    try:
+        if precision == InferPrecision.INT8_DYNAMIC:
+            layers = {torch.nn.Linear, torch.nn.LSTM, torch.nn.GRU}
+            return torch.ao.quantization.quantize_dynamic(network, layers, dtype=torch.qint8), precision
+
+        if not calibration:
+            logger.warning("No calibration inputs available for static int8 quantization; using fp32")
+            return network, InferPrecision.FP32
+
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+        prepared = prepare_fx(network.eval(), get_default_qconfig_mapping("x86"), example_inputs=(calibration[0],))
+        with torch.no_grad():
+            for x in calibration:
+                prepared(x)
+        return convert_fx(prepared), precision
+    except Exception as e:
+        logger.warning(f"Failed to quantize network to '{precision.value}'; using fp32: {e}")
+        return network, InferPrecision.FP32
+
+
+def to_labels(outputs) -> torch.Tensor:
+    """
+    Convert batched network outputs (logits) into discrete label map
+    """
+    if isinstance(outputs, (list, tuple)):
+        outputs = outputs[0]
+    elif isinstance(outputs, dict):
+        outputs = next(iter(outputs.values()))
+    outputs = outputs.float()
+    return torch.argmax(outputs, dim=1) if outputs.shape[1] > 1 else (torch.sigmoid(outputs[:, 0]) > 0.5).long()
+
+
+def dice_score(y_pred: torch.Tensor, y: torch.Tensor) -> float:
+    """
+    Mean Dice over all foreground labels present in either of the discrete label maps
+    """
+    labels = [int(v) for v in torch.unique(torch.cat([y_pred.flatten(), y.flatten()])) if v != 0]
+    if not labels:
+        return 1.0
+
+    scores = []
+    for label in labels:
+        a = y_pred == label
+        b = y == label
+        scores.append(2.0 * (a & b).sum().item() / max(1, a.sum().item() + b.sum().item()))
+    return sum(scores) / len(scores)
@@ -17,6 +17,7 @@ from monai.transforms import LoadImage
 
 from monailabel.interfaces.datastore import Datastore, DefaultLabelTag
 from monailabel.interfaces.tasks.scoring import ScoringMethod
+from monailabel.utils.async_tasks.progress import report_progress
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,8 @@ class Dice(ScoringMethod):
     Compute dice between final vs original tags
     """
 
+    label_dependent = True
+
     def __init__(self):
         super().__init__("Compute Dice for predicated label vs submitted")
 
@@ -36,7 +39,9 @@ class Dice(ScoringMethod):
         tag_y_pred = request.get("y_pred", DefaultLabelTag.ORIGINAL)
 
         result = {}
-        for image_id in datastore.list_images():
+        image_ids = self.image_ids(request, datastore)
+        for idx, image_id in enumerate(image_ids):
+            report_progress(done=idx, total=len(image_ids), unit="images", image=image_id, scoring="dice")
             y_i = datastore.get_label_by_image_id(image_id, tag_y) if tag_y else None
             y_pred_i = datastore.get_label_by_image_id(image_id, tag_y_pred) if tag_y_pred else None
 
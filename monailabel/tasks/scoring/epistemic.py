@@ -13,6 +13,7 @@ import copy
 import logging
 import os
 import time
+from typing import List
 
 import numpy as np
 import torch
@@ -22,6 +23,7 @@ from monai.utils import deprecated
 
 from monailabel.interfaces.datastore import Datastore
 from monailabel.interfaces.tasks.scoring import ScoringMethod
+from monailabel.utils.async_tasks.progress import report_progress
 
 logger = logging.getLogger(__name__)
 
@@ -132,6 +134,9 @@ class EpistemicScoring(ScoringMethod):
                 model = torch.jit.load(model_file, map_location=torch.device("cpu"))
         return model, model_ts
 
+    def scope(self, request, datastore: Datastore) -> List[str]:
+        return self.image_ids(request, datastore, datastore.get_unlabeled_images())
+
     def __call__(self, request, datastore: Datastore):
         logger.info("Starting Epistemic Uncertainty scoring")
 
@@ -143,14 +148,15 @@ class EpistemicScoring(ScoringMethod):
 
         # Performing Epistemic for all unlabeled images
         skipped = 0
-        unlabeled_images = datastore.get_unlabeled_images()
+        unlabeled_images = self.scope(request, datastore)
         num_samples = request.get("num_samples", self.num_samples)
         if num_samples < 2:
             num_samples = 2
             logger.warning("EPISTEMIC:: Fixing 'num_samples=2' as min 2 samples are needed to compute entropy")
 
         logger.info(f"EPISTEMIC:: Total unlabeled images: {len(unlabeled_images)}")
-        for image_id in unlabeled_images:
+        for idx, image_id in enumerate(unlabeled_images):
+            report_progress(done=idx, total=len(unlabeled_images), unit="images", image=image_id, scoring="epistemic")
             image_info = datastore.get_image_info(image_id)
             prev_ts = image_info.get("epistemic_ts", 0)
             if prev_ts == model_ts:
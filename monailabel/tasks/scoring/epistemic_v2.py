@@ -14,6 +14,7 @@ import multiprocessing
 import os
 import time
 from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
 import numpy as np
 import torch
@@ -22,6 +23,7 @@ from monai.metrics.active_learning_metrics import VarianceMetric
 from monailabel.interfaces.datastore import Datastore
 from monailabel.interfaces.tasks.scoring import ScoringMethod
 from monailabel.tasks.infer.basic_infer import BasicInferTask
+from monailabel.utils.async_tasks.progress import report_progress
 from monailabel.utils.others.generic import name_to_device
 
 logger = logging.getLogger(__name__)
@@ -99,6 +101,9 @@ class EpistemicScoring(ScoringMethod):
             variance = np.expand_dims(variance, axis=0)
         return variance
 
+    def scope(self, request, datastore: Datastore) -> List[str]:
+        return self.image_ids(request, datastore, datastore.get_unlabeled_images())
+
     def __call__(self, request, datastore: Datastore):
         logger.info("Starting Epistemic Uncertainty scoring")
 
@@ -108,7 +113,7 @@ class EpistemicScoring(ScoringMethod):
 
         # Performing Epistemic for all unlabeled images
         skipped = 0
-        unlabeled_images = datastore.get_unlabeled_images()
+        unlabeled_images = self.scope(request, datastore)
         max_samples = request.get("max_samples", self.max_samples)
         simulation_size = request.get("simulation_size", self.simulation_size)
         if simulation_size < 2:
@@ -146,11 +151,13 @@ class EpistemicScoring(ScoringMethod):
             with ThreadPoolExecutor(max_workers if max_workers else None, "ScoreInfer") as e:
                 for image_id in image_ids:
                     futures.append(e.submit(self.run_scoring, image_id, simulation_size, model_ts, datastore))
-                for future in futures:
+                for idx, future in enumerate(futures):
                     future.result()
+                    report_progress(done=idx + 1, total=len(image_ids), unit="images", scoring="epistemic")
         else:
-            for image_id in image_ids:
+            for idx, image_id in enumerate(image_ids):
                 self.run_scoring(image_id, simulation_size, model_ts, datastore)
+                report_progress(done=idx + 1, total=len(image_ids), unit="images", scoring="epistemic")
 
         summary = {
             "total": len(unlabeled_images),
@@ -17,6 +17,7 @@ from monai.transforms import LoadImage
 
 from monailabel.interfaces.datastore import Datastore, DefaultLabelTag
 from monailabel.interfaces.tasks.scoring import ScoringMethod
+from monailabel.utils.async_tasks.progress import report_progress
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,8 @@ class Sum(ScoringMethod):
     Consider implementing simple np sum method of label tags; Also add valid slices that have label mask
     """
 
+    label_dependent = True
+
     def __init__(self, tags=(DefaultLabelTag.FINAL.value, DefaultLabelTag.ORIGINAL.value)):
         super().__init__("Compute Numpy Sum for Final/Original Labels")
         self.tags = tags
@@ -33,7 +36,9 @@ class Sum(ScoringMethod):
     def __call__(self, request, datastore: Datastore):
         loader = LoadImage(image_only=True)
         result = {}
-        for image_id in datastore.list_images():
+        image_ids = self.image_ids(request, datastore)
+        for idx, image_id in enumerate(image_ids):
+            report_progress(done=idx, total=len(image_ids), unit="images", image=image_id, scoring="sum")
             for tag in self.tags:
                 label_id: str = datastore.get_label_by_image_id(image_id, tag)
                 if label_id:
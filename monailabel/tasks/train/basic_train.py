@@ -55,8 +55,8 @@ from monai.transforms import Compose
 from monailabel.config import settings
 from monailabel.interfaces.datastore import Datastore
 from monailabel.interfaces.tasks.train import TrainTask
-from monailabel.tasks.train.handler import PublishStatsAndModel, prepare_stats
-from monailabel.utils.others.generic import device_list, name_to_device, path_to_uri, remove_file
+from monailabel.tasks.train.handler import IterationTimer, ProfileIterations, PublishStatsAndModel, prepare_stats
+from monailabel.utils.others.generic import device_list, name_to_device, path_to_uri, remove_file, strtobool
 
 logger = logging.getLogger(__name__)
 
@@ -571,6 +571,10 @@ class BasicTrainTask(TrainTask):
 
     def finalize(self, context):
         if context.local_rank == 0:
+            profile = strtobool(context.request.get("profile", False))
+            if profile or strtobool(context.request.get("timing", False)):
+                IterationTimer().attach(context.trainer)
+
             publisher = PublishStatsAndModel(
                 self._stats_path,
                 self._publish_path,
@@ -586,6 +590,14 @@ class BasicTrainTask(TrainTask):
             else:
                 context.trainer.add_event_handler(event_name=Events.EPOCH_COMPLETED, handler=publisher)
 
+            if profile:
+                ProfileIterations(
+                    context.request.get("model", self.__class__.__name__),
+                    context.request,
+                    skip=int(context.request.get("profile_skip", 2)),
+                    iterations=int(context.request.get("profile_iterations", 5)),
+                ).attach(context.trainer)
+
         early_stop_patience = int(context.request.get("early_stop_patience", 0))
         if early_stop_patience > 0 and context.evaluator:
             kw = self.val_key_metric(context)
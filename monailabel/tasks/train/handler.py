@@ -16,11 +16,15 @@ import logging
 import os
 import shutil
 import time
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Deque, Dict, Optional
 
 import torch
 from monai.engines.workflow import Engine, Events
 
+from monailabel.utils.async_tasks.progress import report_progress
+from monailabel.utils.others.profiler import profiler
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +39,8 @@ def prepare_stats(start_ts, trainer, evaluator):
     stats.update(trainer.get_stats())
     stats["epoch"] = trainer.state.epoch
     stats["start_ts"] = int(start_ts)
+    if getattr(trainer.state, "timing", None):
+        stats["timing"] = trainer.state.timing
 
     if trainer.state.epoch == trainer.state.max_epochs:
         stats["total_time"] = str(datetime.timedelta(seconds=int(time.time() - start_ts)))
@@ -55,6 +61,65 @@ def prepare_stats(start_ts, trainer, evaluator):
     return stats
 
 
+class IterationTimer:
+    """
+    Time spent per iteration waiting for data (fetching next batch) vs compute (forward/backward/step).
+
+    Summary is kept in `engine.state.timing` (updated every epoch) and is part of training stats.
+    Totals are accumulated; only the last `max_samples` per-iteration times are kept (None => keep all).
+    """
+
+    def __init__(self, synchronize: bool = False, max_samples: Optional[int] = 1000):
+        self.synchronize = synchronize and torch.cuda.is_available()
+        self.data_times: Deque[float] = deque(maxlen=max_samples)
+        self.compute_times: Deque[float] = deque(maxlen=max_samples)
+        self._data = 0.0
+        self._compute = 0.0
+        self._data_count = 0
+        self._compute_count = 0
+        self._ts = 0.0
+
+    def _start(self, engine: Engine):
+        self._ts = time.perf_counter()
+
+    def _data_completed(self, engine: Engine):
+        t = time.perf_counter() - self._ts
+        self.data_times.append(t)
+        self._data += t
+        self._data_count += 1
+
+    def _compute_completed(self, engine: Engine):
+        if self.synchronize:
+            torch.cuda.synchronize()
+        t = time.perf_counter() - self._ts
+        self.compute_times.append(t)
+        self._compute += t
+        self._compute_count += 1
+
+    def summary(self) -> Dict[str, Any]:
+        data, compute = self._data, self._compute
+        n = self._compute_count
+        return {
+            "iterations": n,
+            "data": round(data, 4),
+            "compute": round(compute, 4),
+            "data_per_iteration": round(data / max(1, self._data_count), 4),
+            "compute_per_iteration": round(compute / max(1, n), 4),
+            "data_ratio": round(data / (data + compute), 4) if data + compute else 0.0,
+        }
+
+    def epoch_completed(self, engine: Engine):
+        engine.state.timing = self.summary()
+        logger.info(f"Epoch: {engine.state.epoch}; Timing: {engine.state.timing}")
+
+    def attach(self, engine: Engine) -> None:
+        engine.add_event_handler(Events.GET_BATCH_STARTED, self._start)
+        engine.add_event_handler(Events.GET_BATCH_COMPLETED, self._data_completed)
+        engine.add_event_handler(Events.ITERATION_STARTED, self._start)
+        engine.add_event_handler(Events.ITERATION_COMPLETED, self._compute_completed)
+        engine.add_event_handler(Events.EPOCH_COMPLETED, self.epoch_completed)
+
+
 class PublishStatsAndModel:
     def __init__(self, stats_path, publish_path, key_metric_filename, start_ts, run_id, output_dir, trainer, evaluator):
         self._stats_path = stats_path
@@ -77,6 +142,13 @@ class PublishStatsAndModel:
         if self._stats_path:
             shutil.copy(filename, self._stats_path)
 
+        report_progress(
+            done=self.trainer.state.epoch,
+            total=self.trainer.state.max_epochs,
+            unit="epochs",
+            best_metric=stats.get("best_metric"),
+        )
+
         publish_path = self._publish_path
         if publish_path:
             final_model = os.path.join(self.output_dir, self._key_metric_filename)
@@ -92,3 +164,39 @@ class PublishStatsAndModel:
 
     def __call__(self, engine: Engine) -> None:
         self.iteration_completed()
+
+
+class ProfileIterations:
+    """
+    Capture profile (torch.profiler trace + python stacks) for few training iterations after skipping first
+    (warmup) iterations
+    """
+
+    def __init__(self, model: str, request: Dict[str, Any], skip: int = 2, iterations: int = 5):
+        self.model = model
+        self.request = request
+        self.skip = skip
+        self.iterations = iterations
+        self.capture = None
+
+    def iteration_started(self, engine: Engine):
+        if engine.state.iteration == self.skip + 1 and self.capture is None:
+            self.capture = profiler().capture(f"train_{self.model}", self.model, self.request)
+            if self.capture:
+                self.capture.start()
+
+    def iteration_completed(self, engine: Engine):
+        if engine.state.iteration >= self.skip + self.iterations:
+            self.stop()
+
+    def stop(self, engine: Optional[Engine] = None):
+        if self.capture:
+            info = self.capture.stop()
+            logger.info(f"Training profile captured: {info}")
+            self.capture = None
+
+    def attach(self, engine: Engine) -> None:
+        engine.add_event_handler(Events.ITERATION_STARTED, self.iteration_started)
+        engine.add_event_handler(Events.ITERATION_COMPLETED, self.iteration_completed)
+        engine.add_event_handler(Events.COMPLETED, self.stop)
+        engine.add_event_handler(Events.TERMINATE, self.stop)
@@ -13,16 +13,21 @@ import copy
 import logging
 import os
 import pathlib
-from typing import Hashable, Sequence, Tuple, Union
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import torch
-from expiring_dict import ExpiringDict
 from monai.config import KeysCollection
 from monai.data import MetaTensor
 from monai.transforms import Transform
 from monai.utils import ensure_tuple
 
+from monailabel.config import settings
 from monailabel.utils.others.generic import md5_digest
+from monailabel.utils.others.metrics import observe_cache
 from monailabel.utils.sessions import Sessions
 
 logger = logging.getLogger(__name__)
@@ -30,6 +35,57 @@ logger = logging.getLogger(__name__)
 _cache_path = None
 _data_mem_cache = None
 _data_file_cache = None
+_session_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+class MemoryCache:
+    """
+    In-memory cache with expiry (ttl) per entry; least recently used entries are evicted beyond max_size (bytes)
+    """
+
+    def __init__(self, max_size: int = 0):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._size = 0
+
+    def ttl(self, key: str, value: Any, ttl: float):
+        size = _nbytes(value)
+        with self._lock:
+            self._pop(key)
+            if self.max_size > 0 and size > self.max_size:
+                logger.info(f"Ignore caching {key}; size {size >> 20} MB is beyond cache size")
+                return
+
+            self._entries[key] = (value, size, time.time() + ttl)
+            self._size += size
+            while self.max_size > 0 and self._size > self.max_size:
+                self._pop(next(iter(self._entries)))
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[2] < time.time():
+                self._pop(key)
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def pop(self, key: str, default=None):
+        with self._lock:
+            entry = self._pop(key)
+        return entry[0] if entry else default
+
+    def size(self) -> int:
+        return self._size
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._size -= entry[1]
+        return entry
 
 
 def init_cache():
@@ -38,7 +94,7 @@ def init_cache():
     global _data_file_cache
     if not _cache_path:
         _cache_path = os.path.join(pathlib.Path.home(), ".cache", "monailabel", "cacheT")
-        _data_mem_cache = ExpiringDict(ttl=600)
+        _data_mem_cache = MemoryCache(max_size=settings.MONAI_LABEL_INFER_DATA_CACHE_SIZE * 1024 * 1024)
         _data_file_cache = Sessions(store_path=_cache_path, expiry=600)
 
     _data_file_cache.remove_expired()
@@ -65,10 +121,19 @@ class CacheTransformDatad(Transform):
     def __call__(self, data):
         return self.save(data)
 
+    def hash_key_prefix(self, d) -> Optional[str]:
+        hash_keys = [d[k] for k in self.hash_key if d.get(k)]
+        if len(hash_keys) != len(self.hash_key):
+            logger.warning(f"Ignore caching; Missing hash keys;  Found: {hash_keys}; Expected: {self.hash_key}")
+            return None
+        return md5_digest("".join(hash_keys))
+
     def load(self, data):
         d = dict(data)
 
-        hash_key_prefix = md5_digest("".join([d[k] for k in self.hash_key]))
+        hash_key_prefix = self.hash_key_prefix(d)
+        if hash_key_prefix is None:
+            return None
 
         # full dictionary
         if not self.keys:
@@ -90,11 +155,8 @@ class CacheTransformDatad(Transform):
     def save(self, data):
         d = dict(data)
 
-        hash_keys = [d[k] for k in self.hash_key if d.get(k)]
-        hash_key_prefix = md5_digest("".join(hash_keys))
-
-        if len(hash_keys) != len(self.hash_key):
-            logger.warning(f"Ignore caching; Missing hash keys;  Found: {hash_keys}; Expected: {self.hash_key}")
+        hash_key_prefix = self.hash_key_prefix(d)
+        if hash_key_prefix is None:
             return d
 
         # full dictionary
@@ -123,3 +185,147 @@ class CacheTransformDatad(Transform):
             cached_file = os.path.join(_cache_path, f"{hash_key}.tmp")
             torch.save(obj, cached_file)
             _data_file_cache.add_session(cached_file, expiry=self.ttl, session_id=hash_key)
+
+
+class SessionCacheDatad(CacheTransformDatad):
+    """
+    Cache pre-processed data (e.g. image after resize/spacing; with its meta and applied operations) in memory so
+    that follow-up requests over the same image (e.g. DeepEdit clicks) run only the transforms which follow this one
+    (guidance) and the forward pass.
+
+    Input is cached per image (`image_key` i.e. datastore image id; else `image_path`) and `model`; an input cropped to
+    a different roi (see :py:class:`monailabel.transform.pre.ROICropd`) is a miss.  Cached input is shared (not
+    copied) on a hit; it is dropped if a follow-up transform updates it in-place.  Previous prediction is kept per
+    session (`session_id` and `model`; see :py:meth:`save_result`) and made available as `previous_key` on a hit.
+    """
+
+    def __init__(
+        self,
+        keys: KeysCollection = "image",
+        session_key: str = "session_id",
+        ttl: int = 600,
+        result_key: str = "pred",
+        previous_key: str = "previous_label",
+        image_key: str = "image_id",
+        roi_key: str = "roi_bbox",
+    ):
+        super().__init__(keys, hash_key="model", in_memory=True, ttl=ttl)
+        self.session_key = session_key
+        self.result_key = result_key
+        self.previous_key = previous_key
+        self.image_key = image_key
+        self.roi_key = roi_key
+
+    def session_prefix(self, d) -> Optional[str]:
+        session = d.get(self.session_key)
+        return md5_digest(f"{session}{d.get('model', '')}") if isinstance(session, str) and session else None
+
+    def hash_key_prefix(self, d) -> Optional[str]:
+        image = d.get(self.image_key) or d.get("image_path")
+        if not isinstance(image, str) or not image:
+            return None
+
+        # image updated (e.g. re-uploaded with same id) is a different input
+        path = d.get("image_path")
+        mtime = os.path.getmtime(path) if isinstance(path, str) and os.path.exists(path) else ""
+        return md5_digest(f"{image}{mtime}{d.get('model', '')}")
+
+    def load(self, data):
+        d = super().load(data)
+        if d is not None and any(_roi(d[key]) != data.get(self.roi_key) for key in self.keys):
+            d = None  # cached for a different roi
+
+        if d is None:
+            _session_stats["misses"] += 1
+            observe_cache("session", False)
+            return None
+
+        _session_stats["hits"] += 1
+        observe_cache("session", True)
+        d["session_cache"] = "hit"
+        previous = self._load_previous(d)
+        if previous is not None:
+            d[self.previous_key] = previous
+        return d
+
+    def save(self, data):
+        d = super().save(data)
+        if self.hash_key_prefix(d) is None:
+            return d
+
+        d["session_cache"] = "miss"
+        previous = self._load_previous(d)
+        if previous is not None:
+            d[self.previous_key] = previous
+        return d
+
+    def save_result(self, data):
+        """Keep (post-processed) prediction of current request as previous prediction of the session"""
+        prefix = self.session_prefix(data)
+        result = data.get(self.result_key)
+        if prefix is not None and result is not None:
+            _data_mem_cache.ttl(key=f"{prefix}_{self.result_key}", value=copy.deepcopy(result), ttl=self.ttl)
+
+    def _load_previous(self, d):
+        prefix = self.session_prefix(d)
+        return _data_mem_cache.get(f"{prefix}_{self.result_key}") if prefix else None
+
+    def _save(self, hash_key, obj):
+        obj = copy.deepcopy(obj)
+        _data_mem_cache.ttl(key=hash_key, value=(obj, _version(obj)), ttl=self.ttl)
+
+    def _load(self, hash_key):
+        cached = _data_mem_cache.get(hash_key)
+        if cached is None:
+            return None
+
+        obj, version = cached
+        if _version(obj) != version:
+            logger.warning(f"Cached input ({hash_key}) was updated in-place by a follow-up transform; drop it")
+            _data_mem_cache.pop(hash_key)
+            return None
+        return _shared(obj)
+
+
+def _nbytes(obj) -> int:
+    if isinstance(obj, torch.Tensor):
+        return obj.numel() * obj.element_size()
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (list, tuple)):
+        return sum(_nbytes(o) for o in obj)
+    if isinstance(obj, dict):
+        return sum(_nbytes(o) for o in obj.values())
+    return 0
+
+
+def _version(obj) -> Optional[int]:
+    # in-place updates (also through views) bump version counter of the tensor
+    return obj._version if isinstance(obj, torch.Tensor) else None
+
+
+def _shared(obj):
+    # view which shares data with the cached object; own meta/applied operations (small) as transforms update them
+    if isinstance(obj, MetaTensor):
+        return MetaTensor(
+            obj.as_tensor(), meta=copy.deepcopy(obj.meta), applied_operations=copy.deepcopy(obj.applied_operations)
+        )
+    if isinstance(obj, torch.Tensor):
+        return obj.detach()
+    if isinstance(obj, np.ndarray):
+        view = obj.view()
+        view.flags.writeable = False
+        return view
+    return copy.deepcopy(obj)
+
+
+def _roi(obj):
+    roi = obj.meta.get("roi") if isinstance(obj, MetaTensor) else None
+    return roi.get("requested") if roi else None
+
+
+def session_cache_stats() -> Dict[str, Any]:
+    stats: Dict[str, Any] = dict(_session_stats)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / total, 4) if total else 0.0
+    return stats
@@ -12,11 +12,16 @@
 import logging
 from typing import Optional
 
+import numpy as np
+import torch
 from monai.config import KeysCollection
 from monai.data import ImageReader, MetaTensor
 from monai.transforms import LoadImaged, MapTransform
 from monai.utils import PostFix
 
+from monailabel.interfaces.exception import MONAILabelError, MONAILabelException
+from monailabel.transform.writer import shift_affine
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,3 +97,59 @@ class NormalizeLabeld(MapTransform):
             label[label > 0] = self.value
             d[key] = label
         return d
+
+
+class ROICropd(MapTransform):
+    """
+    Crop (just loaded) image to the region of interest given by `roi_key` i.e. [[start, end], ...] in voxel indices;
+    end is clamped to the image size.  Affine of the crop is shifted so that it maps to the same physical location.
+
+    Geometry of the original image (bbox, shape, affine) is kept in meta (`meta_key`) to paste the result back.
+    """
+
+    def __init__(
+        self, keys: KeysCollection, roi_key: str = "roi_bbox", meta_key: str = "roi", allow_missing_keys: bool = False
+    ) -> None:
+        super().__init__(keys, allow_missing_keys)
+        self.roi_key = roi_key
+        self.meta_key = meta_key
+
+    def __call__(self, data):
+        d = dict(data)
+        requested = bbox = d.get(self.roi_key)
+        if not bbox:
+            return d
+
+        for key in self.key_iterator(d):
+            image = d[key]
+            meta = image.meta if isinstance(image, MetaTensor) else {}
+            channel_dim = meta.get("original_channel_dim", "no_channel")
+            if image.ndim == len(bbox):
+                spatial = list(range(image.ndim))
+            elif image.ndim == len(bbox) + 1 and channel_dim in (0, -1, image.ndim - 1):
+                spatial = list(range(1, image.ndim)) if channel_dim == 0 else list(range(len(bbox)))
+            else:
+                raise MONAILabelException(
+                    MONAILabelError.INVALID_INPUT, f"ROI {bbox} does not apply to image of shape {tuple(image.shape)}"
+                )
+
+            shape = [int(image.shape[i]) for i in spatial]
+            bbox = [[max(0, int(s)), min(n, int(e))] for (s, e), n in zip(bbox, shape)]
+            slices = [slice(None)] * image.ndim
+            for i, (s, e) in zip(spatial, bbox):
+                slices[i] = slice(s, e)
+
+            # copy; so that full image is not held by the crop
+            cropped = image[tuple(slices)].clone() if torch.is_tensor(image) else np.array(image[tuple(slices)])
+            if isinstance(image, MetaTensor):
+                affine = image.affine.cpu().numpy()
+                cropped.affine = torch.as_tensor(shift_affine(affine, [s for s, _ in bbox]))
+                cropped.meta["original_affine"] = cropped.affine.numpy()
+                cropped.meta["spatial_shape"] = np.array([e - s for s, e in bbox])
+                cropped.meta[self.meta_key] = {"bbox": bbox, "shape": shape, "affine": affine, "requested": requested}
+                if isinstance(d.get(f"{key}_{PostFix.meta()}"), dict):
+                    d[f"{key}_{PostFix.meta()}"] = cropped.meta
+
+            d[key] = cropped
+            logger.info(f"ROI: {bbox}; image: {shape}")
+        return d
@@ -11,7 +11,8 @@
 
 import logging
 import tempfile
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import itk
 import nrrd
@@ -20,8 +21,9 @@ import torch
 from monai.data import MetaTensor
 from monai.data.image_writer import NibabelWriter
 
+from monailabel.interfaces.exception import MONAILabelError, MONAILabelException
 from monailabel.utils.others.detection import create_slicer_detection_json
-from monailabel.utils.others.generic import file_ext
+from monailabel.utils.others.generic import file_ext, strtobool
 from monailabel.utils.others.pathology import create_asap_annotations_xml, create_dsa_annotations_json
 
 logger = logging.getLogger(__name__)
@@ -157,6 +159,147 @@ def write_seg_nrrd(
     )
 
 
+class LabelEncoding(str, Enum):
+    """
+    Encoding used to send the result label
+
+    Attributes:
+        DENSE -     Full volume using the requested dtype (default)
+        COMPACT -   Full volume using minimal dtype (e.g. uint8) and compression
+        BBOX -      Volume cropped to the bounding box of the foreground; original geometry is sent in json
+        RLE -       Run length encoding of the foreground sent in json (no label file)
+
+    BBOX and RLE do not write a full-size label; requests which save the label in datastore are rejected for those.
+    """
+
+    DENSE: str = "dense"
+    COMPACT: str = "compact"
+    BBOX: str = "bbox"
+    RLE: str = "rle"
+
+
+def label_encoding(request: Dict[str, Any], key: str = "result_encoding") -> LabelEncoding:
+    """
+    Label encoding requested for the result.  Encodings which do not write a full-size label (bbox, rle) can't be
+    used when the label is also saved in datastore.
+
+    :raises MONAILabelException: (invalid input) if encoding is not supported (or can't be used to save the label)
+    """
+    encoding = request.get(key, LabelEncoding.DENSE)
+    try:
+        encoding = LabelEncoding(encoding)
+    except ValueError:
+        raise MONAILabelException(
+            MONAILabelError.INVALID_INPUT,
+            f"Unsupported {key} '{encoding}'; use one of: {[e.value for e in LabelEncoding]}",
+        )
+
+    if encoding in (LabelEncoding.BBOX, LabelEncoding.RLE) and strtobool(request.get("save_label", False)):
+        raise MONAILabelException(
+            MONAILabelError.INVALID_INPUT,
+            f"{key} '{encoding.value}' does not write a full-size label; use '{LabelEncoding.COMPACT.value}' "
+            "(or no encoding) to save the label",
+        )
+    return encoding
+
+
+def minimal_dtype(image_np) -> Any:
+    """
+    Smallest integer dtype that can hold all the label values; only integer label maps are narrowed (float maps only if
+    all the values are integral e.g. argmax stored as float), otherwise dtype of the label is returned as is
+    """
+    if np.issubdtype(image_np.dtype, np.floating) and not np.array_equal(image_np, np.round(image_np)):
+        return image_np.dtype
+    if not (np.issubdtype(image_np.dtype, np.integer) or np.issubdtype(image_np.dtype, np.floating)):
+        return image_np.dtype
+
+    vmin, vmax = (int(image_np.min()), int(image_np.max())) if image_np.size else (0, 0)
+    for dtype in (np.uint8, np.uint16, np.uint32) if vmin >= 0 else (np.int8, np.int16, np.int32):
+        if np.iinfo(dtype).min <= vmin and vmax <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def foreground_bbox(image_np) -> Optional[List[List[int]]]:
+    """Bounding box [[start, end), ...] of non-zero voxels for each dimension; None if there is no foreground"""
+    mask = image_np != 0
+    bbox = []
+    for axis in range(mask.ndim):
+        nz = np.flatnonzero(np.any(mask, axis=tuple(a for a in range(mask.ndim) if a != axis)))
+        if not nz.size:
+            return None
+        bbox.append([int(nz[0]), int(nz[-1]) + 1])
+    return bbox
+
+
+def crop_to_bbox(image_np, affine=None) -> Tuple[np.ndarray, Any, Dict[str, Any]]:
+    """
+    Crop label to the bounding box of its foreground.
+
+    Affine of the cropped label is shifted so that it still maps to the same physical location; original shape,
+    affine and the bounding box are returned (to be sent as json) so that client can paste it back.
+    """
+    bbox = foreground_bbox(image_np)
+    geometry: Dict[str, Any] = {
+        "encoding": LabelEncoding.BBOX.value,
+        "shape": list(image_np.shape),
+        "affine": np.asarray(affine).tolist() if affine is not None else None,
+        "bbox": bbox,
+    }
+
+    bbox = bbox if bbox else [[0, 1]] * image_np.ndim
+    cropped = image_np[tuple(slice(s, e) for s, e in bbox)]
+    return cropped, shift_affine(affine, [s for s, _ in bbox]), geometry
+
+
+def shift_affine(affine, start: Sequence[int]):
+    """Affine of a crop (starting at voxel index `start`) which maps to the same physical location"""
+    if affine is None:
+        return None
+    affine = np.array(affine, dtype=np.float64)
+    n = min(len(start), affine.shape[0] - 1)
+    origin = np.zeros(affine.shape[0])
+    origin[:n] = start[:n]
+    origin[-1] = 1
+    affine[:-1, -1] = (affine @ origin)[:-1]
+    return affine
+
+
+def encode_rle(image_np, affine=None) -> Dict[str, Any]:
+    """
+    Run length encoding (C-order) of the non-zero runs of the label
+
+    Every run is represented by its start (flat index), length and value; background runs are skipped.
+    """
+    flat = np.ravel(image_np)
+    if flat.size:
+        starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+        lengths = np.diff(np.concatenate((starts, [flat.size])))
+        values = flat[starts]
+        fg = values != 0
+        starts, lengths, values = starts[fg], lengths[fg], values[fg]
+    else:
+        starts = lengths = values = np.array([], dtype=np.int64)
+
+    return {
+        "encoding": LabelEncoding.RLE.value,
+        "shape": list(image_np.shape),
+        "dtype": np.dtype(minimal_dtype(image_np)).name,
+        "affine": np.asarray(affine).tolist() if affine is not None else None,
+        "starts": starts.tolist(),
+        "lengths": lengths.tolist(),
+        "values": values.tolist(),
+    }
+
+
+def decode_rle(rle: Dict[str, Any]) -> np.ndarray:
+    """Decode label encoded by :py:func:`encode_rle`"""
+    flat = np.zeros(int(np.prod(rle["shape"])), dtype=rle.get("dtype", "uint8"))
+    for start, length, value in zip(rle["starts"], rle["lengths"], rle["values"]):
+        flat[start : start + length] = value
+    return flat.reshape(rle["shape"])
+
+
 class Writer:
     def __init__(
         self,
@@ -167,6 +310,7 @@ class Writer:
         key_dtype="result_dtype",
         key_compress="result_compress",
         key_write_to_file="result_write_to_file",
+        key_encoding="result_encoding",
         meta_key_postfix="meta_dict",
         nibabel=False,
     ):
@@ -179,6 +323,7 @@ class Writer:
         self.key_dtype = key_dtype
         self.key_compress = key_compress
         self.key_write_to_file = key_write_to_file
+        self.key_encoding = key_encoding
         self.meta_key_postfix = meta_key_postfix
         self.nibabel = nibabel
 
@@ -210,6 +355,26 @@ class Writer:
 
         output_file = None
         output_json = data.get(self.json, {})
+
+        encoding = label_encoding(data, self.key_encoding)
+        if encoding != LabelEncoding.DENSE and write_to_file:
+            if self.is_multichannel_image(image_np):
+                logger.warning(f"Label encoding '{encoding.value}' is not supported for multi-channel label")
+            else:
+                if isinstance(image_np, torch.Tensor):
+                    image_np = image_np.cpu().numpy()
+                if isinstance(affine, torch.Tensor):
+                    affine = affine.cpu().numpy()
+                dtype = dtype if dtype else minimal_dtype(image_np)
+                compress = True
+
+                if encoding == LabelEncoding.RLE:
+                    output_json["label_encoding"] = encode_rle(image_np, affine)
+                    return None, output_json
+                if encoding == LabelEncoding.BBOX:
+                    image_np, affine, output_json["label_encoding"] = crop_to_bbox(image_np, affine)
+                logger.info(f"Result encoding: {encoding.value}; shape: {image_np.shape}; dtype: {dtype}")
+
         if write_to_file:
             output_file = tempfile.NamedTemporaryFile(suffix=ext).name
             logger.debug(f"Saving Image to: {output_file}")
@@ -0,0 +1,248 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Progress lines printed by task (sub)process; parsed by the task runner
+PROGRESS_PREFIX = "MONAILABEL_PROGRESS "
+TASK_ID_ENV = "MONAI_LABEL_TASK_ID"
+TERMINAL_STATUS = ("DONE", "ERROR", "STOPPED")
+
+
+class TaskProgress:
+    def __init__(self, task_id: str, method: str, max_events: int):
+        self.task_id = task_id
+        self.method = method
+        self.status = "SUBMITTED"
+        self.start_ts = time.time()
+        self.progress: Dict[str, Any] = {}
+        self.seq = 0
+        self.events: deque = deque(maxlen=max_events)
+
+
+class ProgressTracker:
+    """
+    Progress events of running tasks (train, batch infer, scoring, wsi infer etc...).
+
+    Events are published by task runners (or parsed from task process output) and consumed as a stream
+    (e.g. Server-Sent Events) by clients instead of polling the task status.
+    """
+
+    def __init__(self, max_events: int = 100, max_tasks: int = 100):
+        self.max_events = max_events
+        self.max_tasks = max_tasks
+
+        self._cond = threading.Condition()
+        self._tasks: "OrderedDict[str, TaskProgress]" = OrderedDict()
+        self._waiters: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+    def start(self, task_id: str, method: str):
+        with self._cond:
+            self._tasks[task_id] = TaskProgress(task_id, method, self.max_events)
+            self._cleanup()
+        return self.publish(task_id, status="SUBMITTED")
+
+    def publish(
+        self,
+        task_id: str,
+        status: Optional[str] = None,
+        done: Optional[int] = None,
+        total: Optional[int] = None,
+        unit: Optional[str] = None,
+        **kwargs,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Publish progress event for the task
+
+        :param task_id: task id
+        :param status: new status of the task (SUBMITTED, RUNNING, DONE, ERROR, STOPPED)
+        :param done: number of units (images, tiles, epochs...) done so far
+        :param total: total number of units
+        :param unit: name of the unit
+        :param kwargs: additional info (e.g. current image, metric)
+        """
+        with self._cond:
+            p = self._tasks.get(task_id)
+            if p is None:
+                return None
+
+            p.status = status if status else p.status
+            if done is not None:
+                p.progress["done"] = done
+            if total is not None:
+                p.progress["total"] = total
+            if unit is not None:
+                p.progress["unit"] = unit
+            p.progress.update(kwargs)
+
+            done, total = p.progress.get("done"), p.progress.get("total")
+            if done is not None and total:
+                elapsed = time.time() - p.start_ts
+                p.progress["percent"] = round(100.0 * done / total, 2)
+                p.progress["eta"] = round(elapsed / done * (total - done), 2) if done else None
+
+            p.seq += 1
+            event = {
+                "task_id": task_id,
+                "method": p.method,
+                "seq": p.seq,
+                "ts": int(time.time()),
+                "status": p.status,
+                "progress": dict(p.progress),
+            }
+            p.events.append(event)
+            self._cond.notify_all()
+            for loop, waiter in self._waiters.get(task_id, ()):
+                try:
+                    loop.call_soon_threadsafe(waiter.set)
+                except RuntimeError:
+                    pass  # loop is closed
+            return event
+
+    def last(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._cond:
+            p = self._tasks.get(task_id)
+            return p.events[-1] if p and p.events else None
+
+    def events(
+        self, task_id: str, since: int = 0, timeout: Optional[float] = None, keepalive: float = 15.0
+    ) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Iterate over progress events (after seq `since`) until task is finished; None is yielded every
+        `keepalive` seconds while there are no new events
+        """
+        deadline = time.time() + timeout if timeout else None
+        while deadline is None or time.time() < deadline:
+            with self._cond:
+                p = self._tasks.get(task_id)
+                if p is None:
+                    return
+
+                pending = [e for e in p.events if e["seq"] > since]
+                if not pending and p.status not in TERMINAL_STATUS:
+                    wait = keepalive if deadline is None else max(0.0, min(keepalive, deadline - time.time()))
+                    self._cond.wait(wait)
+                    pending = [e for e in p.events if e["seq"] > since]
+                finished = p.status in TERMINAL_STATUS
+
+            if not pending:
+                if finished:
+                    return
+                yield None
+                continue
+
+            for e in pending:
+                since = e["seq"]
+                yield e
+            if pending[-1]["status"] in TERMINAL_STATUS:
+                return
+
+    async def aevents(
+        self, task_id: str, since: int = 0, timeout: Optional[float] = None, keepalive: float = 15.0
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Same as :py:meth:`events` for asyncio consumers (e.g. SSE endpoint); waits on an asyncio event instead of
+        blocking a (threadpool) thread
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            self._waiters.setdefault(task_id, set()).add(waiter)
+
+        try:
+            deadline = time.time() + timeout if timeout else None
+            while deadline is None or time.time() < deadline:
+                waiter[1].clear()
+                exists, pending, finished = self._poll(task_id, since)
+                if not exists:
+                    return
+                if not pending and not finished:
+                    wait = keepalive if deadline is None else max(0.0, min(keepalive, deadline - time.time()))
+                    try:
+                        await asyncio.wait_for(waiter[1].wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    exists, pending, finished = self._poll(task_id, since)
+
+                if not pending:
+                    if finished or not exists:
+                        return
+                    yield None
+                    continue
+
+                for e in pending:
+                    since = e["seq"]
+                    yield e
+                if pending[-1]["status"] in TERMINAL_STATUS:
+                    return
+        finally:
+            with self._cond:
+                waiters = self._waiters.get(task_id)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        self._waiters.pop(task_id)
+
+    def _poll(self, task_id: str, since: int):
+        with self._cond:
+            p = self._tasks.get(task_id)
+            if p is None:
+                return False, [], True
+            return True, [e for e in p.events if e["seq"] > since], p.status in TERMINAL_STATUS
+
+    def _cleanup(self):
+        while len(self._tasks) > self.max_tasks:
+            task_id = next((k for k, p in self._tasks.items() if p.status in TERMINAL_STATUS), None)
+            if task_id is None:
+                break
+            self._tasks.pop(task_id)
+
+
+def parse_progress(line: str) -> Optional[Dict[str, Any]]:
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(PROGRESS_PREFIX) :])
+    except ValueError:
+        return None
+
+
+def report_progress(task_id: Optional[str] = None, **kwargs):
+    """
+    Report progress of current task.
+
+    If `task_id` is provided, event is published directly (task running in-process e.g. wsi infer); otherwise, if
+    running as a background task process, it is printed as a progress line which is parsed by the task runner.
+    """
+    if task_id:
+        progress_tracker().publish(task_id, **kwargs)
+    elif os.environ.get(TASK_ID_ENV):
+        print(f"{PROGRESS_PREFIX}{json.dumps(kwargs, default=str)}", flush=True)
+
+
+_tracker: Optional[ProgressTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def progress_tracker() -> ProgressTracker:
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = ProgressTracker()
+        return _tracker
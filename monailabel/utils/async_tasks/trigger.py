@@ -0,0 +1,141 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    def __init__(self):
+        self.images: Optional[Set[str]] = set()  # None => all images
+        self.timer: Optional[threading.Timer] = None
+        self.triggers = 0
+
+
+class CoalescingTrigger:
+    """
+    Debounces and coalesces triggers (e.g. auto scoring after train/next sample/save label) per key.
+
+    The first trigger arms a timer for `debounce` seconds (and not earlier than `min_interval` seconds after the
+    previous run of the same key); triggers received meanwhile are merged into the same pending run. So there is at
+    most one pending run per key, and it covers the union of images of all merged triggers (`None` => all images).
+    If the previous run is still `busy`, the pending run is postponed. `run` may return False when there was nothing
+    to do; such a run is counted as skipped and does not delay the next run (`min_interval`).
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Hashable, Optional[List[str]]], Any],
+        debounce: float = 5.0,
+        min_interval: float = 60.0,
+        busy: Optional[Callable[[Hashable], bool]] = None,
+    ):
+        self.run = run
+        self.debounce = debounce
+        self.min_interval = min_interval
+        self.busy = busy
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._last_run: Dict[Hashable, float] = {}
+        self._stats = {"triggers": 0, "runs": 0, "coalesced": 0, "skipped": 0}
+
+    def trigger(self, key: Hashable, images: Optional[Iterable[str]] = None):
+        """
+        Request a run for key covering `images` (None => all images)
+        """
+        with self._lock:
+            self._stats["triggers"] += 1
+            p = self._pending.get(key)
+            if p is None:
+                p = self._pending[key] = _Pending()
+            else:
+                self._stats["coalesced"] += 1
+
+            p.triggers += 1
+            if images is None or p.images is None:
+                p.images = None
+            else:
+                p.images.update(images)
+
+            if p.timer is None:
+                self._arm(key, p, self._delay(key))
+
+    def _delay(self, key) -> float:
+        last = self._last_run.get(key)
+        wait = last + self.min_interval - time.time() if last is not None else 0
+        return max(self.debounce, wait)
+
+    def _arm(self, key, p: _Pending, delay: float):
+        # must be called with lock
+        p.timer = threading.Timer(delay, self._fire, args=(key,))
+        p.timer.daemon = True
+        p.timer.start()
+
+    def _fire(self, key):
+        if self.busy and self.busy(key):
+            with self._lock:
+                p = self._pending.get(key)
+                if p is not None:
+                    logger.debug(f"Previous run for {key} is still running; postpone pending run")
+                    self._arm(key, p, max(self.debounce, 1.0))
+            return
+        self.flush(key)
+
+    def flush(self, key: Optional[Hashable] = None):
+        """
+        Run pending runs (for key or all keys) now
+        """
+        with self._lock:
+            keys = [key] if key is not None else list(self._pending.keys())
+            runs = []
+            for k in keys:
+                p = self._pending.pop(k, None)
+                if p is None:
+                    continue
+                if p.timer is not None:
+                    p.timer.cancel()
+                runs.append((k, p, self._last_run.get(k)))
+                self._last_run[k] = time.time()
+                self._stats["runs"] += 1
+
+        for k, p, last in runs:
+            images = sorted(p.images) if p.images is not None else None
+            logger.info(f"Run {k} (merged {p.triggers} triggers); images: {len(images) if images else 'all'}")
+            try:
+                ran = self.run(k, images)
+            except Exception:
+                logger.exception(f"Failed to run {k}")
+                continue
+
+            if ran is False:
+                with self._lock:
+                    self._stats["runs"] -= 1
+                    self._stats["skipped"] += 1
+                    if last is None:
+                        self._last_run.pop(k, None)
+                    else:
+                        self._last_run[k] = last
+
+    def cancel(self):
+        with self._lock:
+            for p in self._pending.values():
+                if p.timer is not None:
+                    p.timer.cancel()
+            self._pending.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending)}
@@ -16,6 +16,7 @@ import os.path
 import random
 import subprocess
 import sys
+import time
 import uuid
 from collections import deque
 from concurrent.futures import ThreadPoolExecutor
@@ -24,6 +25,11 @@ from typing import Dict
 
 import psutil
 
+from monailabel.config import settings
+from monailabel.utils.async_tasks.progress import TASK_ID_ENV, parse_progress, progress_tracker
+from monailabel.utils.async_tasks.worker import WORKER_METHODS, parse_task_done, worker_pool
+from monailabel.utils.others.metrics import observe_task, process_exited, set_tasks_queued
+
 logger = logging.getLogger(__name__)
 
 background_tasks: Dict = {}
@@ -40,8 +46,11 @@ def _task_func(task, method, callback=None):
     if gpus != "all":
         my_env["CUDA_VISIBLE_DEVICES"] = gpus
     request["gpus"] = "all"
+    my_env[TASK_ID_ENV] = task["id"]
 
     if method == "train":
+        # idle warm workers hold models (gpu memory) needed by training
+        worker_pool().shutdown()
         my_env["MONAI_LABEL_DATASTORE_AUTO_RELOAD"] = "false"
         my_env["MASTER_ADDR"] = "127.0.0.1"
         my_env["MASTER_PORT"] = str(random.randint(1234, 1334))
@@ -52,41 +61,79 @@ def _task_func(task, method, callback=None):
         my_env["PYTHONPATH"] = my_env.get("PYTHONPATH") + os.pathsep + bundle_path
     logger.info("After:: " + my_env["PYTHONPATH"])
 
-    cmd = [
-        sys.executable,
-        "-m",
-        "monailabel.interfaces.utils.app",
-        "-m",
-        method,
-        "-r",
-        json.dumps(request, separators=(",", ":")),
-    ]
-
-    logger.info(f"COMMAND:: {' '.join(cmd)}")
-    process = subprocess.Popen(
-        cmd, stderr=subprocess.STDOUT, stdout=subprocess.PIPE, universal_newlines=True, env=my_env
-    )
     task_id = task["id"]
+    worker = None
+    if settings.MONAI_LABEL_TASKS_WORKERS and method in WORKER_METHODS:
+        # warm app process (initialized once) runs the task; task id (for progress) is part of the task message
+        my_env.pop(TASK_ID_ENV, None)
+        my_env["MONAI_LABEL_DATASTORE_AUTO_RELOAD"] = "false"
+        my_env["PYTHONUNBUFFERED"] = "1"
+        worker = worker_pool().acquire((method, gpus, my_env.get("PYTHONPATH")), my_env)
+        worker.submit(task_id, method, request)
+        process = worker.process
+    else:
+        cmd = [
+            sys.executable,
+            "-m",
+            "monailabel.interfaces.utils.app",
+            "-m",
+            method,
+            "-r",
+            json.dumps(request, separators=(",", ":")),
+        ]
+
+        logger.info(f"COMMAND:: {' '.join(cmd)}")
+        process = subprocess.Popen(
+            cmd, stderr=subprocess.STDOUT, stdout=subprocess.PIPE, universal_newlines=True, env=my_env
+        )
     background_processes[method][task_id] = process
+    start = time.time()
 
     task["status"] = "RUNNING"
     task["details"] = deque(maxlen=20)
+    progress_tracker().publish(task_id, status="RUNNING")
+    _update_queued(method)
 
     plogger = logging.getLogger(f"task_{method}")
-    while process.poll() is None:
-        line = process.stdout.readline()
-        line = line.rstrip()
-        if line:
-            plogger.info(line)
-            task["details"].append(line)
+    readline = worker.readline if worker else process.stdout.readline
+    returncode = None
+    while True:
+        line = readline()
+        if not line:
+            break  # process exited (or killed)
 
-    logger.info(f"Return code: {process.returncode}")
+        line = line.rstrip()
+        if worker:
+            done = parse_task_done(line)
+            if done is not None and done.get("id") == task_id:
+                returncode = 0 if done.get("status") == "DONE" else 1
+                break
+
+        event = parse_progress(line)
+        if event is not None:
+            event = progress_tracker().publish(task_id, **event)
+            task["progress"] = event["progress"] if event else None
+            continue
+        plogger.info(line)
+        task["details"].append(line)
+
+    if returncode is None:
+        returncode = process.wait()
+        returncode = returncode if returncode or not worker else 1  # worker exited before finishing the task
+    logger.info(f"Return code: {returncode}")
     background_processes[method].pop(task_id, None)
-    process.stdout.close()
+    if worker:
+        worker_pool().release(worker, ok=returncode == 0)
+    else:
+        process.stdout.close()
 
     task["end_ts"] = datetime.today().strftime("%Y-%m-%d %H:%M:%S")
     if task["status"] == "RUNNING":
-        task["status"] = "DONE" if process.returncode == 0 else "ERROR"
+        task["status"] = "DONE" if returncode == 0 else "ERROR"
+    progress_tracker().publish(task_id, status=task["status"])
+    observe_task(method, task["status"], time.time() - start)
+    if process.poll() is not None:
+        process_exited(process.pid)
 
     if callback:
         callback(task)
@@ -108,6 +155,8 @@ def run_background_task(request, method, callback=None, debug=False):
         background_executors[method] = ThreadPoolExecutor(max_workers=1)
 
     background_tasks[method].append(task)
+    progress_tracker().start(task["id"], method)
+    _update_queued(method)
     if debug:
         _task_func(task, method)
     else:
@@ -116,6 +165,10 @@ def run_background_task(request, method, callback=None, debug=False):
     return task
 
 
+def _update_queued(method):
+    set_tasks_queued(method, len([t for t in background_tasks.get(method, []) if t["status"] == "SUBMITTED"]))
+
+
 def stop_background_task(method):
     logger.info(f"Kill background task for {method}")
     if not background_tasks.get(method) or not background_processes.get(method):
@@ -135,6 +188,7 @@ def stop_background_task(method):
     task = [task for task in background_tasks[method] if task["id"] == task_id][0]
     task["status"] = "STOPPED"
     task["end_ts"] = datetime.today().strftime("%Y-%m-%d %H:%M:%S")
+    progress_tracker().publish(task_id, status="STOPPED")
     return task
 
 
@@ -0,0 +1,261 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+import psutil
+
+from monailabel.config import settings
+
+logger = logging.getLogger(__name__)
+
+# methods which run in warm workers; train always runs in a fresh process (distributed env, frees gpu memory)
+WORKER_METHODS = ("scoring", "batch_infer")
+TASK_START_PREFIX = "MONAI_LABEL_TASK_START:"
+TASK_DONE_PREFIX = "MONAI_LABEL_TASK_DONE:"
+
+
+def _parse(prefix: str, line: str) -> Optional[Dict[str, Any]]:
+    if not line.startswith(prefix):
+        return None
+    try:
+        return json.loads(line[len(prefix) :])
+    except ValueError:
+        return None
+
+
+def parse_task_start(line: str) -> Optional[Dict[str, Any]]:
+    return _parse(TASK_START_PREFIX, line)
+
+
+def parse_task_done(line: str) -> Optional[Dict[str, Any]]:
+    return _parse(TASK_DONE_PREFIX, line)
+
+
+class Worker:
+    """
+    Long-lived app process (`monailabel.interfaces.utils.app -m worker`) which initializes the app once and then runs
+    tasks one after another. Tasks are sent as json lines over stdin; output (logs, progress) of a task is read from
+    stdout until the task done line.
+
+    Stdout is always drained by a reader thread (so the worker never blocks on a full pipe); only lines between the
+    task start and task done lines belong to the task, anything printed in between tasks is logged here.
+    """
+
+    def __init__(self, key: Hashable, env: Dict[str, str], cmd=None):
+        self.key = key
+        cmd = cmd if cmd else [sys.executable, "-m", "monailabel.interfaces.utils.app", "-m", "worker"]
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            env=env,
+        )
+        self.tasks = 0
+        self.baseline: Optional[int] = None
+        self.last_used = time.time()
+
+        self._lines: queue.Queue = queue.Queue()
+        self._task_id: Optional[str] = None
+        self._running = False
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read, name=f"TaskWorker-{self.pid}", daemon=True)
+        self._reader.start()
+        logger.info(f"Started task worker: {self.process.pid}; key: {key}")
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _read(self):
+        try:
+            for line in self.process.stdout:
+                with self._lock:
+                    if self._running:
+                        self._lines.put(line)
+                        done = parse_task_done(line.rstrip())
+                        self._running = not (done is not None and done.get("id") == self._task_id)
+                        continue
+                    start = parse_task_start(line.rstrip())
+                    if start is not None and start.get("id") == self._task_id:
+                        self._running = True
+                        continue
+                logger.info(f"[worker {self.pid}] {line.rstrip()}")
+        except (OSError, ValueError):
+            pass
+        self._lines.put("")  # eof
+
+    def submit(self, task_id: str, method: str, request: Dict[str, Any]):
+        with self._lock:
+            self._task_id = task_id
+        self.process.stdin.write(json.dumps({"id": task_id, "method": method, "request": request}) + "\n")
+        self.process.stdin.flush()
+
+    def readline(self) -> str:
+        """
+        Next output line of the running task; empty string when the worker exited
+        """
+        return self._lines.get()
+
+    def done(self):
+        with self._lock:
+            self._task_id = None
+            self._running = False
+            # lines not consumed by the caller (e.g. it stopped reading early); keep eof
+            while True:
+                try:
+                    line = self._lines.get_nowait()
+                except queue.Empty:
+                    break
+                if not line:
+                    self._lines.put(line)
+                    break
+
+    def rss(self) -> int:
+        try:
+            p = psutil.Process(self.process.pid)
+            return p.memory_info().rss + sum(c.memory_info().rss for c in p.children(recursive=True))
+        except psutil.Error:
+            return 0
+
+    def close(self, timeout=10):
+        logger.info(f"Stop task worker: {self.process.pid}; tasks: {self.tasks}")
+        try:
+            if self.alive():
+                self.process.stdin.close()
+                self.process.wait(timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        finally:
+            self._reader.join(timeout)
+            if self.process.stdout:
+                self.process.stdout.close()
+
+
+class WorkerPool:
+    """
+    Pool of warm workers keyed by (method, environment); a worker runs one task at a time.
+
+    A worker is recycled after `max_tasks`, when its memory grows by more than `max_memory_growth` MB compared to
+    after its first task, when a task fails (state could be broken) or when it is idle for `idle_timeout` seconds.
+    """
+
+    def __init__(self, max_tasks=20, max_memory_growth=4096, idle_timeout=600, cmd=None):
+        self.max_tasks = max_tasks
+        self.max_memory_growth = max_memory_growth
+        self.idle_timeout = idle_timeout
+        self.cmd = cmd
+
+        self._lock = threading.Lock()
+        self._idle: Dict[Hashable, Worker] = {}
+        self._reaper: Optional[threading.Thread] = None
+
+    def acquire(self, key: Hashable, env: Dict[str, str]) -> Worker:
+        with self._lock:
+            worker = self._idle.pop(key, None)
+        if worker is not None and worker.alive():
+            return worker
+        if worker is not None:
+            worker.close()
+        return Worker(key, env, self.cmd)
+
+    def release(self, worker: Worker, ok: bool = True):
+        worker.done()
+        worker.tasks += 1
+        worker.last_used = time.time()
+
+        rss = worker.rss()
+        worker.baseline = worker.baseline if worker.baseline is not None else rss
+        growth = (rss - worker.baseline) // (1024 * 1024)
+
+        reason = None
+        if not ok or not worker.alive():
+            reason = "task failed"
+        elif 0 < self.max_tasks <= worker.tasks:
+            reason = f"max tasks ({worker.tasks})"
+        elif 0 < self.max_memory_growth < growth:
+            reason = f"memory growth ({growth} MB)"
+
+        if reason:
+            logger.info(f"Recycle task worker {worker.pid}: {reason}")
+            worker.close()
+            return
+
+        with self._lock:
+            old = self._idle.pop(worker.key, None)
+            self._idle[worker.key] = worker
+            self._start_reaper()
+        if old is not None and old is not worker:
+            old.close()
+
+    def _start_reaper(self):
+        # must be called with lock
+        if self.idle_timeout <= 0 or (self._reaper and self._reaper.is_alive()):
+            return
+        self._reaper = threading.Thread(target=self._reap, name="TaskWorkerReaper", daemon=True)
+        self._reaper.start()
+
+    def _reap(self):
+        while True:
+            time.sleep(min(self.idle_timeout, 30))
+            now = time.time()
+            with self._lock:
+                expired = [k for k, w in self._idle.items() if now - w.last_used > self.idle_timeout]
+                workers = [self._idle.pop(k) for k in expired]
+                done = not self._idle
+            for w in workers:
+                logger.info(f"Stop idle task worker: {w.pid}")
+                w.close()
+            if done:
+                with self._lock:
+                    if not self._idle:
+                        self._reaper = None
+                        return
+
+    def shutdown(self):
+        with self._lock:
+            workers = list(self._idle.values())
+            self._idle.clear()
+        for w in workers:
+            w.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {str(k): {"pid": w.pid, "tasks": w.tasks} for k, w in self._idle.items()}
+
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def worker_pool() -> WorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(
+                max_tasks=settings.MONAI_LABEL_TASKS_WORKER_MAX_TASKS,
+                max_memory_growth=settings.MONAI_LABEL_TASKS_WORKER_MAX_MEMORY_GROWTH,
+                idle_timeout=settings.MONAI_LABEL_TASKS_WORKER_IDLE_TIMEOUT,
+            )
+        return _pool
@@ -0,0 +1,401 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import multiprocessing
+import os
+import platform
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import monai
+import numpy as np
+import torch
+from monai.data import DataLoader, Dataset, WSIReader
+from monai.engines import SupervisedTrainer
+from monai.inferers import SlidingWindowInferer
+from monai.losses import DiceCELoss
+from monai.networks.nets import UNet
+from monai.transforms import (
+    Activationsd,
+    AsDiscreted,
+    Compose,
+    EnsureChannelFirstd,
+    LoadImaged,
+    RandFlipd,
+    RandSpatialCropd,
+    ScaleIntensityd,
+    SqueezeDimd,
+    ToNumpyd,
+)
+from monai.utils import optional_import, set_determinism
+
+import monailabel
+from monailabel.datastore.local import LocalDatastore
+from monailabel.interfaces.datastore import DefaultLabelTag
+from monailabel.interfaces.tasks.infer_v2 import InferType
+from monailabel.tasks.infer.basic_infer import BasicInferTask
+from monailabel.tasks.scoring.dice import Dice
+from monailabel.tasks.scoring.sum import Sum
+from monailabel.tasks.train.handler import IterationTimer
+from monailabel.transform.writer import write_itk
+from monailabel.utils.others.generic import remove_file
+
+tifffile, has_tifffile = optional_import("tifffile")
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS = ("infer", "train", "datastore", "scoring", "wsi")
+
+
+def timing_stats(values: Sequence[float]) -> Dict[str, Any]:
+    v = np.asarray(values, dtype=np.float64)
+    if not v.size:
+        return {"n": 0}
+    return {
+        "n": int(v.size),
+        "mean": round(float(v.mean()), 4),
+        "p50": round(float(np.percentile(v, 50)), 4),
+        "p95": round(float(np.percentile(v, 95)), 4),
+        "min": round(float(v.min()), 4),
+        "max": round(float(v.max()), 4),
+    }
+
+
+def synthetic_volume(shape: Sequence[int], seed: int = 0):
+    """
+    Synthetic CT like volume (noise + few bright spheres) and corresponding label
+    """
+    rng = np.random.default_rng(seed)
+    image = rng.normal(0, 50, size=shape).astype(np.float32)
+    label = np.zeros(shape, dtype=np.uint8)
+
+    grid = np.ogrid[tuple(slice(0, s) for s in shape)]
+    for _ in range(3):
+        center = [rng.integers(s // 4, 3 * s // 4) for s in shape]
+        radius = max(2, min(shape) // 8)
+        mask = sum((g - c) ** 2 for g, c in zip(grid, center)) <= radius**2
+        image[mask] += 200
+        label[mask] = 1
+    return image, label
+
+
+def synthetic_wsi(path: str, size: int, tile_size: int = 256, seed: int = 0):
+    """
+    Synthetic (RGB) tiled tiff of size x size pixels
+    """
+    rng = np.random.default_rng(seed)
+    tile = rng.integers(0, 255, size=(tile_size, tile_size, 3), dtype=np.uint8)
+
+    def tiles():
+        for _ in range((size // tile_size) ** 2):
+            yield tile
+
+    tifffile.imwrite(
+        path,
+        tiles(),
+        shape=(size - size % tile_size, size - size % tile_size, 3),
+        dtype=np.uint8,
+        tile=(tile_size, tile_size),
+        photometric="rgb",
+    )
+    return path
+
+
+class _BenchSegmentation(BasicInferTask):
+    def __init__(self, roi_size, **kwargs):
+        super().__init__(
+            path=None,
+            network=UNet(spatial_dims=3, in_channels=1, out_channels=2, channels=(8, 16, 32), strides=(2, 2)),
+            type=InferType.SEGMENTATION,
+            labels={"object": 1},
+            dimension=3,
+            description="Synthetic segmentation for benchmark",
+            load_strict=False,
+            **kwargs,
+        )
+        self.roi_size = roi_size
+
+    def pre_transforms(self, data=None) -> Sequence[Callable]:
+        return [
+            LoadImaged(keys="image"),
+            EnsureChannelFirstd(keys="image"),
+            ScaleIntensityd(keys="image"),
+        ]
+
+    def inferer(self, data=None):
+        return SlidingWindowInferer(roi_size=self.roi_size, sw_batch_size=1, overlap=0.25)
+
+    def post_transforms(self, data=None) -> Sequence[Callable]:
+        return [
+            Activationsd(keys="pred", softmax=True),
+            AsDiscreted(keys="pred", argmax=True),
+            SqueezeDimd(keys="pred", dim=0),
+            ToNumpyd(keys="pred"),
+        ]
+
+
+class Benchmark:
+    """
+    Reproducible (synthetic data, fixed seed) benchmark of infer stages, training iterations, datastore operations,
+    scoring and wsi tile reads; results are json which can be compared against a baseline run.
+    """
+
+    def __init__(
+        self,
+        workdir: Optional[str] = None,
+        size: Sequence[int] = (128, 128, 64),
+        roi_size: Sequence[int] = (64, 64, 64),
+        repeat: int = 5,
+        warmup: int = 1,
+        iterations: int = 20,
+        batch_size: int = 2,
+        num_workers: int = 0,
+        objects: int = 100,
+        wsi_size: int = 8192,
+        tile_size: int = 1024,
+        wsi_backend: str = "tifffile",
+        device: str = "cpu",
+        seed: int = 0,
+    ):
+        self.workdir = workdir
+        self.size = tuple(size)
+        self.roi_size = tuple(min(r, s) for r, s in zip(roi_size, self.size))
+        self.repeat = repeat
+        self.warmup = warmup
+        self.iterations = iterations
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.objects = objects
+        self.wsi_size = wsi_size
+        self.tile_size = tile_size
+        self.wsi_backend = wsi_backend
+        self.device = device
+        self.seed = seed
+
+    def config(self) -> Dict[str, Any]:
+        return {k: list(v) if isinstance(v, tuple) else v for k, v in vars(self).items() if k != "workdir"}
+
+    @staticmethod
+    def env() -> Dict[str, Any]:
+        return {
+            "monailabel": monailabel.__version__,
+            "monai": monai.__version__,
+            "torch": torch.__version__,
+            "numpy": np.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": multiprocessing.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+            "cuda": torch.cuda.get_device_name(0) if torch.cuda.is_available() else None,
+        }
+
+    def run(self, benchmarks: Sequence[str] = BENCHMARKS) -> Dict[str, Any]:
+        workdir = self.workdir if self.workdir else tempfile.mkdtemp(prefix="monailabel-bench-")
+        os.makedirs(workdir, exist_ok=True)
+
+        results: Dict[str, Any] = {}
+        try:
+            for name in benchmarks:
+                set_determinism(seed=self.seed)
+                path = os.path.join(workdir, name)
+                os.makedirs(path, exist_ok=True)
+
+                logger.info(f"Running Benchmark: {name}")
+                start = time.time()
+                try:
+                    results[name] = getattr(self, f"bench_{name}")(path)
+                except Exception as e:
+                    logger.exception(f"Benchmark {name} failed")
+                    results[name] = {"error": str(e)}
+                results[name]["elapsed"] = round(time.time() - start, 4)
+        finally:
+            set_determinism(seed=None)
+            if not self.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        return {"env": self.env(), "config": self.config(), "results": results}
+
+    def bench_infer(self, path: str) -> Dict[str, Any]:
+        image, _ = synthetic_volume(self.size, self.seed)
+        image_path = os.path.join(path, "image.nii.gz")
+        write_itk(image, image_path, np.eye(4), None, False)
+
+        task = _BenchSegmentation(self.roi_size)
+        stages: Dict[str, List[float]] = {}
+        transforms: Dict[str, List[float]] = {}
+        for i in range(self.warmup + self.repeat):
+            result_file, result_json = task({"image": image_path, "device": self.device, "logging": "WARNING"})
+            remove_file(result_file)
+            if i < self.warmup:
+                continue
+
+            latencies = result_json["latencies"]
+            for k in ("pre", "infer", "invert", "post", "write", "total"):
+                stages.setdefault(k, []).append(latencies[k])
+            for stage, values in (latencies.get("transform") or {}).items():
+                for t, v in values.items():
+                    transforms.setdefault(f"{stage}.{t}", []).append(v)
+
+        return {
+            "image": list(self.size),
+            "stages": {k: timing_stats(v) for k, v in stages.items()},
+            "transforms": {k: timing_stats(v) for k, v in transforms.items()},
+        }
+
+    def bench_train(self, path: str) -> Dict[str, Any]:
+        samples = []
+        for i in range(4):
+            image, label = synthetic_volume(self.size, self.seed + i)
+            samples.append({"image": image[None], "label": label[None]})
+        datalist = [samples[i % len(samples)] for i in range(self.iterations * self.batch_size)]
+
+        transforms = Compose(
+            [
+                ScaleIntensityd(keys="image"),
+                RandSpatialCropd(keys=("image", "label"), roi_size=self.roi_size, random_size=False),
+                RandFlipd(keys=("image", "label"), prob=0.5, spatial_axis=0),
+            ]
+        )
+        loader = DataLoader(
+            Dataset(datalist, transforms), batch_size=self.batch_size, num_workers=self.num_workers, shuffle=True
+        )
+
+        device = torch.device(self.device)
+        network = UNet(spatial_dims=3, in_channels=1, out_channels=2, channels=(8, 16, 32), strides=(2, 2))
+        network = network.to(device)
+        trainer = SupervisedTrainer(
+            device=device,
+            max_epochs=1,
+            train_data_loader=loader,
+            network=network,
+            optimizer=torch.optim.Adam(network.parameters(), 1e-4),
+            loss_function=DiceCELoss(to_onehot_y=True, softmax=True),
+        )
+
+        timer = IterationTimer(synchronize=device.type == "cuda", max_samples=None)
+        timer.attach(trainer)
+        trainer.run()
+
+        skip = min(self.warmup, len(timer.compute_times) - 1)
+        return {
+            "roi_size": list(self.roi_size),
+            "batch_size": self.batch_size,
+            "num_workers": self.num_workers,
+            "data": timing_stats(list(timer.data_times)[skip:]),
+            "compute": timing_stats(list(timer.compute_times)[skip:]),
+            "summary": timer.summary(),
+        }
+
+    def bench_datastore(self, path: str) -> Dict[str, Any]:
+        image, label = synthetic_volume((16, 16, 16), self.seed)
+        image_file = os.path.join(path, "image.nii.gz")
+        label_file = os.path.join(path, "label.nii.gz")
+        write_itk(image, image_file, np.eye(4), None, False)
+        write_itk(label, label_file, np.eye(4), None, False)
+
+        studies = os.path.join(path, "studies")
+        os.makedirs(studies, exist_ok=True)
+        for i in range(self.objects):
+            shutil.copy(image_file, os.path.join(studies, f"image_{i:06d}.nii.gz"))
+
+        times: Dict[str, List[float]] = {}
+
+        def timed(op, func, *args):
+            start = time.perf_counter()
+            r = func(*args)
+            times.setdefault(op, []).append(time.perf_counter() - start)
+            return r
+
+        datastore = timed("init", LocalDatastore, studies, ".", "labels", "datastore_v2.json", ("*.nii.gz",), False)
+        image_ids = timed("list_images", datastore.list_images)
+        for image_id in image_ids[: self.repeat * 10]:
+            timed("get_image_uri", datastore.get_image_uri, image_id)
+            timed("get_image_info", datastore.get_image_info, image_id)
+            timed("update_image_info", datastore.update_image_info, image_id, {"bench": 1})
+            timed("save_label", datastore.save_label, image_id, label_file, DefaultLabelTag.FINAL.value, {})
+            timed("get_labels_by_image_id", datastore.get_labels_by_image_id, image_id)
+        for _ in range(self.repeat):
+            timed("datalist", datastore.datalist)
+            timed("get_unlabeled_images", datastore.get_unlabeled_images)
+            timed("refresh", datastore.refresh)
+
+        return {"objects": self.objects, "ops": {k: timing_stats(v) for k, v in times.items()}}
+
+    def bench_scoring(self, path: str) -> Dict[str, Any]:
+        studies = os.path.join(path, "studies")
+        os.makedirs(studies, exist_ok=True)
+        datastore = LocalDatastore(studies, extensions=("*.nii.gz",))
+
+        count = max(1, min(self.objects, self.repeat * 4))
+        for i in range(count):
+            image, label = synthetic_volume(self.size, self.seed + i)
+            image_file = os.path.join(path, "image.nii.gz")
+            label_file = os.path.join(path, "label.nii.gz")
+            write_itk(image, image_file, np.eye(4), None, False)
+            write_itk(label, label_file, np.eye(4), None, False)
+
+            image_id = datastore.add_image(f"image_{i:04d}", image_file, {})
+            datastore.save_label(image_id, label_file, DefaultLabelTag.FINAL.value, {})
+            datastore.save_label(image_id, label_file, DefaultLabelTag.ORIGINAL.value, {})
+
+        result = {"images": count}
+        for name, method in {"sum": Sum(), "dice": Dice()}.items():
+            start = time.perf_counter()
+            method({}, datastore)
+            latency = time.perf_counter() - start
+            result[name] = {"latency": round(latency, 4), "images_per_sec": round(count / latency, 4)}
+        return result
+
+    def bench_wsi(self, path: str) -> Dict[str, Any]:
+        if not has_tifffile:
+            return {"skipped": "tifffile is not installed"}
+
+        wsi_file = synthetic_wsi(os.path.join(path, "image.tif"), self.wsi_size, seed=self.seed)
+        reader = WSIReader(backend=self.wsi_backend)
+        wsi = reader.read(wsi_file)
+
+        rng = np.random.default_rng(self.seed)
+        times = []
+        limit = max(1, self.wsi_size - self.wsi_size % 256 - self.tile_size)
+        for i in range(self.warmup + self.repeat * 4):
+            location = (int(rng.integers(0, limit)), int(rng.integers(0, limit)))
+            start = time.perf_counter()
+            reader.get_data(wsi, location=location, size=(self.tile_size, self.tile_size), level=0)
+            if i >= self.warmup:
+                times.append(time.perf_counter() - start)
+
+        stats = timing_stats(times)
+        return {
+            "wsi_size": self.wsi_size,
+            "tile_size": self.tile_size,
+            "backend": self.wsi_backend,
+            "tile_read": stats,
+            "tiles_per_sec": round(1.0 / stats["mean"], 4) if stats.get("mean") else None,
+        }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Relative change (%) of every numeric metric in result vs baseline (positive => bigger than baseline)
+    """
+
+    def _compare(r, b):
+        if isinstance(r, dict) and isinstance(b, dict):
+            d = {k: _compare(v, b[k]) for k, v in r.items() if k in b}
+            return {k: v for k, v in d.items() if v is not None and v != {}}
+        if isinstance(r, (int, float)) and isinstance(b, (int, float)) and not isinstance(r, bool) and b:
+            return round(100.0 * (r - b) / abs(b), 2)
+        return None
+
+    return _compare(result.get("results", {}), baseline.get("results", {}))
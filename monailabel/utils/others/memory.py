@@ -0,0 +1,361 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import psutil
+import torch
+from monai.utils import optional_import
+
+from monailabel.config import settings
+from monailabel.interfaces.exception import InsufficientMemoryException
+from monailabel.utils.others.planner import free_memory, total_memory
+
+nib, has_nib = optional_import("nibabel")
+
+logger = logging.getLogger(__name__)
+
+HOST = "host"
+
+
+def _rss() -> int:
+    return psutil.Process().memory_info().rss
+
+
+def _mb(nbytes: int) -> float:
+    return round(nbytes / (1024 * 1024), 2)
+
+
+def _is_cuda(device) -> bool:
+    return bool(device) and str(device).startswith("cuda") and torch.cuda.is_available()
+
+
+class MemoryMonitor:
+    """
+    Tracks peak host RSS and device memory (torch allocator) per stage; sampled in a background thread (only at stage
+    boundaries if interval is 0).
+
+    Both are process wide; when requests run concurrently, peaks include memory used by the other requests.
+    Device peak stats of the allocator are never reset (other monitors/planner rely on them); peaks are sampled.
+    """
+
+    def __init__(self, device=None, interval: float = 0.005):
+        self.device = str(device) if _is_cuda(device) else None
+        self.interval = interval
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+        self.base_rss = 0
+        self.peak_rss = 0
+        self.base_device = 0
+        self.peak_device = 0
+
+        self._stage_peak = 0
+        self._stage_device_peak = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _allocated(self) -> int:
+        return torch.cuda.memory_allocated(self.device) if self.device else 0
+
+    def start(self):
+        self.base_rss = self.peak_rss = self._stage_peak = _rss()
+        self.base_device = self.peak_device = self._stage_device_peak = self._allocated()
+        if self.interval > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="MemoryMonitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._sample()
+
+    def _sample(self):
+        v = _rss()
+        d = self._allocated()
+        with self._lock:
+            self._stage_peak = max(self._stage_peak, v)
+            self.peak_rss = max(self.peak_rss, v)
+            self._stage_device_peak = max(self._stage_device_peak, d)
+            self.peak_device = max(self.peak_device, d)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        with self._lock:
+            self._stage_peak = _rss()
+            self._stage_device_peak = self._allocated()
+        try:
+            yield
+        finally:
+            self._sample()
+            result = {"host": _mb(self._stage_peak)}
+            if self.device:
+                result["device"] = _mb(self._stage_device_peak)
+            self.stages[name] = result
+
+    @property
+    def host_bytes(self) -> int:
+        return max(0, self.peak_rss - self.base_rss)
+
+    @property
+    def device_bytes(self) -> int:
+        return max(0, self.peak_device - self.base_device)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "host_peak": _mb(self.peak_rss),
+            "host_delta": _mb(self.host_bytes),
+            "device": self.device,
+            "device_peak": _mb(self.peak_device) if self.device else None,
+            "device_delta": _mb(self.device_bytes) if self.device else None,
+            "stages": self.stages,
+        }
+
+
+def image_voxels(request: Dict[str, Any]) -> Optional[int]:
+    """
+    Number of voxels (approx) for the input of an infer request without loading the image.
+
+    Uses tile size for wsi requests, shape for arrays and nifti headers; for other files the (uncompressed) file size
+    is used as proxy which is consistent for the same model and hence good enough to scale memory estimates.
+    """
+    size = request.get("size")
+    if request.get("location") is not None and isinstance(size, (list, tuple)) and len(size) == 2:
+        return int(size[0]) * int(size[1])
+
+    image = request.get("image")
+    if hasattr(image, "shape"):
+        return int(math.prod(image.shape))
+    if not isinstance(image, str) or not os.path.exists(image):
+        return None
+
+    try:
+        if os.path.isdir(image):
+            return sum(f.stat().st_size for f in os.scandir(image) if f.is_file()) // 2
+        if has_nib and image.endswith((".nii", ".nii.gz", ".mgz")):
+            return int(math.prod(nib.load(image).shape))
+        return os.path.getsize(image) // 2
+    except Exception as e:
+        logger.debug(f"Failed to get voxels for {image}: {e}")
+        return None
+
+
+class AdmissionTicket:
+    """
+    Memory reserved for an admitted request; `solo` is False if any other request ran (in this process) concurrently
+    """
+
+    def __init__(self, need: Dict[str, int]):
+        self.need = need
+        self.solo = True
+
+
+class MemoryAdmission:
+    """
+    Admission control for infer requests based on learned (per model) memory-per-voxel estimates.
+
+    A request is admitted if its estimated footprint (host and device) fits into available memory minus the part of
+    the reservations of running requests which is not allocated yet (available memory already excludes what they
+    use); otherwise it waits (queued) until enough memory is released (by other requests, workers, training or any
+    other process) or rejected with `InsufficientMemoryException` after timeout. It is rejected immediately only if
+    the footprint can never fit into total memory. Requests of models with no estimate yet are always admitted.
+
+    Memory peaks are process wide; so estimates are learned only from requests which ran alone.
+    """
+
+    def __init__(
+        self,
+        headroom: float = 0.1,
+        timeout: float = 60.0,
+        decay: float = 0.9,
+        available: Callable[[Optional[str]], int] = free_memory,
+        capacity: Callable[[Optional[str]], int] = total_memory,
+    ):
+        self.headroom = headroom
+        self.timeout = timeout
+        self.decay = decay
+        self.available = available
+        self.capacity = capacity
+
+        self._estimates: Dict[Tuple[str, str], float] = {}
+        self._reserved: Dict[str, int] = {}
+        self._idle_available: Dict[str, int] = {}  # available memory when no request was running
+        self._tickets: Set[AdmissionTicket] = set()
+        self._queued = 0
+        self._cond = threading.Condition()
+
+    @property
+    def _running(self) -> int:
+        return len(self._tickets)
+
+    def learn(
+        self,
+        model: str,
+        voxels: Optional[int],
+        host_bytes: int,
+        device_bytes: int = 0,
+        device=None,
+        min_host_bytes: int = 0,
+    ):
+        """
+        Update memory-per-voxel estimate; a decaying max so that estimate follows the worst recent request.
+
+        RSS growth drops to ~0 once the allocator reuses freed memory (after warm-up); so host observation is never
+        taken below `min_host_bytes` (e.g. size of the input tensor which is held for the whole request).
+        """
+        if not voxels:
+            return
+        observed = {HOST: max(host_bytes, min_host_bytes)}
+        if _is_cuda(device):
+            observed["device"] = device_bytes
+        with self._cond:
+            for resource, nbytes in observed.items():
+                key = (model, resource)
+                v = nbytes / voxels
+                self._estimates[key] = max(v, self._estimates.get(key, v) * self.decay)
+
+    def learn_from_result(
+        self,
+        model: str,
+        voxels: Optional[int],
+        result_json: Optional[Dict[str, Any]],
+        ticket: Optional[AdmissionTicket] = None,
+    ):
+        """
+        Update estimate from `latencies.peak_memory` of an infer result (recorded by BasicInferTask); skipped if the
+        request (ticket) did not run alone as the peaks then include memory used by the other requests
+        """
+        if ticket is not None and not ticket.solo:
+            logger.debug(f"Skip learning memory estimate for model '{model}'; request ran concurrently")
+            return
+        latencies = result_json.get("latencies") if isinstance(result_json, dict) else None
+        peak = latencies.get("peak_memory") if isinstance(latencies, dict) else None
+        if not peak:
+            return
+        mb = 1024 * 1024
+        host_bytes = int(peak.get("host_delta", 0) * mb)
+        device_bytes = int((peak.get("device_delta") or 0) * mb)
+        memory = latencies.get("memory") if isinstance(latencies.get("memory"), dict) else {}
+        min_host_bytes = int((memory.get("input") or 0) * mb)
+        self.learn(model, voxels, host_bytes, device_bytes, peak.get("device"), min_host_bytes)
+
+    def estimate(self, model: str, voxels: Optional[int], device=None) -> Dict[str, int]:
+        if not voxels:
+            return {}
+        with self._cond:
+            result = {}
+            host = self._estimates.get((model, HOST))
+            if host is not None:
+                result[HOST] = int(host * voxels)
+            dev = self._estimates.get((model, "device"))
+            if dev is not None and _is_cuda(device):
+                result[str(device)] = int(dev * voxels)
+            return result
+
+    def _too_large(self, need: Dict[str, int]) -> bool:
+        return any(n > self.capacity(None if r == HOST else r) * (1.0 - self.headroom) for r, n in need.items())
+
+    def _fits(self, need: Dict[str, int]) -> bool:
+        for resource, nbytes in need.items():
+            available = self.available(None if resource == HOST else resource)
+            if self._running == 0:
+                self._idle_available[resource] = available
+
+            # memory allocated by running requests is already excluded from available; keep only the rest of their
+            # reservations free (what they have not allocated yet)
+            in_use = max(0, self._idle_available.get(resource, available) - available)
+            unallocated = max(0, self._reserved.get(resource, 0) - in_use)
+            if nbytes + unallocated > available * (1.0 - self.headroom):
+                return False
+        return True
+
+    def admit(self, model: str, voxels: Optional[int], device=None, timeout: Optional[float] = None) -> AdmissionTicket:
+        """
+        Reserve estimated memory for the request (blocks while queued); caller must `release` the returned ticket
+        """
+        need = self.estimate(model, voxels, device)
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        with self._cond:
+            self._queued += 1
+            try:
+                while need and not self._fits(need):
+                    remaining = deadline - time.time()
+                    too_large = self._too_large(need)
+                    if too_large or remaining <= 0:
+                        msg = ", ".join(f"{r}: {_mb(n)} MB" for r, n in need.items())
+                        raise InsufficientMemoryException(
+                            f"Not enough memory to run infer for model '{model}' (estimated {msg}); "
+                            f"{'input is too large' if too_large else 'retry later'}"
+                        )
+                    # memory can also be released by other processes (workers, training); so re-check periodically
+                    self._cond.wait(min(remaining, 1.0))
+            finally:
+                self._queued -= 1
+
+            ticket = AdmissionTicket(need)
+            if self._tickets:
+                ticket.solo = False
+                for t in self._tickets:
+                    t.solo = False
+            for resource, nbytes in need.items():
+                self._reserved[resource] = self._reserved.get(resource, 0) + nbytes
+            self._tickets.add(ticket)
+        return ticket
+
+    def release(self, ticket: Optional[AdmissionTicket]):
+        if ticket is None:
+            return
+        with self._cond:
+            if ticket not in self._tickets:
+                return
+            for resource, nbytes in ticket.need.items():
+                self._reserved[resource] = max(0, self._reserved.get(resource, 0) - nbytes)
+            self._tickets.discard(ticket)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "running": self._running,
+                "queued": self._queued,
+                "reserved_mb": {r: _mb(n) for r, n in self._reserved.items()},
+                "bytes_per_voxel": {f"{m}/{r}": round(v, 2) for (m, r), v in self._estimates.items()},
+            }
+
+
+_admission: Optional[MemoryAdmission] = None
+_admission_lock = threading.Lock()
+
+
+def memory_admission() -> MemoryAdmission:
+    global _admission
+    with _admission_lock:
+        if _admission is None:
+            _admission = MemoryAdmission(
+                headroom=settings.MONAI_LABEL_INFER_ADMISSION_HEADROOM,
+                timeout=settings.MONAI_LABEL_INFER_ADMISSION_TIMEOUT,
+            )
+        return _admission
@@ -0,0 +1,224 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import prometheus_client
+from prometheus_client import CollectorRegistry, multiprocess
+
+from monailabel.config import settings
+
+logger = logging.getLogger(__name__)
+
+# prometheus_client shares metrics of all (uvicorn) workers through files in this directory
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TASK_BUCKETS = (1.0, 10.0, 30.0, 60.0, 300.0, 600.0, 1800.0, 3600.0, 4 * 3600.0, 12 * 3600.0, 24 * 3600.0)
+INFER_STAGES = ("pre", "infer", "invert", "post", "write", "total")
+
+
+class ServerMetrics:
+    """
+    Prometheus collectors of MONAI Label server (infer stages, concurrency, caches, models, datastore and tasks).
+
+    Gauges are aggregated as sum of live processes when running in multi-process (multiple uvicorn workers) mode.
+    """
+
+    def __init__(self, registry=None):
+        p = prometheus_client
+        kwargs = {"registry": registry} if registry is not None else {}
+
+        self.infer_stage = p.Histogram(
+            "monailabel_infer_stage_seconds",
+            "Latency of infer stages (pre, infer, invert, post, write, total)",
+            ["model", "stage"],
+            buckets=LATENCY_BUCKETS,
+            **kwargs,
+        )
+        self.infer_transform = p.Histogram(
+            "monailabel_infer_transform_seconds",
+            "Latency of individual pre/post transforms",
+            ["model", "stage", "transform"],
+            buckets=LATENCY_BUCKETS,
+            **kwargs,
+        )
+        self.infer_requests = p.Counter("monailabel_infer_requests", "Infer requests", ["model", "status"], **kwargs)
+        self.infer_inflight = p.Gauge(
+            "monailabel_infer_inflight", "Infer requests running", ["model"], multiprocess_mode="livesum", **kwargs
+        )
+        self.infer_queued = p.Gauge(
+            "monailabel_infer_queue_depth",
+            "Infer requests waiting for a free infer thread",
+            multiprocess_mode="livesum",
+            **kwargs,
+        )
+        self.cache = p.Counter("monailabel_cache_requests", "Cache lookups", ["cache", "result"], **kwargs)
+        self.model_load = p.Histogram(
+            "monailabel_model_load_seconds",
+            "Time to load (and warmup) a network",
+            ["model"],
+            buckets=LATENCY_BUCKETS,
+            **kwargs,
+        )
+        self.datastore_op = p.Histogram(
+            "monailabel_datastore_op_seconds",
+            "Latency of datastore operations",
+            ["op"],
+            buckets=LATENCY_BUCKETS,
+            **kwargs,
+        )
+        self.task_duration = p.Histogram(
+            "monailabel_task_duration_seconds",
+            "Duration of background tasks (train, batch_infer, scoring)",
+            ["method", "status"],
+            buckets=TASK_BUCKETS,
+            **kwargs,
+        )
+        self.tasks_queued = p.Gauge(
+            "monailabel_tasks_queued",
+            "Background tasks waiting to be run",
+            ["method"],
+            multiprocess_mode="livesum",
+            **kwargs,
+        )
+        self.http_request = p.Histogram(
+            "monailabel_http_request_seconds",
+            "Latency of http requests",
+            ["method", "route", "status"],
+            buckets=LATENCY_BUCKETS,
+            **kwargs,
+        )
+
+
+_metrics: Optional[ServerMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def server_metrics() -> Optional[ServerMetrics]:
+    """
+    Server metrics (singleton); None if metrics are disabled
+    """
+    global _metrics
+    if not settings.MONAI_LABEL_METRICS:
+        return None
+
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = ServerMetrics()
+        return _metrics
+
+
+def observe_infer(model: str, result_json: Optional[Dict[str, Any]], status: str = "ok"):
+    m = server_metrics()
+    if m is None:
+        return
+
+    m.infer_requests.labels(model, status).inc()
+    latencies = result_json.get("latencies") if result_json else None
+    if not latencies or status != "ok":
+        return
+
+    for stage in INFER_STAGES:
+        v = latencies.get(stage)
+        if isinstance(v, (int, float)):
+            m.infer_stage.labels(model, stage).observe(v)
+
+    transforms = latencies.get("transform")
+    for stage, values in (transforms.items() if isinstance(transforms, dict) else []):
+        for name, v in values.items() if isinstance(values, dict) else []:
+            m.infer_transform.labels(model, stage, name).observe(v)
+
+
+@contextlib.contextmanager
+def track_inflight(model: str):
+    m = server_metrics()
+    if m is None:
+        yield
+        return
+
+    m.infer_inflight.labels(model).inc()
+    try:
+        yield
+    finally:
+        m.infer_inflight.labels(model).dec()
+
+
+def infer_queued(delta: int):
+    m = server_metrics()
+    if m is not None:
+        m.infer_queued.inc(delta)
+
+
+def observe_cache(cache: str, hit: bool):
+    m = server_metrics()
+    if m is not None:
+        m.cache.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_model_load(model: str, seconds: float):
+    m = server_metrics()
+    if m is not None:
+        m.model_load.labels(model).observe(seconds)
+
+
+@contextlib.contextmanager
+def time_datastore(op: str):
+    m = server_metrics()
+    start = time.time()
+    try:
+        yield
+    finally:
+        if m is not None:
+            m.datastore_op.labels(op).observe(time.time() - start)
+
+
+def observe_task(method: str, status: str, seconds: float):
+    m = server_metrics()
+    if m is not None:
+        m.task_duration.labels(method, status).observe(seconds)
+
+
+def set_tasks_queued(method: str, count: int):
+    m = server_metrics()
+    if m is not None:
+        m.tasks_queued.labels(method).set(count)
+
+
+def observe_http(method: str, route: str, status: int, seconds: float):
+    m = server_metrics()
+    if m is not None:
+        m.http_request.labels(method, route, str(status)).observe(seconds)
+
+
+def process_exited(pid: int):
+    """
+    Remove live gauges of a finished process (multi-process mode)
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(pid)
+
+
+def generate_latest() -> Tuple[bytes, str]:
+    """
+    Metrics in prometheus text format (aggregated over all worker processes in multi-process mode)
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
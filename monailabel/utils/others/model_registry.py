@@ -0,0 +1,353 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import torch
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from monailabel.config import settings
+from monailabel.utils.others.metrics import observe_model_load
+
+logger = logging.getLogger(__name__)
+
+
+class ModelEntry:
+    def __init__(
+        self,
+        key,
+        network,
+        path: Optional[str],
+        loader: Callable,
+        mtime: float,
+        load_time: float,
+        warmup: Optional[Callable] = None,
+        resolve: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        self.key = key
+        self.network = network
+        self.path = path
+        self.loader = loader
+        self.mtime = mtime
+        self.size = network_size(network)
+        self.load_time = load_time
+        self.warmup = warmup
+        self.resolve = resolve
+        self.last_access_ts = time.time()
+
+
+class _CheckpointHandler(FileSystemEventHandler):
+    def __init__(self, registry: "ModelRegistry"):
+        self.registry = registry
+
+    def on_modified(self, event):
+        self.registry.on_checkpoint_changed(event.src_path)
+
+    def on_created(self, event):
+        self.registry.on_checkpoint_changed(event.src_path)
+
+    def on_moved(self, event):
+        self.registry.on_checkpoint_changed(event.dest_path)
+
+
+class ModelRegistry:
+    """
+    Central registry of loaded networks shared by all infer tasks.
+
+    - Networks are keyed by (owner, device, backend, precision); the checkpoint path is part of the entry. So a new
+      checkpoint (same or other path e.g. model.pt replacing pretrained.pt) is loaded in background and swapped in
+      atomically while requests keep being served by the current network
+    - Loading can be done in background (preload/warmup); concurrent requests for a network which is not loaded yet
+      wait for a single load
+    - Checkpoint dirs are watched; changes (or a new latest checkpoint path as given by `resolve`) trigger a reload
+    - Least recently used networks are evicted beyond max_models or when total size goes beyond max_memory (MB)
+    """
+
+    def __init__(self, max_memory: int = 0, watch: bool = True, max_workers: int = 1, max_models: int = 0):
+        self.max_memory = max_memory
+        self.max_models = max_models
+        self.watch = watch
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Hashable, ModelEntry]" = OrderedDict()
+        self._pending: Dict[Hashable, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="MODEL")
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "reloads": 0, "evictions": 0, "load_time": 0.0}
+
+        self._observer = None
+        self._watched_dirs: Dict[str, Any] = {}
+        self._handler = _CheckpointHandler(self)
+
+    def get(
+        self,
+        key: Hashable,
+        path: Optional[str],
+        loader: Callable,
+        warmup: Optional[Callable] = None,
+        resolve: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        """
+        Get network for the given key; load it (inline) only if there is none yet (or wait if it is being loaded).
+        If the checkpoint changed (path or content), current network is returned while new one loads in background.
+
+        :param key: unique key for the network (e.g. owner, device, backend, precision)
+        :param path: (latest) checkpoint path; None if network has no checkpoint
+        :param loader: callable (path) which returns new (loaded) network
+        :param warmup: optional callable to run on newly loaded network before it is made available
+        :param resolve: optional callable which returns latest checkpoint path (checked on changes in model dir)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.last_access_ts = time.time()
+                self._stats["hits"] += 1
+                if entry.path != path or (not self._is_watching(path) and self._is_stale(entry)):
+                    self._submit(key, path, loader, warmup, resolve)
+                return entry.network
+            self._stats["misses"] += 1
+
+            # Being loaded (background or by another request); wait for it instead of loading twice
+            future = self._pending.get(key)
+            inline = future is None
+            if inline:
+                future = self._pending[key] = Future()
+
+        if inline:
+            self._run(future, key, path, loader, warmup, resolve)
+        return future.result()
+
+    def preload(
+        self,
+        key: Hashable,
+        path: Optional[str],
+        loader: Callable,
+        warmup: Optional[Callable] = None,
+        resolve: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        """
+        Load network in background (if not already loaded) so that first request does not pay for it
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.path == path:
+                return None
+            return self._submit(key, path, loader, warmup, resolve)
+
+    def reload(self, owner=None, match: Optional[Callable[[Hashable], bool]] = None) -> List[Future]:
+        """
+        Re-load all networks (or only networks of the given owner i.e. key[0] and/or keys matching) in background;
+        current networks are served until new ones are swapped in
+        """
+        with self._lock:
+            entries = [
+                e
+                for k, e in self._entries.items()
+                if (owner is None or _owner(k) == owner) and (match is None or match(k))
+            ]
+            return [self._submit(e.key, _latest(e), e.loader, e.warmup, e.resolve, force=True) for e in entries]
+
+    def remove(self, owner=None):
+        """
+        Remove all networks (or only networks which belong to given owner i.e. key[0])
+        """
+        with self._lock:
+            keys = [k for k in self._entries if owner is None or _owner(k) == owner]
+            for k in keys:
+                self._entries.pop(k, None)
+        self._empty_cache()
+        return len(keys)
+
+    def on_checkpoint_changed(self, path):
+        path = os.path.realpath(path)
+        with self._lock:
+            for e in list(self._entries.values()):
+                latest = _latest(e)
+                if latest != e.path or (e.path and os.path.realpath(e.path) == path and self._is_stale(e)):
+                    logger.info(f"Checkpoint changed; Reload (background): {e.key} => {latest}")
+                    self._submit(e.key, latest, e.loader, e.warmup, e.resolve)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["load_time"] = round(stats["load_time"], 2)
+            stats["memory"] = round(sum(e.size for e in self._entries.values()) / (1024 * 1024), 2)
+            stats["max_memory"] = self.max_memory
+            stats["max_models"] = self.max_models
+            stats["pending"] = len(self._pending)
+            stats["models"] = {
+                str(k): {
+                    "path": e.path,
+                    "size": round(e.size / (1024 * 1024), 2),
+                    "load_time": round(e.load_time, 2),
+                    "last_access_ts": int(e.last_access_ts),
+                }
+                for k, e in self._entries.items()
+            }
+            return stats
+
+    def _submit(self, key, path, loader, warmup, resolve=None, force=False) -> Future:
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = Future()
+            self._executor.submit(self._run, future, key, path, loader, warmup, resolve, True, force)
+        return future
+
+    def _run(self, future: Future, key, path, loader, warmup, resolve=None, background=False, force=False):
+        network = None
+        try:
+            if background:
+                _wait_written(path)
+            network = self._load(key, path, loader, warmup, resolve, force)
+            future.set_result(network)
+        except Exception as e:
+            logger.exception(f"Failed to load network for {key}: {e}")
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                if self._pending.get(key) is future:
+                    self._pending.pop(key)
+
+                # checkpoint got updated (or replaced) again while loading
+                entry = self._entries.get(key)
+                if network is not None and entry is not None and self._is_watching(path):
+                    latest = _latest(entry)
+                    if latest != entry.path or self._is_stale(entry):
+                        self._submit(key, latest, loader, warmup, resolve)
+
+    def _load(self, key, path, loader, warmup, resolve=None, force=False):
+        with self._lock:
+            entry = self._entries.get(key)
+            if not force and entry is not None and entry.path == path and not self._is_stale(entry):
+                return entry.network
+
+        start = time.time()
+        mtime = _mtime(path)
+        network = loader(path)
+        if warmup:
+            warmup(network)
+        load_time = time.time() - start
+
+        entry = ModelEntry(key, network, path, loader, mtime, load_time, warmup, resolve)
+        with self._lock:
+            old = self._entries.get(key)
+            self._entries[key] = entry  # atomic swap; in-flight requests keep using the old network
+            self._entries.move_to_end(key)
+
+            self._stats["reloads" if old else "loads"] += 1
+            self._stats["load_time"] += load_time
+            self._evict(keep=key, force=old is not None)
+            self._watch(path)
+
+        owner = key[0] if isinstance(key, tuple) and key else key
+        observe_model_load(str(owner).split("@")[0], load_time)
+
+        logger.info(f"Network {'re-loaded' if old else 'loaded'} for {key} ({path}) in {load_time:.4f} sec")
+        return network
+
+    def _evict(self, keep, force=False):
+        evicted = force
+        max_bytes = self.max_memory * 1024 * 1024 if self.max_memory > 0 else None
+        while (self.max_models > 0 and len(self._entries) > self.max_models) or (
+            max_bytes is not None and sum(e.size for e in self._entries.values()) > max_bytes
+        ):
+            key = next((k for k in self._entries if k != keep), None)
+            if key is None:
+                break
+            entry = self._entries.pop(key)
+            self._stats["evictions"] += 1
+            evicted = True
+            logger.info(f"Evict (LRU) network: {key}; size: {entry.size / (1024 * 1024):.2f} MB")
+
+        if evicted:
+            self._empty_cache()
+
+    def _is_stale(self, entry: ModelEntry) -> bool:
+        mtime = _mtime(entry.path)
+        return bool(mtime) and mtime != entry.mtime
+
+    def _is_watching(self, path) -> bool:
+        return bool(path) and os.path.dirname(os.path.realpath(path)) in self._watched_dirs
+
+    def _watch(self, path):
+        if not self.watch or not path or not os.path.exists(path):
+            return
+
+        path_dir = os.path.dirname(os.path.realpath(path))
+        if path_dir in self._watched_dirs:
+            return
+
+        try:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            self._watched_dirs[path_dir] = self._observer.schedule(self._handler, path=path_dir, recursive=False)
+            logger.info(f"Watching model dir for new checkpoints: {path_dir}")
+        except OSError as e:
+            logger.warning(f"Failed to watch model dir {path_dir}; fallback to check on every request: {e}")
+
+    def _empty_cache(self):
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+def network_size(network) -> int:
+    if not isinstance(network, torch.nn.Module):
+        return 0
+    size = sum(p.numel() * p.element_size() for p in network.parameters())
+    size += sum(b.numel() * b.element_size() for b in network.buffers())
+    return size
+
+
+def _owner(key):
+    return key[0] if isinstance(key, tuple) else key
+
+
+def _latest(entry: ModelEntry) -> Optional[str]:
+    return entry.resolve() if entry.resolve else entry.path
+
+
+def _wait_written(path, settle: float = 1.0):
+    # checkpoint might still be in the middle of being written (background loads only)
+    while True:
+        age = time.time() - _mtime(path)
+        if not _mtime(path) or age >= settle:
+            return
+        time.sleep(settle - age)
+
+
+def _mtime(path) -> float:
+    return os.stat(path).st_mtime if path and os.path.exists(path) else 0
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def model_registry() -> ModelRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(
+                max_memory=settings.MONAI_LABEL_MODELS_MAX_MEMORY,
+                watch=settings.MONAI_LABEL_MODELS_WATCH,
+                max_workers=settings.MONAI_LABEL_MODELS_LOAD_WORKERS,
+                max_models=settings.MONAI_LABEL_MODELS_MAX_LOADED,
+            )
+        return _registry
@@ -9,147 +9,406 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gzip
 import json
 import logging
+import os
 import tempfile
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, box
+from shapely.strtree import STRtree
 
 from monailabel.utils.others.label_colors import to_hex, to_rgb
 
 logger = logging.getLogger(__name__)
 
+GZIP_COMPRESS_LEVEL = 6
 
-def create_dsa_annotations_json(json_data, loglevel="INFO"):
-    logger.setLevel(loglevel.upper())
 
-    total_count = 0
-    label_json = tempfile.NamedTemporaryFile(suffix=".json").name
-    with open(label_json, "w") as fp:
-        fp.write("{\n")
-        fp.write(' "name": "{}",\n'.format(json_data["name"]))
-        fp.write(' "elements": [\n')
+def format_points(contour, fmt_int: str, fmt_float: str, order: bool = False) -> str:
+    """
+    Format all (x, y) points of a contour using a single %-format (instead of formatting point by point).
 
-        for tid, res in enumerate(json_data["annotations"]):
-            logger.debug(f"Adding annotations for tile: {tid}")
-            if not res:
-                continue
+    Raises ValueError if any (float) coordinate is nan/inf; they can't be written as valid json/xml coordinates.
+    """
+    points = np.asarray(contour)
+    if points.size == 0:
+        return ""
+    points = points.reshape(len(points), -1)[:, :2]
+    integral = points.dtype.kind in "iub"
+    if not integral and not np.isfinite(points).all():
+        raise ValueError("contour has non-finite (nan/inf) coordinates")
+    if order:
+        points = np.column_stack((np.arange(len(points)), points))
+    fmt = fmt_int if integral else fmt_float
+    return (fmt * len(points)) % tuple(points.ravel().tolist())
 
-            annotation = res.get("annotation")
-            if not annotation:
-                continue
 
-            color_map = annotation.get("labels")
-            elements = annotation.get("elements", [])
-            for element in elements:
-                label = element["label"]
-                color = to_rgb(color_map.get(label))
-
-                logger.info(f"Adding Contours for label: {label}; color: {color}; color_map: {color_map}")
-
-                contours = element["contours"]
-                for contour in contours:
-                    points = []
-                    for point in contour:
-                        points.append([point[0], point[1], 0])
-
-                    if total_count > 0:
-                        fp.write(",\n")
-
-                    annotation_style = {
-                        "group": label,
-                        "type": "polyline",
-                        "lineColor": color,
-                        "lineWidth": 2.0,
-                        "closed": True,
-                        "points": points,
-                        "label": {"value": label},
-                    }
-                    fp.write(f"  {json.dumps(annotation_style)}")
-                    total_count += 1
-
-        fp.write(" ],\n")  # close elements
-        fp.write(
-            ' "description": {}\n'.format(
-                json.dumps(
-                    json.dumps(
-                        {
-                            "model": json_data.get("model"),
-                            "desc": json_data.get("description"),
-                            "location": json_data.get("location"),
-                            "size": json_data.get("size"),
-                            "count": total_count,
-                            "latencies": json_data.get("latencies"),
-                        }
-                    )
-                )
-            )
+def filter_region(res: Optional[Dict[str, Any]], location, size) -> Optional[Dict[str, Any]]:
+    """
+    Keep only polygons of a tile result which overlap the region (location, size); e.g. tiles aligned to the slide wide
+    grid extend beyond the requested region and polygons found only in that extended part are dropped
+    """
+    annotation = res.get("annotation") if res else None
+    if not annotation:
+        return res
+
+    x0, y0 = location[0], location[1]
+    x1, y1 = x0 + size[0], y0 + size[1]
+    elements = []
+    for element in annotation.get("elements", []):
+        contours = []
+        for contour in element["contours"]:
+            points = np.asarray(contour).reshape(-1, 2)
+            if len(points) and (points.max(axis=0) >= (x0, y0)).all() and (points.min(axis=0) < (x1, y1)).all():
+                contours.append(contour)
+        if contours:
+            elements.append({**element, "contours": contours})
+    return {**res, "annotation": {**annotation, "elements": elements}}
+
+
+class AnnotationWriter(metaclass=ABCMeta):
+    """
+    Writes (WSI) annotations incrementally into a file (optionally gzip compressed).
+
+    Polygons of a tile result are written as soon as the tile is added; so results of finished tiles need not be kept
+    in memory until all the tiles are inferred.
+    """
+
+    suffix = ""
+    separator = ""
+
+    def __init__(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        model: Optional[str] = None,
+        location: Optional[Sequence[int]] = None,
+        size: Optional[Sequence[int]] = None,
+        path: Optional[str] = None,
+        compress: bool = False,
+    ):
+        self.name = name
+        self.description = description
+        self.model = model
+        self.location = location
+        self.size = size
+        self.path = path if path else tempfile.NamedTemporaryFile(suffix=self.suffix + (".gz" if compress else "")).name
+
+        self.count = 0
+        self.labels: Dict[str, str] = {}
+        self._styles: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._fp = gzip.open(self.path, "wt", compresslevel=GZIP_COMPRESS_LEVEL) if compress else open(self.path, "w")
+        self._fp.write(self._header())
+
+    def add(self, res: Optional[Dict[str, Any]]) -> int:
+        """
+        Write polygons of one tile result (annotation from FindContoursd); returns number of polygons written
+        """
+        annotation = res.get("annotation") if res else None
+        if not annotation:
+            return 0
+
+        count = self.count
+        color_map = annotation.get("labels", {})
+        for element in annotation.get("elements", []):
+            label = element["label"]
+            prefix, suffix = self._style(label, color_map.get(label))
+
+            items = []
+            for contour in element["contours"]:
+                try:
+                    items.append(prefix + self._points(contour) + suffix)
+                except ValueError as e:
+                    logger.warning(f"Skip contour for label: {label}; {e}")
+            if items:
+                self._fp.write((self.separator if self.count else "") + self.separator.join(items))
+                self.count += len(items)
+        return self.count - count
+
+    def _style(self, label, color) -> Tuple[str, str]:
+        key = (label, str(color))
+        style = self._styles.get(key)
+        if style is None:
+            logger.debug(f"Adding Contours for label: {label}; color: {color}")
+            style = self._styles[key] = self._element(label, color)
+        return style
+
+    def close(self, latencies=None) -> Tuple[str, int]:
+        """
+        Finish the annotations document; returns (path, total polygons)
+        """
+        self._fp.write(self._footer(latencies))
+        self._fp.close()
+        logger.info(f"Total Annotations: {self.count}")
+        return self.path, self.count
+
+    def abort(self):
+        self._fp.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    @abstractmethod
+    def _header(self) -> str:
+        pass
+
+    @abstractmethod
+    def _element(self, label, color) -> Tuple[str, str]:
+        """
+        Prefix and suffix (style) written around points of every polygon of the label
+        """
+        pass
+
+    @abstractmethod
+    def _points(self, contour) -> str:
+        pass
+
+    @abstractmethod
+    def _footer(self, latencies) -> str:
+        pass
+
+
+class DSAAnnotationWriter(AnnotationWriter):
+    """
+    Writes annotations in DSA (Digital Slide Archive) json format
+    """
+
+    suffix = ".json"
+    separator = ",\n"
+
+    def _header(self) -> str:
+        return '{\n "name": %s,\n "elements": [\n' % json.dumps(self.name)
+
+    def _element(self, label, color) -> Tuple[str, str]:
+        color = to_rgb(color)
+        self.labels[label] = color
+
+        style = {"group": label, "type": "polyline", "lineColor": color, "lineWidth": 2.0, "closed": True}
+        prefix = "  " + json.dumps(style)[:-1] + ', "points": ['
+        suffix = '], "label": ' + json.dumps({"value": label}) + "}"
+        return prefix, suffix
+
+    def _points(self, contour) -> str:
+        return format_points(contour, "[%d, %d, 0], ", "[%.2f, %.2f, 0], ")[:-2]
+
+    def _footer(self, latencies) -> str:
+        description = {
+            "model": self.model,
+            "desc": self.description,
+            "location": self.location,
+            "size": self.size,
+            "count": self.count,
+            "latencies": latencies,
+        }
+        return '\n ],\n "description": %s\n}' % json.dumps(json.dumps(description))
+
+
+class ASAPAnnotationWriter(AnnotationWriter):
+    """
+    Writes annotations in ASAP xml format
+    """
+
+    suffix = ".xml"
+
+    def _header(self) -> str:
+        location = self.location if self.location else (0, 0, 0, 0)
+        size = self.size if self.size else (0, 0)
+        return (
+            '<?xml version="1.0"?>\n'
+            "<ASAP_Annotations>\n"
+            f'  <Annotations Name="{self.name}" Description="{self.description}" Model="{self.model}" '
+            f'X="{location[0]}" Y="{location[1]}" W="{size[0]}" H="{size[1]}">\n'
         )
-        fp.write("}")  # end of root
 
-    logger.info(f"Total Elements: {total_count}")
-    return label_json, total_count
+    def _element(self, label, color) -> Tuple[str, str]:
+        color = to_hex(color)
+        self.labels[label] = color
 
+        prefix = f'    <Annotation Name="{label}" Type="Polygon" PartOfGroup="{label}" Color="{color}">\n'
+        prefix += "      <Coordinates>\n"
+        suffix = "      </Coordinates>\n    </Annotation>\n"
+        return prefix, suffix
 
-def create_asap_annotations_xml(json_data, loglevel="INFO"):
-    logger.setLevel(loglevel.upper())
+    def _points(self, contour) -> str:
+        return format_points(
+            contour,
+            '        <Coordinate Order="%d" X="%d" Y="%d" />\n',
+            '        <Coordinate Order="%d" X="%.2f" Y="%.2f" />\n',
+            order=True,
+        )
 
-    total_count = 0
-    label_xml = tempfile.NamedTemporaryFile(suffix=".xml").name
-
-    name = json_data["name"]
-    description = json_data["description"]
-    model = json_data["model"]
-    location = json_data.get("location", (0, 0, 0, 0))
-    location = location if location else (0, 0, 0, 0)
-    size = json_data.get("size", (0, 0))
-    size = size if size else (0, 0)
-
-    with open(label_xml, "w") as fp:
-        fp.write('<?xml version="1.0"?>\n')
-        fp.write("<ASAP_Annotations>\n")
-        fp.write(
-            '  <Annotations Name="{}" Description="{}" Model="{}" X="{}" Y="{}" W="{}" H="{}">\n'.format(
-                name, description, model, location[0], location[1], size[0], size[1]
-            )
+    def _footer(self, latencies) -> str:
+        groups = "".join(
+            f'    <Group Name="{label}" PartOfGroup="None" Color="{color}">\n'
+            "      <Attributes />\n"
+            "    </Group>\n"
+            for label, color in self.labels.items()
         )
+        return "  </Annotations>\n  <AnnotationGroups>\n" + groups + "  </AnnotationGroups>\n</ASAP_Annotations>\n"
 
-        labels = {}
-        for tid, res in enumerate(json_data["annotations"]):
-            logger.debug(f"Adding annotations for tile: {tid}")
-            if not res:
+
+class SeamMerger:
+    """
+    Merges polygons of an object which is cut at the borders of wsi tiles.
+
+    Polygons near a tile border (within `margin` pixels) are held back (with their source tile) while tile results are
+    added; all other polygons pass through unchanged. `merge` bulk queries the held polygons of each label in a STRtree
+    for pieces within `tolerance` of each other, groups only pieces of different adjacent tiles which both lie at their
+    shared seam (union-find) and replaces every group by the union of its pieces. Pieces of the same tile are never
+    merged. So the cost is roughly linear in number of polygons at the tile seams.
+    """
+
+    def __init__(self, margin: int = 2, tolerance: float = 1.5):
+        self.margin = margin
+        self.tolerance = tolerance
+
+        self.labels: Dict[str, Any] = {}
+        self._held: Dict[str, list] = {}
+        self._stats = {"held": 0, "merged": 0, "polygons": 0}
+
+    def split(self, location, size, res: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Hold back polygons near border of the tile (location, size); returns tile result with remaining polygons
+        """
+        annotation = res.get("annotation") if res else None
+        if not annotation:
+            return res
+
+        tile = (location[0], location[1], location[0] + size[0], location[1] + size[1])
+        x0, y0 = location[0] + self.margin, location[1] + self.margin
+        x1, y1 = location[0] + size[0] - 1 - self.margin, location[1] + size[1] - 1 - self.margin
+        self.labels.update(annotation.get("labels", {}))
+
+        elements = []
+        for element in annotation.get("elements", []):
+            inner = []
+            held = self._held.setdefault(element["label"], [])
+            for contour in element["contours"]:
+                points = np.asarray(contour).reshape(-1, 2)
+                if len(points) and (points.min(axis=0) > (x0, y0)).all() and (points.max(axis=0) < (x1, y1)).all():
+                    inner.append(contour)
+                else:
+                    held.append((points, tile))
+            if inner:
+                elements.append({**element, "contours": inner})
+        return {**res, "annotation": {**annotation, "elements": elements}}
+
+    def merge(self) -> Dict[str, Any]:
+        """
+        Annotation (labels, elements) with held back polygons merged across the tile seams
+        """
+        elements = []
+        for label, held in self._held.items():
+            self._stats["held"] += len(held)
+            merged = self._merge(held)
+            self._stats["polygons"] += len(merged)
+            if merged:
+                elements.append({"label": label, "contours": merged})
+        self._held.clear()
+        return {"labels": self.labels, "elements": elements}
+
+    def _seam(self, a, b):
+        """
+        Region around the border shared by tiles a and b (x0, y0, x1, y1); None if same tile or not adjacent
+        """
+        if a == b:
+            return None
+        x0, y0, x1, y1 = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+        if x0 > x1 or y0 > y1:
+            return None
+        d = self.margin + self.tolerance + 1
+        return box(x0 - d, y0 - d, x1 + d, y1 + d)
+
+    def _merge(self, held):
+        result = [c.tolist() for c, _ in held if len(c) < 3]
+        held = [(c, t) for c, t in held if len(c) >= 3]
+        if not held:
+            return result
+
+        contours = [c for c, _ in held]
+        tiles = [t for _, t in held]
+        polygons = [Polygon(c) for c in contours]
+        polygons = [p if p.is_valid else p.buffer(0) for p in polygons]
+        tree = STRtree(polygons)
+        left, right = tree.query(polygons, predicate="dwithin", distance=self.tolerance)
+
+        # union-find over pairs of nearby pieces of adjacent tiles at their shared seam
+        parent = list(range(len(polygons)))
+        seams: Dict[Tuple, Any] = {}
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in zip(left.tolist(), right.tolist()):
+            if i >= j:
                 continue
+            pair = (tiles[i], tiles[j])
+            if pair not in seams:
+                seams[pair] = self._seam(*pair)
+            seam = seams[pair]
+            if seam is not None and seam.intersects(polygons[i]) and seam.intersects(polygons[j]):
+                parent[find(i)] = find(j)
+
+        groups: Dict[int, list] = {}
+        for i in range(len(polygons)):
+            groups.setdefault(find(i), []).append(i)
 
-            annotation = res.get("annotation")
-            if not annotation:
+        for group in groups.values():
+            if len(group) == 1:
+                result.append(contours[group[0]].tolist())
                 continue
 
-            logger.info(f"Annotation keys: {annotation.keys()}")
-            color_map = annotation.get("labels")
-            elements = annotation.get("elements", [])
-            for element in elements:
-                label = element["label"]
-                color = to_hex(color_map.get(label))
-
-                logger.debug(f"Adding Contours for label: {label}; color: {color}; color_map: {color_map}")
-                labels[label] = color
-
-                contours = element["contours"]
-                for contour in contours:
-                    fp.write(f'    <Annotation Name="{label}" Type="Polygon" PartOfGroup="{label}" Color="{color}">\n')
-                    fp.write("      <Coordinates>\n")
-                    for pcount, point in enumerate(contour):
-                        fp.write(f'        <Coordinate Order="{pcount}" X="{point[0]}" Y="{point[1]}" />\n')
-                    fp.write("      </Coordinates>\n")
-                    fp.write("    </Annotation>\n")
-                    total_count += 1
-        fp.write("  </Annotations>\n")
-
-        fp.write("  <AnnotationGroups>\n")
-        for label, color in labels.items():
-            fp.write(f'    <Group Name="{label}" PartOfGroup="None" Color="{color}">\n')
-            fp.write("      <Attributes />\n")
-            fp.write("    </Group>\n")
-        fp.write("  </AnnotationGroups>\n")
-        fp.write("</ASAP_Annotations>\n")
-
-    logger.info(f"Total Annotations: {total_count}")
-    return label_xml, total_count
+            self._stats["merged"] += len(group)
+            # pieces on both sides of a seam are (up to) a pixel apart; close the gap (mitre keeps corners)
+            union = shapely.union_all([polygons[i].buffer(self.tolerance, join_style=2) for i in group])
+            union = union.buffer(-self.tolerance, join_style=2)
+            for p in getattr(union, "geoms", [union]):
+                if isinstance(p, Polygon) and not p.is_empty:
+                    result.append(np.round(np.asarray(p.exterior.coords)[:-1]).astype(int).tolist())
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+
+def write_annotations(writer: AnnotationWriter, json_data, loglevel="INFO"):
+    logger.setLevel(loglevel.upper())
+    try:
+        for tid, res in enumerate(json_data["annotations"]):
+            logger.debug(f"Adding annotations for tile: {tid}")
+            writer.add(res)
+    except Exception:
+        writer.abort()
+        raise
+    return writer.close(json_data.get("latencies"))
+
+
+def create_dsa_annotations_json(json_data, loglevel="INFO", compress=False):
+    writer = DSAAnnotationWriter(
+        name=json_data["name"],
+        description=json_data.get("description"),
+        model=json_data.get("model"),
+        location=json_data.get("location"),
+        size=json_data.get("size"),
+        compress=compress,
+    )
+    return write_annotations(writer, json_data, loglevel)
+
+
+def create_asap_annotations_xml(json_data, loglevel="INFO", compress=False):
+    writer = ASAPAnnotationWriter(
+        name=json_data["name"],
+        description=json_data["description"],
+        model=json_data["model"],
+        location=json_data.get("location"),
+        size=json_data.get("size"),
+        compress=compress,
+    )
+    return write_annotations(writer, json_data, loglevel)
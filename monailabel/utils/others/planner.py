@@ -10,9 +10,14 @@
 # limitations under the License.
 
 import logging
+import math
 import random
+import threading
+from typing import Any, Dict, Optional, Sequence
 
 import numpy as np
+import psutil
+import torch
 from monai.transforms import LoadImage
 from tqdm import tqdm
 
@@ -86,7 +91,7 @@ class HeuristicPlanner:
         # This should return an image according to the free gpu memory available
         # Equation obtained from curve fitting using table:
         # https://tinyurl.com/tableGPUMemory
-        gpu_mem = gpu_memory_map()[0]
+        gpu_mem = HeuristicPlanner._gpu_memory()
         # Get a number in base 2 close to the mean depth
         depth_base_2 = int(2 ** np.ceil(np.log2(target_img_size[2])))
         # Get the maximum width according available GPU memory
@@ -101,3 +106,233 @@ class HeuristicPlanner:
     @staticmethod
     def _get_target_spacing(target_spacing):
         return np.around(target_spacing)
+
+    @staticmethod
+    def _gpu_memory() -> int:
+        # free gpu memory (MB) of first device
+        if torch.cuda.is_available():
+            return free_memory("cuda:0") // (1024 * 1024)
+        return gpu_memory_map()[0]
+
+
+class SlidingWindowPlanner(HeuristicPlanner):
+    """
+    Plan sliding window inference (roi tiling, overlap, sw_batch_size and sw_device/device split) per request
+    based on input shape, measured memory needed per window (cached per model) and currently free memory.
+
+    When roi size is not given for a request, spatial size of the heuristic plan is used (see :py:meth:`run`).
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 32,
+        min_overlap: float = 0.125,
+        memory_fraction: float = 0.8,
+        roi_divisor: int = 16,
+        **kwargs,
+    ):
+        """
+        :param max_batch_size: upper limit for sw_batch_size
+        :param min_overlap: minimum overlap between windows
+        :param memory_fraction: fraction of free memory which can be used for inference
+        :param roi_divisor: roi (when clamped to input size) is kept as multiple of this value
+        :param kwargs: args for :py:class:`HeuristicPlanner` (target_spacing, spatial_size, max_samples)
+        """
+        super().__init__(**kwargs)
+        self.max_batch_size = max_batch_size
+        self.min_overlap = min_overlap
+        self.memory_fraction = memory_fraction
+        self.roi_divisor = roi_divisor
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Any, threading.Lock] = {}
+        self._measurements: Dict[Any, Dict[str, Any]] = {}
+
+    def plan(
+        self,
+        key,
+        network,
+        input_shape: Sequence[int],
+        roi_size: Optional[Sequence[int]],
+        device: str,
+        overlap: float = 0.25,
+    ) -> Dict[str, Any]:
+        """
+        :param key: unique key for the model (measurements are cached against this key)
+        :param network: network to measure memory needed per window
+        :param input_shape: shape of (non batched) input i.e. channel first
+        :param roi_size: max roi size supported for the model (None to use planned spatial size)
+        :param device: device where network runs
+        :param overlap: max overlap between windows
+        :return: plan (dict) which can be used to create SlidingWindowInferer
+        """
+        spatial = [int(s) for s in input_shape[1:]]
+        roi = self._roi(spatial, roi_size if roi_size else self.spatial_size)
+        overlaps = [self._overlap(s, r, overlap) for s, r in zip(spatial, roi)]
+        windows = math.prod(_num_windows(s, r, o) for s, r, o in zip(spatial, roi, overlaps))
+
+        m = self.measure(key, network, input_shape[0], roi, device)
+        free = self.memory_fraction * free_memory(device)
+        host_free = self.memory_fraction * free_memory("cpu")
+
+        # output aggregation (output + count map)
+        aggregation = (m["out_channels"] + 1) * math.prod(spatial) * m["out_itemsize"]
+
+        aggregate_device = device
+        budget = free - aggregation
+        if device.startswith("cuda") and budget < m["window"]:
+            aggregate_device = "cpu"
+            budget = free
+            if aggregation > host_free:
+                logger.warning(f"Output aggregation ({aggregation >> 20} MB) may not fit in host memory")
+
+        sw_batch_size = int(budget // m["window"]) if m["window"] > 0 else self.max_batch_size
+        sw_batch_size = max(1, min(sw_batch_size, self.max_batch_size, windows))
+
+        return {
+            "roi_size": roi,
+            "overlap": overlaps,
+            "sw_batch_size": sw_batch_size,
+            "sw_device": device,
+            "device": aggregate_device,
+            "windows": windows,
+            "window_mb": round(m["window"] / (1024 * 1024), 2),
+            "free_mb": round(free / (1024 * 1024), 2),
+        }
+
+    def measure(self, key, network, in_channels: int, roi_size: Sequence[int], device: str) -> Dict[str, Any]:
+        """
+        Measure (peak) memory needed to run one window through the network; result is cached per model/roi/device.
+
+        On cuda, peak allocated memory during the forward pass is used (if it raised the process wide peak; peak stats
+        are never reset as they are shared with other requests).  Otherwise (cpu, where RSS does not reflect memory
+        reused by the allocator) sum of all activations (outputs of leaf modules) is used as a conservative estimate.
+        """
+        cache_key = (key, int(in_channels), tuple(roi_size), device)
+        with self._lock:
+            m = self._measurements.get(cache_key)
+            if m is not None:
+                return m
+            lock = self._key_locks.setdefault(cache_key, threading.Lock())
+
+        # measure once per model/roi/device; other models are not blocked
+        with lock:
+            with self._lock:
+                m = self._measurements.get(cache_key)
+            if m is not None:
+                return m
+
+            x = torch.zeros((1, int(in_channels), *roi_size), device=torch.device(device))
+            window = 0
+            if device.startswith("cuda"):
+                torch.cuda.synchronize(device)
+                base = torch.cuda.memory_allocated(device)
+                prev_peak = torch.cuda.max_memory_allocated(device)
+                y, activations = _forward_with_activations(network, x)
+                torch.cuda.synchronize(device)
+                peak = torch.cuda.max_memory_allocated(device)
+                if peak > prev_peak:
+                    window = peak - base
+            else:
+                y, activations = _forward_with_activations(network, x)
+            window = max(window, x.numel() * x.element_size() + activations)
+
+            y = y[0] if isinstance(y, (list, tuple)) else next(iter(y.values())) if isinstance(y, dict) else y
+            m = {"window": int(window), "out_channels": int(y.shape[1]), "out_itemsize": y.element_size()}
+            with self._lock:
+                self._measurements[cache_key] = m
+                self._key_locks.pop(cache_key, None)
+            logger.info(f"Measured memory per window for {cache_key}: {m}")
+            return m
+
+    def clear(self, key=None):
+        """
+        Clear cached measurements (all or only for given model key or its owner i.e. key[0])
+        """
+        with self._lock:
+            for k in list(self._measurements):
+                if key is None or k[0] == key or (isinstance(k[0], tuple) and k[0][0] == key):
+                    self._measurements.pop(k)
+
+    def _roi(self, spatial, roi_size):
+        roi = []
+        for s, r in zip(spatial, roi_size):
+            # clamp roi to input size (rounded up to multiple of roi_divisor)
+            c = int(math.ceil(s / self.roi_divisor) * self.roi_divisor)
+            roi.append(int(min(r, c)))
+        return roi
+
+    def _overlap(self, size, roi, overlap):
+        # Use max overlap (<= given overlap) that does not increase number of windows compared to min overlap
+        k = _num_windows(size, roi, self.min_overlap)
+        if k <= 1:
+            return 0.0
+        max_overlap = 1.0 - math.ceil((size - roi) / (k - 1)) / roi
+        return math.floor(max(self.min_overlap, min(overlap, max_overlap)) * 1e4) / 1e4
+
+
+def _tensor_bytes(v) -> int:
+    if isinstance(v, torch.Tensor):
+        return v.numel() * v.element_size()
+    if isinstance(v, (list, tuple)):
+        return sum(_tensor_bytes(x) for x in v)
+    if isinstance(v, dict):
+        return sum(_tensor_bytes(x) for x in v.values())
+    return 0
+
+
+def _forward_with_activations(network, x, opaque_factor: int = 16):
+    """
+    Run forward pass (no grad) and return output and total size (bytes) of outputs of all leaf modules.
+    For opaque networks (e.g. onnx/torchscript) activations can't be observed; `opaque_factor` x output size is used
+    """
+    total = [0, 0]
+
+    def hook(module, inputs, outputs):
+        total[0] += _tensor_bytes(outputs)
+        total[1] += 1
+
+    handles = []
+    if isinstance(network, torch.nn.Module):
+        for m in network.modules():
+            if m is not network and not next(m.children(), None):
+                try:
+                    handles.append(m.register_forward_hook(hook))
+                except Exception:
+                    pass  # e.g. script modules
+    try:
+        with torch.no_grad():
+            y = network(x)
+    finally:
+        for h in handles:
+            h.remove()
+
+    out = _tensor_bytes(y)
+    return y, total[0] if total[1] else opaque_factor * (out + _tensor_bytes(x))
+
+
+def _num_windows(size, roi, overlap):
+    if size <= roi:
+        return 1
+    interval = max(1, int(roi * (1 - overlap)))
+    return int(math.ceil((size - roi) / interval)) + 1
+
+
+def free_memory(device: Optional[str]) -> int:
+    """
+    Free memory (in bytes) for the given device; memory cached (but not used) by torch allocator is considered free
+    """
+    if device and device.startswith("cuda") and torch.cuda.is_available():
+        free, _ = torch.cuda.mem_get_info(device)
+        return int(free + torch.cuda.memory_reserved(device) - torch.cuda.memory_allocated(device))
+    return int(psutil.virtual_memory().available)
+
+
+def total_memory(device: Optional[str]) -> int:
+    """
+    Total memory (in bytes) for the given device
+    """
+    if device and device.startswith("cuda") and torch.cuda.is_available():
+        _, total = torch.cuda.mem_get_info(device)
+        return int(total)
+    return int(psutil.virtual_memory().total)
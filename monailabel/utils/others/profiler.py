@@ -0,0 +1,309 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import json
+import logging
+import os
+import pathlib
+import random
+import re
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import torch
+
+from monailabel.config import settings
+from monailabel.utils.others.generic import remove_file, strtobool
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """
+    Samples python stack of a thread at fixed interval; result is in collapsed format (flamegraph.pl/speedscope)
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.01, max_depth: int = 64):
+        self.thread_id = thread_id
+        self.interval = max(interval, 0.001)
+        self.max_depth = max_depth
+
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> List[str]:
+        return [f"{k} {v}" for k, v in self.samples.most_common()]
+
+
+class ProfileCapture:
+    """
+    Captures torch.profiler trace (CPU and CUDA if available) + sampled python stacks for a block of code.
+
+    Artifacts are saved into `<path>/<id>/`:
+        - trace.json: chrome trace (chrome://tracing, perfetto)
+        - stacks.txt: sampled python stacks (collapsed format)
+        - summary.txt: top ops by self time
+        - info.json: name, request info and duration
+    """
+
+    def __init__(self, path: str, name: str, info: Optional[Dict[str, Any]] = None, stack_interval: float = 0.01):
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.id = f"{ts}_{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}"
+        self.path = os.path.join(path, self.id)
+        self.name = name
+        self.info = info if info else {}
+        self.stack_interval = stack_interval
+
+        self.start_ts = 0.0
+        self.end_ts = 0.0
+        self._profiler: Optional[Any] = None
+        self._sampler: Optional[StackSampler] = None
+
+    def start(self):
+        activities = [torch.profiler.ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(torch.profiler.ProfilerActivity.CUDA)
+
+        self._profiler = torch.profiler.profile(activities=activities, record_shapes=False, with_stack=False)
+        self._profiler.__enter__()
+        if self.stack_interval > 0:
+            self._sampler = StackSampler(threading.get_ident(), self.stack_interval)
+            self._sampler.start()
+        self.start_ts = time.time()
+
+    def stop(self) -> Dict[str, Any]:
+        self.end_ts = time.time()
+        if self._sampler:
+            self._sampler.stop()
+        if self._profiler is None:
+            return {}
+
+        self._profiler.__exit__(None, None, None)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            self._profiler.export_chrome_trace(os.path.join(self.path, "trace.json"))
+
+            sort_by = "self_cuda_time_total" if torch.cuda.is_available() else "self_cpu_time_total"
+            with open(os.path.join(self.path, "summary.txt"), "w") as fc:
+                fc.write(self._profiler.key_averages().table(sort_by=sort_by, row_limit=50))
+            if self._sampler:
+                with open(os.path.join(self.path, "stacks.txt"), "w") as fc:
+                    fc.write("\n".join(self._sampler.collapsed()))
+
+            info = self.summary()
+            with open(os.path.join(self.path, "info.json"), "w") as fc:
+                json.dump({**info, "info": self.info}, fc, indent=2, default=str)
+            logger.info(f"Profile for {self.name} saved at: {self.path}")
+            return info
+        finally:
+            self._profiler = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "start_ts": int(self.start_ts),
+            "duration": round(self.end_ts - self.start_ts, 4),
+            "stack_samples": sum(self._sampler.samples.values()) if self._sampler else 0,
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class Profiler:
+    """
+    Decides which requests are profiled and keeps the captured artifacts.
+
+    A request is profiled if it asks for it (`profile: true`), if admin has armed profiling for the next N requests
+    of the model, or if it is randomly sampled (sample_rate); but never more than one capture at a time and one
+    capture per min_interval seconds, so that it can stay enabled on live servers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: float = 0.0,
+        min_interval: float = 60.0,
+        max_files: int = 20,
+        stack_interval: float = 0.01,
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.min_interval = min_interval
+        self.max_files = max_files
+        self.stack_interval = stack_interval
+
+        self._lock = threading.Lock()
+        self._active: Optional[ProfileCapture] = None
+        self._last_ts = 0.0
+        self._armed: Dict[str, int] = {}
+
+    def arm(self, name: str, count: int = 1):
+        with self._lock:
+            if count > 0:
+                self._armed[name] = count
+            else:
+                self._armed.pop(name, None)
+            return dict(self._armed)
+
+    def armed(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._armed)
+
+    def active(self) -> bool:
+        with self._lock:
+            return self._active is not None
+
+    def capture(self, name: str, model: str, request: Dict[str, Any]) -> Optional[ProfileCapture]:
+        """
+        New (not started) capture if the request should be profiled; caller must run it as context manager
+        """
+        requested = strtobool(request.get("profile", False))
+        with self._lock:
+            armed = self._armed.get(model, 0) > 0
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+            if not (requested or armed or sampled):
+                return None
+
+            if self._active is not None or time.time() - self._last_ts < self.min_interval:
+                logger.info(f"Skip profiling {name}; another capture is running or done recently")
+                return None
+
+            if armed:
+                self._armed[model] -= 1
+                if self._armed[model] <= 0:
+                    self._armed.pop(model)
+
+            info = {k: v for k, v in request.items() if isinstance(v, (str, int, float, bool))}
+            self._active = _ManagedCapture(self, self.path, name, info, self.stack_interval)
+            self._last_ts = time.time()
+            return self._active
+
+    def _release(self, capture):
+        with self._lock:
+            if self._active is capture:
+                self._active = None
+                self._last_ts = time.time()
+        self._cleanup()
+
+    def list(self) -> List[Dict[str, Any]]:
+        result = []
+        for info_file in sorted(pathlib.Path(self.path).glob("*/info.json"), reverse=True):
+            try:
+                with open(info_file) as fc:
+                    result.append(json.load(fc))
+            except (OSError, ValueError):
+                continue
+        return result
+
+    def get(self, profile_id: str) -> Optional[str]:
+        path = os.path.join(self.path, os.path.basename(profile_id))
+        return path if profile_id and os.path.isdir(path) else None
+
+    def remove(self, profile_id: str) -> bool:
+        path = self.get(profile_id)
+        if path:
+            remove_file(path)
+        return path is not None
+
+    def _cleanup(self):
+        if self.max_files <= 0 or not os.path.isdir(self.path):
+            return
+        dirs = sorted(p for p in pathlib.Path(self.path).iterdir() if p.is_dir())
+        for p in dirs[: max(0, len(dirs) - self.max_files)]:
+            shutil.rmtree(p, ignore_errors=True)
+
+
+class _ManagedCapture(ProfileCapture):
+    def __init__(self, manager: Profiler, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._manager = manager
+
+    def stop(self) -> Dict[str, Any]:
+        try:
+            return super().stop()
+        finally:
+            self._manager._release(self)
+
+
+def profile_infer(func):
+    """
+    Decorator for infer task `__call__(request, ...)`; profiles the request if selected by the profiler
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, request, *args, **kwargs):
+        model = request.get("model") or self.__class__.__name__
+        capture = profiler().capture(f"infer_{model}", model, request)
+        if capture is None:
+            return func(self, request, *args, **kwargs)
+
+        with capture:
+            result_file, result_json = func(self, request, *args, **kwargs)
+        if isinstance(result_json, dict):
+            result_json["profile"] = capture.summary()
+        return result_file, result_json
+
+    return wrapper
+
+
+_profiler: Optional[Profiler] = None
+_profiler_lock = threading.Lock()
+
+
+def profiler() -> Profiler:
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            path = settings.MONAI_LABEL_PROFILE_PATH
+            path = path if path else os.path.join(pathlib.Path.home(), ".cache", "monailabel", "profiles")
+            _profiler = Profiler(
+                path=path,
+                sample_rate=settings.MONAI_LABEL_PROFILE_SAMPLE_RATE,
+                min_interval=settings.MONAI_LABEL_PROFILE_MIN_INTERVAL,
+                max_files=settings.MONAI_LABEL_PROFILE_MAX_FILES,
+                stack_interval=settings.MONAI_LABEL_PROFILE_STACK_INTERVAL,
+            )
+        return _profiler
@@ -0,0 +1,304 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from monailabel.config import settings
+from monailabel.utils.others.generic import file_ext, md5_digest, remove_file
+
+logger = logging.getLogger(__name__)
+
+# Request fields which do not change the result (or are replaced by content based keys)
+VOLATILE_KEYS = {
+    "image",
+    "device",
+    "logging",
+    "timeout",
+    "save_label",
+    "label_tag",
+    "description",
+    "session",
+    "session_id",
+    "client_id",
+    "result_cache",
+    "result_write_to_file",
+    "progress_id",
+    "admission",
+    "read_ahead",
+    "tile_batch",
+    "_prepared",
+}
+
+
+# Request fields of a wsi tile which do not change the result of the tile
+TILE_VOLATILE_KEYS = VOLATILE_KEYS | {
+    "id",
+    "output",
+    "compress",
+    "max_workers",
+    "multi_gpu",
+    "gpus",
+    "tile_cache",
+    "tile_align",
+    "tile_batch_size",
+    "tissue_threshold",
+    "coarse_level",
+    "coarse_model",
+    "coarse_margin",
+    "ignore_small_patches",
+    "ignore_non_click_patches",
+}
+
+
+class ResultCache:
+    """
+    Disk based cache of inference results (label file + result json).
+
+    Results are keyed by model version (checkpoint checksum), image content checksum and normalized request params.
+    Least recently used results are removed when total size goes beyond max_size (MB); results of previous
+    versions of a model are removed as soon as a result for a new version is stored.
+    """
+
+    def __init__(self, path: str, max_size: int = 1024):
+        self.path = path
+        self.max_size = max_size
+
+        self._lock = threading.RLock()
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._stats = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+
+    def key(self, model: str, version: str, image: str, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Cache key for the request; None if request can't be cached (e.g. params which are not json serializable)
+        """
+        params = {k: v for k, v in request.items() if k not in VOLATILE_KEYS}
+        try:
+            params_str = json.dumps(params, sort_keys=True)
+        except (TypeError, ValueError):
+            logger.debug("Result cache ignored; request params are not json serializable")
+            return None
+        return md5_digest(f"{model}|{version}|{image}|{params_str}")
+
+    def tile_key(self, model: str, version: str, slide: str, tile: Dict[str, Any]) -> Optional[str]:
+        """
+        Cache key for a wsi tile: slide fingerprint, model version, level, tile origin/size and params affecting result
+        """
+        return self.key(model, version, slide, {k: v for k, v in tile.items() if k not in TILE_VOLATILE_KEYS})
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], Dict[str, Any]]]:
+        """
+        Cached result for the key: copy of label file (caller owns it; cached file is never shared) and result json
+        """
+        with self._lock:
+            entry = self._entries().get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            entry_dir = os.path.join(self.path, key)
+            try:
+                with open(os.path.join(entry_dir, "result.json")) as fc:
+                    result_json = json.load(fc)
+
+                label = entry.get("label")
+                result_file = None
+                if label:
+                    result_file = tempfile.NamedTemporaryFile(suffix=file_ext(label)).name
+                    shutil.copyfile(os.path.join(entry_dir, label), result_file)
+            except OSError as e:
+                logger.warning(f"Failed to read cached result {key}: {e}")
+                self._remove(key)
+                self._stats["misses"] += 1
+                return None
+
+            entry["atime"] = time.time()
+            self._stats["hits"] += 1
+            return result_file, result_json
+
+    def put(self, key: str, model: str, version: str, result_file: Optional[str], result_json: Dict[str, Any]):
+        if result_file is not None and (not isinstance(result_file, str) or not os.path.isfile(result_file)):
+            return
+
+        with self._lock:
+            entries = self._entries()
+            entry_dir = os.path.join(self.path, key)
+            tmp_dir = f"{entry_dir}.tmp"
+            try:
+                remove_file(tmp_dir)
+                os.makedirs(tmp_dir)
+
+                label = f"label{file_ext(result_file)}" if result_file else None
+                if label:
+                    shutil.copyfile(result_file, os.path.join(tmp_dir, label))
+                with open(os.path.join(tmp_dir, "result.json"), "w") as fc:
+                    json.dump(result_json, fc)
+
+                entry = {"model": model, "version": version, "label": label, "atime": time.time()}
+                entry["size"] = sum(f.stat().st_size for f in pathlib.Path(tmp_dir).iterdir())
+                with open(os.path.join(tmp_dir, "entry.json"), "w") as fc:
+                    json.dump(entry, fc)
+
+                remove_file(entry_dir)
+                os.replace(tmp_dir, entry_dir)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Failed to cache result {key}: {e}")
+                remove_file(tmp_dir)
+                return
+
+            entries[key] = entry
+            self._stats["puts"] += 1
+
+            # model is re-published; results of previous versions are not valid anymore
+            for k in [k for k, e in entries.items() if e["model"] == model and e["version"] != version]:
+                self._remove(k)
+            self._evict(keep=key)
+
+    def clear(self, model: Optional[str] = None):
+        with self._lock:
+            keys = [k for k, e in self._entries().items() if model is None or e["model"] == model]
+            for k in keys:
+                self._remove(k)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._entries()
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(entries)
+            stats["size"] = round(sum(e["size"] for e in entries.values()) / (1024 * 1024), 2)
+            stats["max_size"] = self.max_size
+            return stats
+
+    def _entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            self._index = {}
+            os.makedirs(self.path, exist_ok=True)
+            for entry_file in pathlib.Path(self.path).glob("*/entry.json"):
+                try:
+                    with open(entry_file) as fc:
+                        self._index[entry_file.parent.name] = json.load(fc)
+                except (OSError, ValueError):
+                    remove_file(str(entry_file.parent))
+            logger.info(f"Result cache: {self.path}; entries: {len(self._index)}")
+        return self._index
+
+    def _remove(self, key):
+        self._entries().pop(key, None)
+        remove_file(os.path.join(self.path, key))
+
+    def _evict(self, keep):
+        if self.max_size <= 0:
+            return
+
+        entries = self._entries()
+        max_bytes = self.max_size * 1024 * 1024
+        while sum(e["size"] for e in entries.values()) > max_bytes:
+            key = min((k for k in entries if k != keep), key=lambda k: entries[k]["atime"], default=None)
+            if key is None:
+                break
+            self._remove(key)
+            self._stats["evictions"] += 1
+
+
+MAX_DIGESTS = 4096
+_digests: "OrderedDict[str, Tuple[float, int, str]]" = OrderedDict()
+_digests_lock = threading.Lock()
+
+
+def content_digest(path: str) -> str:
+    """
+    Checksum of file (or directory e.g. DICOM series) content: size and a few sampled chunks (incl. head and tail);
+    the file is never read in full on the request path.  Memoized (LRU; up to MAX_DIGESTS) on modification time and size
+    """
+    stat = os.stat(path)
+    with _digests_lock:
+        cached = _digests.get(path)
+        if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+            _digests.move_to_end(path)
+            return cached[2]
+
+    if os.path.isdir(path):
+        files = sorted(p for p in pathlib.Path(path).rglob("*") if p.is_file())
+        digest = md5_digest("".join(_sampled_digest(str(f)) for f in files))
+    else:
+        digest = _sampled_digest(path)
+
+    with _digests_lock:
+        _digests[path] = (stat.st_mtime, stat.st_size, digest)
+        _digests.move_to_end(path)
+        while len(_digests) > MAX_DIGESTS:
+            _digests.popitem(last=False)
+    return digest
+
+
+def slide_fingerprint(path: str, chunk: int = 64 * 1024, samples: int = 16) -> str:
+    """
+    Cheap identity of a (large) slide: path, size, modification time and a few sampled chunks (incl. head which has the
+    header and tail); the slide is never read in full
+    """
+    if os.path.isdir(path):
+        files = sorted(p for p in pathlib.Path(path).rglob("*") if p.is_file())
+        return md5_digest("".join(slide_fingerprint(str(f), chunk, samples) for f in files))
+
+    stat = os.stat(path)
+    return _sampled_digest(path, chunk, samples, f"{os.path.realpath(path)}|{stat.st_mtime_ns}")
+
+
+def _sampled_digest(path: str, chunk: int = 64 * 1024, samples: int = 16, prefix: str = "") -> str:
+    size = os.path.getsize(path)
+    digest = hashlib.md5(f"{prefix}|{size}".encode("utf-8"))
+    step = max(chunk, size // max(1, samples))
+    offsets = sorted({*range(0, size, step), max(0, size - chunk)})
+    with open(path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            digest.update(f.read(chunk))
+    return digest.hexdigest()
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def result_cache() -> ResultCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            path = settings.MONAI_LABEL_INFER_RESULT_CACHE_PATH
+            path = path if path else os.path.join(pathlib.Path.home(), ".cache", "monailabel", "results")
+            _cache = ResultCache(path=path, max_size=settings.MONAI_LABEL_INFER_RESULT_CACHE_SIZE)
+        return _cache
+
+
+_tile_cache: Optional[ResultCache] = None
+
+
+def tile_cache() -> ResultCache:
+    """
+    Cache of compact (contours) results of wsi tiles; results of a tile are reused by overlapping wsi requests
+    """
+    global _tile_cache
+    with _cache_lock:
+        if _tile_cache is None:
+            path = settings.MONAI_LABEL_WSI_TILE_CACHE_PATH
+            path = path if path else os.path.join(pathlib.Path.home(), ".cache", "monailabel", "tiles")
+            _tile_cache = ResultCache(path=path, max_size=settings.MONAI_LABEL_WSI_TILE_CACHE_SIZE)
+        return _tile_cache
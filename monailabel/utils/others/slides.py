@@ -0,0 +1,366 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import ctypes.util
+import logging
+import os
+import platform
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from ctypes import cdll
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from monai.utils import optional_import
+
+from monailabel.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _openslide():
+    if platform.system() == "Windows":
+        cdll.LoadLibrary(str(ctypes.util.find_library("libopenslide-0.dll")))
+
+    openslide, has_openslide = optional_import("openslide")
+    if not has_openslide:
+        raise ImportError("Unable to find openslide, please ensure openslide library packages are correctly installed")
+    return openslide
+
+
+def region_key(path: str, location, level, size) -> Tuple:
+    return path, tuple(int(v) for v in location), int(level), tuple(int(v) for v in size)
+
+
+class _Handle:
+    def __init__(self, path: str, slide: Any, stat: Tuple[float, int]):
+        self.path = path
+        self.slide = slide
+        self.stat = stat
+        self.refs = 0
+        self.evicted = False
+
+
+class SlidePool:
+    """
+    Process wide pool of open (OpenSlide) slide handles keyed by path.
+
+    Opening a large slide is expensive and every handle keeps its own tile cache; so handles are shared by all
+    requests/threads (OpenSlide objects are thread safe) and least recently used ones are closed when more than
+    `max_open` slides are open. A handle is re-opened if the file is modified.
+
+    Regions can also be read ahead (`prefetch`) in background; `read_region` returns prefetched result if available.
+    """
+
+    def __init__(self, max_open: int = 16, max_prefetched: int = 32, prefetch_workers: int = 2, opener=None):
+        self.max_open = max_open
+        self.max_prefetched = max_prefetched
+        self.prefetch_workers = prefetch_workers
+        self.opener = opener
+
+        self._lock = threading.Lock()
+        self._handles: "OrderedDict[str, _Handle]" = OrderedDict()
+        self._prefetched: "OrderedDict[Tuple, Future]" = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"opened": 0, "reused": 0, "prefetched": 0, "prefetch_hits": 0}
+
+    def _open_slide(self, path):
+        return self.opener(path) if self.opener else _openslide().OpenSlide(path)
+
+    @staticmethod
+    def _stat(path) -> Tuple[float, int]:
+        s = os.stat(path)
+        return s.st_mtime, s.st_size
+
+    def _acquire(self, path: str) -> _Handle:
+        stat = self._stat(path)
+        with self._lock:
+            h = self._handles.get(path)
+            if h is not None and h.stat == stat:
+                h.refs += 1
+                self._handles.move_to_end(path)
+                self._stats["reused"] += 1
+                return h
+            if h is not None:
+                self._evict(h)
+
+        # open outside the lock; in case of race the handle opened first wins
+        slide = self._open_slide(path)
+        with self._lock:
+            self._stats["opened"] += 1
+            h = self._handles.get(path)
+            if h is not None and h.stat == stat:
+                slide.close()
+            else:
+                h = _Handle(path, slide, stat)
+                if self.max_open > 0:
+                    self._handles[path] = h
+                else:
+                    h.evicted = True
+            h.refs += 1
+
+            while len(self._handles) > self.max_open:
+                self._evict(next(iter(self._handles.values())))
+            return h
+
+    def _evict(self, h: _Handle):
+        # must be called with lock; handle in use is closed when released
+        if self._handles.get(h.path) is h:
+            self._handles.pop(h.path)
+        h.evicted = True
+        if h.refs == 0:
+            h.slide.close()
+
+    def _release(self, h: _Handle):
+        with self._lock:
+            h.refs -= 1
+            if h.evicted and h.refs == 0:
+                h.slide.close()
+
+    @contextlib.contextmanager
+    def open(self, path: str):
+        h = self._acquire(path)
+        try:
+            yield h.slide
+        finally:
+            self._release(h)
+
+    def dimensions(self, path: str) -> Tuple[int, int]:
+        with self.open(path) as slide:
+            return slide.dimensions
+
+    def level_downsamples(self, path: str) -> Tuple[float, ...]:
+        with self.open(path) as slide:
+            return tuple(float(d) for d in getattr(slide, "level_downsamples", (1.0,)))
+
+    def _read(self, path, location, level, size):
+        with self.open(path) as slide:
+            size = size if size else slide.dimensions
+            return slide.read_region(tuple(location), level, tuple(size))
+
+    def read_region(self, path: str, location=(0, 0), level: int = 0, size: Optional[Sequence[int]] = None):
+        """
+        Read region (PIL RGBA image) from the slide; same as `OpenSlide.read_region` but uses shared handle
+        """
+        if size:
+            with self._lock:
+                f = self._prefetched.pop(region_key(path, location, level, size), None)
+                if f is not None:
+                    self._stats["prefetch_hits"] += 1
+            if f is not None:
+                f.consumed = True  # type: ignore
+                try:
+                    return f.result()
+                except Exception as e:
+                    logger.debug(f"Prefetch failed for {path}: {e}; read again")
+        return self._read(path, location, level, size)
+
+    def prefetch(self, path: str, location, level: int, size: Sequence[int]) -> Optional[Future]:
+        """
+        Read the region in background; oldest prefetched (but not consumed) regions are dropped beyond max_prefetched
+        """
+        key = region_key(path, location, level, size)
+        with self._lock:
+            if key in self._prefetched or self.max_prefetched <= 0:
+                return self._prefetched.get(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.prefetch_workers, "SlidePrefetch")
+
+            f = self._executor.submit(self._read, path, key[1], key[2], key[3])
+            f.consumed = False  # type: ignore
+            self._prefetched[key] = f
+            self._stats["prefetched"] += 1
+            while len(self._prefetched) > self.max_prefetched:
+                _, old = self._prefetched.popitem(last=False)
+                old.cancel()
+            return f
+
+    def discard(self, keys: Sequence[Tuple]):
+        with self._lock:
+            for key in keys:
+                f = self._prefetched.pop(key, None)
+                if f is not None:
+                    f.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "open": len(self._handles), "pending": len(self._prefetched)}
+
+    def clear(self):
+        with self._lock:
+            for f in self._prefetched.values():
+                f.cancel()
+            self._prefetched.clear()
+            for h in list(self._handles.values()):
+                self._evict(h)
+
+
+class TileReadAhead:
+    """
+    Reads next `depth` tiles of a wsi infer request ahead (in background) while model runs on the current tile.
+
+    Read ahead is stopped if prefetched tiles are not consumed (i.e. model does not read tiles through `SlidePool`).
+    """
+
+    def __init__(self, tasks: List[Dict[str, Any]], depth: int = 4, pool: Optional[SlidePool] = None):
+        self.pool = pool if pool else slide_pool()
+        self.depth = depth
+        self.regions = [
+            region_key(t["image"], t["location"], t.get("level", 0), t["size"]) if t.get("size") else None
+            for t in tasks
+        ]
+
+        self._lock = threading.Lock()
+        self._next = 0
+        self._futures: List[Future] = []
+        self._enabled = depth > 0
+
+    def advance(self, idx: int):
+        """
+        Tile `idx` is about to be processed; make sure the next tiles are being read
+        """
+        with self._lock:
+            if not self._enabled:
+                return
+            if len(self._futures) >= 2 * self.depth and not any(getattr(f, "consumed", False) for f in self._futures):
+                logger.info("Tile read ahead disabled; prefetched tiles are not used by the infer task")
+                self._enabled = False
+                self.pool.discard([r for r in self.regions if r])
+                return
+
+            end = min(len(self.regions), idx + 1 + self.depth)
+            for i in range(max(self._next, idx + 1), end):
+                if self.regions[i]:
+                    f = self.pool.prefetch(*self.regions[i])
+                    if f is not None:
+                        self._futures.append(f)
+            self._next = max(self._next, end)
+
+    def start(self):
+        self.advance(-1)
+        return self
+
+    def close(self):
+        with self._lock:
+            self._enabled = False
+        self.pool.discard([r for r in self.regions if r])
+
+
+def otsu_threshold(values: np.ndarray) -> int:
+    """
+    Otsu threshold of uint8 values; values > threshold are foreground
+    """
+    hist = np.bincount(values.ravel(), minlength=256).astype(np.float64)
+    w0 = np.cumsum(hist)
+    w1 = w0[-1] - w0
+    mu = np.cumsum(hist * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mu[-1] * w0 / max(w0[-1], 1) - mu) ** 2 / (w0 * w1)
+    return int(np.argmax(np.nan_to_num(between, nan=0.0, posinf=0.0)))
+
+
+class TissueMask:
+    """
+    Low resolution tissue mask of a slide; `scale` is number of (level 0) pixels per mask pixel in (x, y)
+    """
+
+    def __init__(self, mask: np.ndarray, scale: Tuple[float, float]):
+        self.mask = mask
+        self.scale = scale
+
+    def fraction(self, location, size) -> float:
+        """
+        Fraction of tissue pixels in the (level 0) region
+        """
+        sx, sy = self.scale
+        h, w = self.mask.shape
+        x0, y0 = int(location[0] / sx), int(location[1] / sy)
+        x1, y1 = int(np.ceil((location[0] + size[0]) / sx)), int(np.ceil((location[1] + size[1]) / sy))
+        region = self.mask[max(0, y0) : min(h, max(y1, y0 + 1)), max(0, x0) : min(w, max(x1, x0 + 1))]
+        return float(region.mean()) if region.size else 0.0
+
+    @property
+    def tissue(self) -> float:
+        return float(self.mask.mean()) if self.mask.size else 0.0
+
+
+def detect_tissue(slide, max_size: int = 2048, min_saturation: int = 20) -> TissueMask:
+    """
+    Tissue mask using Otsu threshold on saturation of a low resolution thumbnail (glass/background is unsaturated)
+    """
+    w, h = slide.dimensions
+    thumbnail = slide.get_thumbnail((max_size, max_size)).convert("RGB")
+    saturation = np.asarray(thumbnail.convert("HSV"))[..., 1]
+
+    threshold = max(otsu_threshold(saturation), min_saturation)
+    mask = saturation > threshold
+    return TissueMask(mask, (w / mask.shape[1], h / mask.shape[0]))
+
+
+class TissueDetector:
+    """
+    Computes tissue mask once per slide (cached by path and modified time)
+    """
+
+    def __init__(self, pool: Optional[SlidePool] = None, max_size: int = 2048, max_cached: int = 32):
+        self.pool = pool
+        self.max_size = max_size
+        self.max_cached = max_cached
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple, TissueMask]" = OrderedDict()
+
+    def detect(self, path: str) -> TissueMask:
+        pool = self.pool if self.pool else slide_pool()
+        key = (path, *SlidePool._stat(path))
+        with self._lock:
+            m = self._cache.get(key)
+            if m is not None:
+                self._cache.move_to_end(key)
+                return m
+
+        with pool.open(path) as slide:
+            m = detect_tissue(slide, self.max_size)
+        logger.info(f"Tissue mask for {path}: {m.mask.shape}; tissue: {m.tissue:.2%}")
+
+        with self._lock:
+            self._cache[key] = m
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return m
+
+
+_pool: Optional[SlidePool] = None
+_pool_lock = threading.Lock()
+
+
+def slide_pool() -> SlidePool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SlidePool(
+                max_open=settings.MONAI_LABEL_WSI_SLIDE_POOL_SIZE,
+                max_prefetched=max(8, 4 * settings.MONAI_LABEL_WSI_READ_AHEAD),
+            )
+        return _pool
+
+
+_tissue_detector: Optional[TissueDetector] = None
+
+
+def tissue_detector() -> TissueDetector:
+    global _tissue_detector
+    with _pool_lock:
+        if _tissue_detector is None:
+            _tissue_detector = TissueDetector()
+        return _tissue_detector
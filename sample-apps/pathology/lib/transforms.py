@@ -13,7 +13,6 @@ import logging
 import pathlib
 
 import numpy as np
-import openslide
 import torch
 from monai.config import KeysCollection
 from monai.data import MetaTensor
@@ -23,6 +22,8 @@ from PIL import Image
 from scipy.ndimage import binary_fill_holes
 from skimage.morphology import remove_small_holes, remove_small_objects
 
+from monailabel.utils.others.slides import slide_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,9 +66,9 @@ class LoadImagePatchd(MapTransform):
                         ".vms",
                         ".vmu",
                     ):
-                        slide = openslide.OpenSlide(name)
-                        size = size if size else slide.dimensions
-                        img = slide.read_region(location, level, size)
+                        # shared slide handle (and tiles read ahead) from pool
+                        size = size if size else slide_pool().dimensions(name)
+                        img = slide_pool().read_region(name, location, level, size)
                     else:
                         img = Image.open(d[key])
                         d["location"] = [0, 0]
@@ -57,6 +57,7 @@ class LocalizationVertebra(BasicInferTask):
             dimension=dimension,
             description=description,
             load_strict=False,
+            release_input=False,  # writer returns the input (pipeline mode)
             **kwargs,
         )
         self.target_spacing = target_spacing
@@ -34,6 +34,7 @@ from monai.transforms import (
 
 from monailabel.interfaces.tasks.infer_v2 import InferType
 from monailabel.tasks.infer.basic_infer import BasicInferTask
+from monailabel.transform.cache import SessionCacheDatad
 from monailabel.transform.post import Restored
 
 logger = logging.getLogger(__name__)
@@ -88,6 +89,8 @@ class DeepEdit(BasicInferTask):
         if self.type == InferType.DEEPEDIT:
             t.extend(
                 [
+                    # follow-up clicks of the same session re-use loaded/oriented/scaled image
+                    SessionCacheDatad(keys="image"),
                     AddGuidanceFromPointsDeepEditd(ref_image="image", guidance="guidance", label_names=self.labels),
                     Resized(keys="image", spatial_size=self.spatial_size, mode="area"),
                     ResizeGuidanceMultipleLabelDeepEditd(guidance="guidance", ref_image="image"),
@@ -0,0 +1,166 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import socket
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+
+import numpy as np
+import uvicorn
+
+from monailabel.client.loadtest import LoadTest, parse_mix, percentile
+from monailabel.config import settings
+from monailabel.transform.writer import write_itk
+from monailabel.utils.others.benchmark import synthetic_volume
+
+# Minimal MONAI Label app with a dummy (cpu) model
+DUMMY_APP = textwrap.dedent(
+    """
+    import torch
+    from monai.transforms import EnsureChannelFirstd, LoadImaged, SqueezeDimd, ToNumpyd
+
+    from monailabel.interfaces.app import MONAILabelApp
+    from monailabel.interfaces.tasks.infer_v2 import InferType
+    from monailabel.tasks.infer.basic_infer import BasicInferTask
+
+
+    class Dummy(BasicInferTask):
+        def __init__(self):
+            super().__init__(
+                path=None,
+                network=torch.nn.Conv3d(1, 1, 1),
+                type=InferType.SEGMENTATION,
+                labels={"x": 1},
+                dimension=3,
+                description="Dummy model",
+                load_strict=False,
+            )
+
+        def pre_transforms(self, data=None):
+            return [LoadImaged(keys="image"), EnsureChannelFirstd(keys="image")]
+
+        def post_transforms(self, data=None):
+            return [SqueezeDimd(keys="pred", dim=0), ToNumpyd(keys="pred")]
+
+
+    class DummyApp(MONAILabelApp):
+        def __init__(self, app_dir, studies, conf):
+            super().__init__(app_dir=app_dir, studies=studies, conf=conf, name="dummy")
+
+        def init_infers(self):
+            return {"dummy": Dummy()}
+    """
+)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestLoadTest(unittest.TestCase):
+    server: uvicorn.Server
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.base_dir = tempfile.mkdtemp()
+        app_dir = os.path.join(cls.base_dir, "app")
+        studies = os.path.join(cls.base_dir, "studies")
+        os.makedirs(os.path.join(app_dir, "logs"))
+        os.makedirs(studies)
+        with open(os.path.join(app_dir, "main.py"), "w") as fc:
+            fc.write(DUMMY_APP)
+
+        for i in range(2):
+            image, _ = synthetic_volume((16, 16, 16), seed=i)
+            write_itk(image, os.path.join(studies, f"img{i + 1}.nii.gz"), np.eye(4), None, False)
+        with open(os.path.join(studies, "bad.nii.gz"), "wb") as fc:
+            fc.write(b"0" * 1024)  # not a valid image; infer fails
+        cls.image_file = os.path.join(studies, "img1.nii.gz")
+
+        cls.settings = settings.dict()
+        settings.MONAI_LABEL_APP_DIR = app_dir
+        settings.MONAI_LABEL_STUDIES = studies
+        settings.MONAI_LABEL_DATASTORE_AUTO_RELOAD = False
+        settings.MONAI_LABEL_APP_CONF = {"server_mode": "true"}
+        settings.MONAI_LABEL_SESSION_PATH = os.path.join(cls.base_dir, "sessions")
+
+        from monailabel.app import app
+        from monailabel.interfaces.utils.app import clear_cache
+
+        clear_cache()
+        port = _free_port()
+        cls.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+        cls.thread = threading.Thread(target=cls.server.run, daemon=True)
+        cls.thread.start()
+        for _ in range(300):
+            if cls.server.started:
+                break
+            time.sleep(0.1)
+        cls.url = f"http://127.0.0.1:{port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        from monailabel.interfaces.utils.app import clear_cache
+
+        cls.server.should_exit = True
+        cls.thread.join(timeout=10)
+        clear_cache()
+        for k, v in cls.settings.items():
+            setattr(settings, k, v)
+        shutil.rmtree(cls.base_dir, ignore_errors=True)
+
+    def test_closed_loop(self):
+        mix = {"infer": 4, "datastore": 1, "activelearning": 1}
+        result = LoadTest(self.url, mix=mix, images=["img1", "img2"], concurrency=2, requests=12).run()
+
+        self.assertEqual(result["config"]["model"], "dummy")
+        self.assertEqual(result["count"], 12)
+        self.assertEqual(result["errors"], 0, result.get("error_types"))
+        self.assertGreater(result["throughput"], 0)
+        self.assertTrue(set(result["ops"].keys()).issubset(mix.keys()))
+        for k in ("p50", "p95", "p99"):
+            self.assertIn(k, result["latency"])
+        self.assertLessEqual(result["latency"]["p50"], result["latency"]["p99"])
+
+    def test_open_loop_errors(self):
+        result = LoadTest(
+            self.url, mix=parse_mix("infer"), images=["img1", "bad"], mode="open", rate=20, duration=0.5
+        ).run()
+
+        self.assertGreater(result["count"], 0)
+        self.assertGreater(result["ops"]["infer"]["errors"], 0)
+        self.assertEqual(result["error_rate"], round(result["errors"] / result["count"], 4))
+        self.assertEqual(list(result["error_types"].keys()), ["MONAILabelClientException"])
+
+    def test_infer_upload(self):
+        result = LoadTest(self.url, mix={"infer_upload": 1, "session": 1}, image_file=self.image_file, requests=4).run()
+        self.assertEqual(result["count"], 4)
+        self.assertEqual(result["errors"], 0, result.get("error_types"))
+
+    def test_utils(self):
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2.5)
+        self.assertEqual(percentile([1], 99), 1)
+        self.assertEqual(parse_mix("infer=8, datastore=1"), {"infer": 8.0, "datastore": 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix("unknown=1")
+        with self.assertRaises(ValueError):
+            LoadTest(self.url, mix={"session": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
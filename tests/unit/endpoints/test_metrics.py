@@ -0,0 +1,54 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+from unittest import mock
+
+from fastapi import HTTPException
+
+from monailabel.config import settings
+from monailabel.endpoints.metrics import metrics_access
+
+
+class _Request:
+    def __init__(self, token=None):
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+
+class TestMetricsAccess(unittest.TestCase):
+    def access(self, token=None, **kwargs):
+        conf = {"MONAI_LABEL_AUTH_ENABLE": True, "MONAI_LABEL_METRICS_PUBLIC": False, **kwargs}
+
+        async def invalid_user(token):
+            raise HTTPException(status_code=401, detail="Could not validate credentials")
+
+        with mock.patch.multiple(settings, **conf):
+            with mock.patch("monailabel.endpoints.metrics.get_current_user", invalid_user):
+                return asyncio.run(metrics_access(_Request(token)))
+
+    def test_scrape_token(self):
+        self.assertIsNone(self.access("s3cret", MONAI_LABEL_METRICS_TOKEN="s3cret"))
+        with self.assertRaises(HTTPException) as e:
+            self.access("wrong", MONAI_LABEL_METRICS_TOKEN="s3cret")
+        self.assertEqual(e.exception.status_code, 401)
+
+    def test_no_token(self):
+        # admin auth is still required by default
+        with self.assertRaises(HTTPException):
+            self.access(MONAI_LABEL_METRICS_TOKEN="")
+
+    def test_public(self):
+        self.assertIsNone(self.access(MONAI_LABEL_METRICS_PUBLIC=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
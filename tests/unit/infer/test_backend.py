@@ -0,0 +1,84 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import torch
+
+from monailabel.tasks.infer.backend import BackendNetwork, InferBackend
+
+
+def _network():
+    return torch.nn.Sequential(torch.nn.Conv3d(1, 2, 3, padding=1), torch.nn.ReLU()).eval()
+
+
+class TestBackendNetwork(unittest.TestCase):
+    def test_eager(self):
+        network = _network()
+        x = torch.rand(1, 1, 8, 8, 8)
+        b = BackendNetwork(network, InferBackend.EAGER)
+        with torch.no_grad():
+            torch.testing.assert_close(b(x), network(x))
+        self.assertEqual(b.stats()["backend"], "eager")
+
+    def test_torchscript_cached(self):
+        network = _network()
+        x = torch.rand(1, 1, 8, 8, 8)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.pt")
+            torch.save(network.state_dict(), path)
+
+            b = BackendNetwork(network, InferBackend.TORCHSCRIPT, path)
+            with torch.no_grad():
+                torch.testing.assert_close(b(x), network(x), atol=1e-4, rtol=1e-4)
+            self.assertEqual(b.stats()["backend"], "torchscript")
+            self.assertIn("parity", b.stats())
+            artifact = b.artifact_path(x)
+            self.assertTrue(os.path.exists(artifact))
+            mtime = os.path.getmtime(artifact)
+
+            # same shape; re-use cached artifact
+            b2 = BackendNetwork(network, InferBackend.TORCHSCRIPT, path)
+            with torch.no_grad():
+                torch.testing.assert_close(b2(x), network(x), atol=1e-4, rtol=1e-4)
+            self.assertEqual(b2.artifact_path(x), artifact)
+            self.assertEqual(os.path.getmtime(artifact), mtime)
+
+            # different shape; new artifact (and parity check)
+            x2 = torch.rand(1, 1, 6, 6, 6)
+            with torch.no_grad():
+                torch.testing.assert_close(b2(x2), network(x2), atol=1e-4, rtol=1e-4)
+            self.assertNotEqual(b2.artifact_path(x2), artifact)
+            self.assertTrue(os.path.exists(b2.artifact_path(x2)))
+            self.assertEqual(b2.stats()["calls"], 2)
+            self.assertEqual(b2.stats()["backend"], "torchscript")
+
+            # new checkpoint; new artifact
+            torch.save(_network().state_dict(), path)
+            b3 = BackendNetwork(network, InferBackend.TORCHSCRIPT, path)
+            self.assertNotEqual(b3.artifact_path(x), artifact)
+            self.assertEqual([f for f in os.listdir(tmp) if f.endswith(".tmp")], [])
+
+    def test_fallback_on_dict_output(self):
+        class DictNet(torch.nn.Module):
+            def forward(self, x):
+                return {"pred": x * 2}
+
+        b = BackendNetwork(DictNet(), InferBackend.ONNX)
+        out = b(torch.ones(1, 1, 2, 2))
+        self.assertIsInstance(out, dict)
+        self.assertEqual(b.stats()["backend"], "eager")
+
+
+if __name__ == "__main__":
+    unittest.main()
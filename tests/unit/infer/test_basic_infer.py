@@ -0,0 +1,148 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import torch
+from monai.data import MetaTensor
+from monai.transforms import Flipd
+
+from monailabel.interfaces.exception import MONAILabelException
+from monailabel.interfaces.tasks.infer_v2 import InferType
+from monailabel.tasks.infer.basic_infer import BasicInferTask
+
+
+class _Task(BasicInferTask):
+    def __init__(self, **kwargs):
+        super().__init__(
+            path=None,
+            network=torch.nn.Identity(),
+            type=InferType.SEGMENTATION,
+            labels="x",
+            dimension=3,
+            description="Identity",
+            **kwargs,
+        )
+
+    def pre_transforms(self, data=None):
+        return [Flipd(keys="image", spatial_axis=0)]
+
+    def post_transforms(self, data=None):
+        return []
+
+
+def _data(task):
+    image = torch.arange(2 * 16 * 16 * 16, dtype=torch.float32).reshape(1, 32, 16, 16)
+    data = task.run_pre_transforms({"image": MetaTensor(image)}, task.pre_transforms())
+    data["pred"] = data["image"].as_tensor() + 1
+    data["extra"] = torch.zeros(64, 64, 64)
+    return image, data
+
+
+class TestInvert(unittest.TestCase):
+    def test_invert_skipped(self):
+        task = _Task()
+        _, data = _data(task)
+        pred, extra = data["pred"], data["extra"]
+        image_ops = len(data["image"].applied_operations)
+
+        with mock.patch.object(task, "_invertible_pred") as invertible:
+            data = task.run_invert_transforms(data, task.pre_transforms(), [])
+        invertible.assert_not_called()
+        self.assertIs(data["pred"], pred)
+        self.assertIs(data["extra"], extra)
+        self.assertEqual(len(data["image"].applied_operations), image_ops)
+
+    def test_invert_output(self):
+        task = _Task(invert_output=True)
+        image, data = _data(task)
+        pred = data["pred"]
+
+        data = task.run_invert_transforms(data, task.pre_transforms(), [])
+        self.assertTrue(torch.equal(torch.as_tensor(data["pred"]), image + 1))
+        self.assertTrue(torch.equal(pred, torch.flip(image, dims=(1,)) + 1))  # original prediction is not modified
+        self.assertEqual(len(data["image"].applied_operations), 1)
+
+
+class _InplacePostTask(_Task):
+    def pre_transforms(self, data=None):
+        return []
+
+    def post_transforms(self, data=None):
+        def threshold(d):
+            d["pred"][d["pred"] < 0.5] = 0  # in-place update of inferer output
+            return d
+
+        return [threshold]
+
+
+class TestInferOptions(unittest.TestCase):
+    def test_inplace_post(self):
+        task = _InplacePostTask(skip_writer=True)
+        image = torch.tensor([[[[0.2, 0.8], [0.4, 0.6]]]])
+        _, data = task({"image": image, "device": "cpu"})
+        self.assertTrue(torch.equal(data["pred"], torch.tensor([[[[0.0, 0.8], [0.0, 0.6]]]])))
+
+    def test_auto_batch_size_cpu(self):
+        self.assertEqual(_Task()._auto_batch_size(None, torch.zeros(1, 1, 8, 8, 8), "cpu", {}), 1)
+
+    def test_invalid_backend(self):
+        task = _InplacePostTask(skip_writer=True)
+        for k in ("backend", "precision"):
+            with self.assertRaises(MONAILabelException):
+                task({"image": torch.ones(1, 2, 2, 2), "device": "cpu", k: "unknown"})
+
+
+class TestReleaseInput(unittest.TestCase):
+    def test_release(self):
+        task = _Task()
+        data = {"image": MetaTensor(torch.ones(1, 32, 32, 32), meta={"spacing": [1, 1, 1]})}
+        self.assertEqual(task.run_release_input(data), 32 * 32 * 32 * 4)
+
+        image = data["image"]
+        self.assertEqual(image.shape, (1, 32, 32, 32))
+        self.assertEqual(image.stride(), (0, 0, 0, 0))
+        self.assertEqual(image.meta["spacing"], [1, 1, 1])
+
+    def test_release_shared(self):
+        task = _Task()
+        data = {"image": torch.ones(1, 32, 32, 32)}
+        keep = data["image"]  # e.g. held by session cache; only the reference in data is dropped
+        self.assertEqual(task.run_release_input(data), 32 * 32 * 32 * 4)
+        self.assertEqual(data["image"].stride(), (0, 0, 0, 0))
+        self.assertEqual(keep.sum(), 32 * 32 * 32)
+
+    def test_release_default(self):
+        task = _InplacePostTask(skip_writer=True)
+        _, data = task({"image": torch.ones(1, 4, 4, 4), "device": "cpu"})
+        self.assertEqual(data["image"].stride(), (0, 0, 0, 0))
+        self.assertTrue(torch.equal(torch.as_tensor(data["pred"]), torch.ones(1, 4, 4, 4)))
+
+
+class TestPrepare(unittest.TestCase):
+    def test_prepare(self):
+        task = _Task(skip_writer=True)
+        image = torch.arange(8, dtype=torch.float32).reshape(1, 2, 2, 2)
+        prepared = task.prepare({"image": image, "device": "cpu"})
+        self.assertTrue(torch.equal(torch.as_tensor(prepared["data"]["image"]), torch.flip(image, dims=(1,))))
+
+        # pre transforms are not run again
+        with mock.patch.object(task, "run_pre_transforms") as pre:
+            _, data = task({"image": image, "device": "cpu", "_prepared": prepared})
+        pre.assert_not_called()
+
+        _, expected = task({"image": image, "device": "cpu"})
+        self.assertTrue(torch.equal(torch.as_tensor(data["pred"]), torch.as_tensor(expected["pred"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
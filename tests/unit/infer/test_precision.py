@@ -0,0 +1,53 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import torch
+
+from monailabel.tasks.infer.backend import BackendNetwork
+from monailabel.tasks.infer.precision import InferPrecision, dice_score, quantize_network, to_labels
+
+
+class TestPrecision(unittest.TestCase):
+    def test_dice(self):
+        a = torch.tensor([[0, 1, 1, 2]])
+        self.assertAlmostEqual(dice_score(a, a), 1.0)
+        self.assertAlmostEqual(dice_score(a, torch.tensor([[0, 1, 0, 2]])), (2 / 3 + 1.0) / 2)
+        self.assertAlmostEqual(dice_score(torch.zeros(4), torch.zeros(4)), 1.0)
+
+    def test_to_labels(self):
+        logits = torch.tensor([[[0.1, 0.9], [0.8, 0.2]]]).permute(0, 2, 1)  # B, C, N
+        self.assertListEqual(to_labels(logits).tolist(), [[1, 0]])
+
+    def test_quantize_dynamic(self):
+        network = torch.nn.Sequential(torch.nn.Linear(8, 4))
+        q, precision = quantize_network(network, InferPrecision.INT8_DYNAMIC)
+        self.assertEqual(precision, InferPrecision.INT8_DYNAMIC)
+        self.assertEqual(q(torch.rand(2, 8)).shape, (2, 4))
+
+    def test_static_without_calibration(self):
+        network = torch.nn.Sequential(torch.nn.Conv2d(1, 2, 3))
+        q, precision = quantize_network(network, InferPrecision.INT8_STATIC)
+        self.assertIs(q, network)
+        self.assertEqual(precision, InferPrecision.FP32)
+
+    def test_bf16_output_float(self):
+        network = torch.nn.Sequential(torch.nn.Conv2d(1, 2, 3, padding=1)).eval()
+        b = BackendNetwork(network, "eager", precision=InferPrecision.BF16)
+        with torch.inference_mode():
+            out = b(torch.rand(1, 1, 8, 8))
+        self.assertEqual(out.dtype, torch.float32)
+        self.assertEqual(b.stats()["precision"], "bf16")
+
+
+if __name__ == "__main__":
+    unittest.main()
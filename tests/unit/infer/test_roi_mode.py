@@ -0,0 +1,105 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import nibabel as nib
+import numpy as np
+import torch
+from monai.transforms import EnsureChannelFirstd, LoadImaged, SqueezeDimd, ToNumpyd
+
+from monailabel.interfaces.tasks.infer_v2 import InferType
+from monailabel.tasks.infer.basic_infer import BasicInferTask
+from monailabel.transform.writer import write_itk
+
+
+class _Threshold(torch.nn.Module):
+    def forward(self, x):
+        return (x > 0.5).float()
+
+
+class _ClickTask(BasicInferTask):
+    def __init__(self, **kwargs):
+        super().__init__(
+            path=None,
+            network=_Threshold(),
+            type=InferType.DEEPGROW,
+            labels="blob",
+            dimension=3,
+            description="Threshold",
+            **kwargs,
+        )
+
+    def pre_transforms(self, data=None):
+        self.shapes = []
+        return [
+            LoadImaged(keys="image", reader="ITKReader"),
+            EnsureChannelFirstd(keys="image"),
+            lambda d: self.shapes.append(tuple(d["image"].shape)) or d,
+        ]
+
+    def post_transforms(self, data=None):
+        return [SqueezeDimd(keys="pred", dim=0), ToNumpyd(keys="pred")]
+
+
+class TestRoiMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.image = np.zeros((32, 32, 24), dtype=np.float32)
+        self.image[8:12, 8:12, 8:12] = 1
+        self.image[24:28, 24:28, 16:20] = 1
+        self.image_path = os.path.join(self.tmp.name, "image.nii.gz")
+        write_itk(self.image, self.image_path, np.diag([2.0, 2.0, 3.0, 1.0]), None, False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roi_from_clicks(self):
+        task = _ClickTask(roi_mode=True, roi_margin=4)
+        label, result = task({"image": self.image_path, "foreground": [[10, 10, 10]], "device": "cpu"})
+
+        self.assertEqual(task.shapes, [(1, 9, 9, 9)])
+        self.assertEqual(result["latencies"]["roi"]["bbox"], [[6, 15], [6, 15], [6, 15]])
+
+        pred = nib.load(label)
+        self.assertEqual(pred.shape, self.image.shape)
+        self.assertTrue(np.allclose(pred.affine[:3, 3], nib.load(self.image_path).affine[:3, 3]))
+
+        # only first blob (inside roi) is segmented
+        expected = np.zeros_like(self.image)
+        expected[8:12, 8:12, 8:12] = 1
+        self.assertTrue(np.array_equal(np.asarray(pred.dataobj), expected))
+
+    def test_roi_clamped(self):
+        task = _ClickTask(roi_mode=True)
+        label, result = task({"image": self.image_path, "roi": [[20, 40], [20, 40], [10, 30]], "device": "cpu"})
+
+        # cropped right after loading (no temporary roi image)
+        self.assertEqual(task.shapes, [(1, 12, 12, 14)])
+        self.assertEqual(result["latencies"]["roi"]["bbox"], [[20, 32], [20, 32], [10, 24]])
+
+        expected = np.zeros_like(self.image)
+        expected[24:28, 24:28, 16:20] = 1
+        self.assertTrue(np.array_equal(np.asarray(nib.load(label).dataobj), expected))
+
+    def test_roi_disabled(self):
+        task = _ClickTask()
+        label, result = task({"image": self.image_path, "foreground": [[10, 10, 10]], "device": "cpu"})
+
+        self.assertEqual(task.shapes, [(1, 32, 32, 24)])
+        self.assertIsNone(result["latencies"]["roi"])
+        self.assertTrue(np.array_equal(np.asarray(nib.load(label).dataobj), self.image))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from monailabel.interfaces.tasks.batch_infer import BatchInferJournal, BatchInferTask
+
+
+class FakeDatastore:
+    def __init__(self, root, images):
+        self.root = root
+        self.images = images
+        self.commits = []
+
+    def list_images(self):
+        return self.images
+
+    def get_image_uri(self, image_id):
+        return os.path.join(self.root, f"{image_id}.nii.gz")
+
+    def save_labels(self, labels):
+        self.commits.append([label[0] for label in labels])
+        return [label[0] for label in labels]
+
+
+class TestBatchInfer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.images = [f"img{i}" for i in range(10)]
+        for i in self.images:
+            with open(os.path.join(self.tmp.name, f"{i}.nii.gz"), "w") as f:
+                f.write(i)
+        self.datastore = FakeDatastore(self.tmp.name, self.images)
+        self.request = {"model": "seg", "device": "cpu", "multi_gpu": False, "max_workers": 2, "commit_size": 4}
+        self.journal = BatchInferJournal.for_request(self.request, self.images)
+        self.journal.path = os.path.join(self.tmp.name, "journal.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def infer(self, fail=()):
+        def run(request, datastore):
+            if request["_image_id"] in fail:
+                raise RuntimeError("failed")
+            self.assertTrue(os.path.exists(request["image"]))
+            self.assertFalse(request["save_label"])
+            label = tempfile.NamedTemporaryFile(suffix=".nii.gz", delete=False).name
+            return {"label": label, "file": label, "params": {"image": request["_image_id"]}}
+
+        return run
+
+    def run_task(self, fail=(), prepare=None):
+        with mock.patch.object(BatchInferJournal, "for_request", return_value=self.journal):
+            return BatchInferTask()(self.request, self.datastore, self.infer(fail), prepare=prepare)
+
+    def test_pipeline(self):
+        result = self.run_task()
+        self.assertEqual(sorted(result.keys()), self.images)
+        self.assertTrue(all(r["label"] == i for i, r in result.items()))
+        self.assertTrue(all("file" not in r for r in result.values()))
+        self.assertEqual(sum(len(c) for c in self.datastore.commits), 10)
+        self.assertLess(len(self.datastore.commits), 10)
+        self.assertFalse(os.path.exists(self.journal.path))
+
+    def test_prepare(self):
+        prepared = {}
+
+        def prepare(request):
+            if request["_image_id"] == "img2":
+                raise RuntimeError("failed")
+            prepared[request["_image_id"]] = threading.current_thread().name
+            return {"image": request["image"]}
+
+        infer = self.infer()
+
+        def run(request, datastore):
+            # pre transforms ran (in load stage) before infer; infer runs them itself when prepare failed
+            self.assertEqual("_prepared" in request, request["_image_id"] != "img2")
+            return infer(request, datastore)
+
+        with mock.patch.object(self, "infer", return_value=run):
+            result = self.run_task(prepare=prepare)
+        self.assertEqual(sorted(prepared.keys()), [i for i in self.images if i != "img2"])
+        self.assertTrue(all(name.startswith("BatchInfer-Load") for name in prepared.values()))
+        self.assertTrue(all(r["label"] == i for i, r in result.items()))
+
+    def test_resume(self):
+        result = self.run_task(fail=("img3", "img7"))
+        self.assertEqual(result["img3"], {})
+        self.assertEqual(len(self.journal.completed()), 8)
+
+        # re-run only infers the failed images
+        self.datastore.commits.clear()
+        result = self.run_task()
+        self.assertEqual(sorted(sum(self.datastore.commits, [])), ["img3", "img7"])
+        self.assertTrue(result["img0"]["resumed"])
+        self.assertEqual(result["img7"]["label"], "img7")
+        self.assertFalse(os.path.exists(self.journal.path))
+
+    def test_journal_key(self):
+        j1 = BatchInferJournal.for_request({**self.request, "model_version": "v1"}, self.images)
+        j2 = BatchInferJournal.for_request({**self.request, "model_version": "v2"}, self.images)
+        j3 = BatchInferJournal.for_request({**self.request, "model_version": "v1", "max_workers": 8}, self.images)
+        self.assertNotEqual(j1.path, j2.path)
+        self.assertEqual(j1.path, j3.path)
+
+    def test_journal_expiry(self):
+        old = os.path.join(self.tmp.name, "old.jsonl")
+        new = os.path.join(self.tmp.name, "new.jsonl")
+        for f in (old, new):
+            with open(f, "w") as fp:
+                fp.write("{}\n")
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+
+        BatchInferJournal.cleanup(self.tmp.name, 3600)
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(new))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from monailabel.interfaces.utils.wsi import coarse_regions, create_infer_wsi_tasks, filter_wsi_tasks
+
+
+class TestWSITasks(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch("monailabel.interfaces.utils.wsi.slide_pool")
+        self.addCleanup(patcher.stop)
+        patcher.start().return_value.dimensions.return_value = (4000, 3000)
+
+    def test_tiles(self):
+        tasks = create_infer_wsi_tasks({"tile_size": (1000, 1000)}, "slide.svs")
+        self.assertEqual(len(tasks), 12)
+        self.assertEqual(tasks[-1]["location"], (3000, 2000))
+        self.assertEqual(tasks[-1]["size"], (1000, 1000))
+
+    def test_coarse_tiles(self):
+        stats = {}
+        tasks = create_infer_wsi_tasks({"tile_size": (1000, 1000)}, "slide.svs", stats, downsample=4)
+        self.assertEqual(len(tasks), 1)
+        self.assertEqual(tasks[0]["location"], (0, 0))
+        self.assertEqual(tasks[0]["size"], (1000, 750))
+        self.assertEqual(stats["total"], 1)
+
+    def test_aligned_tiles(self):
+        request = {"tile_size": (1000, 1000), "location": (1500, 500), "size": (1000, 1000), "tile_align": True}
+        tasks = create_infer_wsi_tasks(request, "slide.svs")
+        self.assertEqual([t["location"] for t in tasks], [(1000, 0), (2000, 0), (1000, 1000), (2000, 1000)])
+
+        # panned viewport shares the tiles
+        request["location"] = (1600, 700)
+        tasks = create_infer_wsi_tasks(request, "slide.svs")
+        self.assertEqual([t["location"] for t in tasks][:2], [(1000, 0), (2000, 0)])
+
+    def test_coarse_to_fine(self):
+        coarse = [{"location": (0, 0)}, {"location": (2000, 0)}]
+        results = [
+            # object at (100, 100) - (149, 149) of coarse tile => (400, 400) - (600, 600) at level 0
+            {"annotation": {"elements": [{"label": "Tumor", "contours": [[[100, 100], [149, 100], [149, 149]]]}]}},
+            {"annotation": {"elements": []}},
+        ]
+        boxes = coarse_regions(coarse, results, downsample=4, margin=10)
+        self.assertEqual(boxes.tolist(), [[390, 390, 610, 610]])
+
+        tasks = create_infer_wsi_tasks({"tile_size": (500, 500)}, "slide.svs")
+        fine = filter_wsi_tasks(tasks, boxes)
+        self.assertEqual([t["location"] for t in fine], [(0, 0), (500, 0), (0, 500), (500, 500)])
+        self.assertEqual([t["id"] for t in fine], [0, 1, 2, 3])
+        self.assertEqual(filter_wsi_tasks(tasks, coarse_regions([], [], 4)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
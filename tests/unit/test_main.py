@@ -10,6 +10,7 @@
 # limitations under the License.
 
 import argparse
+import json
 import os
 import shutil
 import unittest
@@ -86,6 +87,61 @@ class MyTestCase(unittest.TestCase):
         assert os.path.isdir(output)
         shutil.rmtree(output, ignore_errors=True)
 
+    def test_bench(self):
+        output = os.path.join(self.data_dir, "bench.json")
+        baseline = os.path.join(self.data_dir, "bench_baseline.json")
+        with open(baseline, "w") as fc:
+            json.dump({"results": {"datastore": {"objects": 2}, "scoring": {"images": 1}}}, fc)
+
+        # tiny real run; 2 images in a temp datastore
+        args = argparse.Namespace(
+            benchmarks=["datastore", "scoring"],
+            output=output,
+            baseline=baseline,
+            workdir=None,
+            size=[16, 16, 16],
+            roi_size=[16, 16, 16],
+            repeat=1,
+            warmup=0,
+            iterations=1,
+            batch_size=1,
+            num_workers=0,
+            objects=2,
+            wsi_size=1024,
+            tile_size=256,
+            wsi_backend="tifffile",
+            device="cpu",
+            seed=0,
+        )
+        Main().action_bench(args)
+
+        with open(output) as fc:
+            result = json.load(fc)
+        os.unlink(output)
+        os.unlink(baseline)
+
+        self.assertIn("torch", result["env"])
+        self.assertEqual(result["config"]["objects"], 2)
+
+        datastore = result["results"]["datastore"]
+        self.assertNotIn("error", datastore)
+        self.assertEqual(datastore["objects"], 2)
+        self.assertEqual(datastore["ops"]["init"]["n"], 1)
+        for op in ("get_image_uri", "get_image_info", "update_image_info", "save_label", "get_labels_by_image_id"):
+            self.assertEqual(datastore["ops"][op]["n"], 2)
+            self.assertGreaterEqual(datastore["ops"][op]["p95"], datastore["ops"][op]["p50"])
+        for op in ("list_images", "datalist", "get_unlabeled_images", "refresh"):
+            self.assertIn(op, datastore["ops"])
+
+        scoring = result["results"]["scoring"]
+        self.assertNotIn("error", scoring)
+        self.assertEqual(scoring["images"], 2)
+        for method in ("sum", "dice"):
+            self.assertGreater(scoring[method]["latency"], 0)
+            self.assertGreater(scoring[method]["images_per_sec"], 0)
+
+        self.assertEqual(result["compare"]["datastore"]["objects"], 0)
+        self.assertEqual(result["compare"]["scoring"]["images"], 100.0)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,133 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+import torch
+from monai.apps.deepedit.transforms import AddGuidanceFromPointsDeepEditd, ResizeGuidanceMultipleLabelDeepEditd
+from monai.data import MetaTensor
+from monai.transforms import Resized
+
+from monailabel.transform.cache import SessionCacheDatad, session_cache_stats
+
+
+class TestSessionCacheDatad(unittest.TestCase):
+    def test_hit_and_miss(self):
+        t = SessionCacheDatad(keys="image")
+        request = {"session_id": "s1", "model": "deepedit", "image": "image.nii.gz", "image_id": "image1"}
+        stats = session_cache_stats()
+
+        self.assertIsNone(t.load(request))
+        d = t({**request, "image": MetaTensor(torch.ones(1, 4, 4, 4))})
+        self.assertEqual(d["session_cache"], "miss")
+
+        d = t.load(request)
+        self.assertEqual(d["session_cache"], "hit")
+        self.assertEqual(tuple(d["image"].shape), (1, 4, 4, 4))
+
+        # replacing loaded input does not update cached one
+        d["image"] = MetaTensor(torch.zeros(2, 4, 4, 4))
+        self.assertEqual(tuple(t.load(request)["image"].shape), (1, 4, 4, 4))
+
+        # input is cached per image (any session); not per model
+        self.assertIsNotNone(t.load({**request, "session_id": "s2"}))
+        self.assertIsNone(t.load({**request, "model": "segmentation"}))
+        self.assertIsNone(t.load({**request, "image_id": "image2"}))
+
+        current = session_cache_stats()
+        self.assertEqual(current["hits"] - stats["hits"], 3)
+        self.assertEqual(current["misses"] - stats["misses"], 3)
+
+    def test_shared_input(self):
+        t = SessionCacheDatad(keys="image")
+        request = {"model": "deepedit", "image": "image.nii.gz", "image_id": "shared"}
+        t({**request, "image": MetaTensor(torch.ones(1, 4, 4, 4))})
+
+        # input is shared with cache (no copy per hit) but has its own meta
+        a = t.load(request)["image"]
+        b = t.load(request)["image"]
+        self.assertEqual(a.data_ptr(), b.data_ptr())
+        a.meta["updated"] = True
+        self.assertNotIn("updated", b.meta)
+
+        # in-place update by a follow-up transform drops cached input
+        a.add_(1)
+        self.assertIsNone(t.load(request))
+
+    def test_previous_result(self):
+        t = SessionCacheDatad(keys="image")
+        request = {"session_id": "s3", "model": "deepedit", "image": "s3.nii.gz", "image_id": "s3"}
+        t({**request, "image": torch.ones(1, 4, 4, 4)})
+
+        pred = np.ones((4, 4, 4), dtype=np.uint8)
+        t.save_result({**request, "pred": pred})
+        d = t.load(request)
+        self.assertTrue(np.array_equal(d["previous_label"], pred))
+
+        # input cropped to another roi is a miss; previous prediction is per session
+        self.assertIsNone(t.load({**request, "roi_bbox": [[0, 2], [0, 2], [0, 2]]}))
+        d = t({**request, "image": torch.ones(1, 2, 2, 2), "roi_bbox": [[0, 2], [0, 2], [0, 2]]})
+        self.assertTrue(np.array_equal(d["previous_label"], pred))
+
+    def test_no_session(self):
+        t = SessionCacheDatad(keys="image")
+        request = {"image_path": "/tmp/s4.nii.gz", "model": "deepedit", "image": "s4.nii.gz"}
+
+        d = t({**request, "image": torch.ones(1, 4, 4, 4)})
+        self.assertEqual(d["session_cache"], "miss")
+        t.save_result({**request, "pred": np.ones((4, 4, 4))})
+
+        # same image (e.g. another user) re-uses input; but there is no previous prediction without session
+        d = t.load(request)
+        self.assertEqual(d["session_cache"], "hit")
+        self.assertNotIn("previous_label", d)
+
+        # nothing identifies the image
+        self.assertIsNone(t({"model": "deepedit", "image": torch.ones(1)}).get("session_cache"))
+
+    def test_deepedit_guidance(self):
+        # DeepEdit (radiology) keeps guidance transforms after the cache point; clicks map to the same coordinates
+        labels = {"spleen": 1, "background": 0}
+        guidance = [
+            AddGuidanceFromPointsDeepEditd(ref_image="image", guidance="guidance", label_names=labels),
+            Resized(keys="image", spatial_size=(16, 16, 8), mode="area"),
+            ResizeGuidanceMultipleLabelDeepEditd(guidance="guidance", ref_image="image"),
+        ]
+
+        def run(d, transforms):
+            for t in transforms:
+                d = t(d)
+            return d
+
+        def image():
+            return MetaTensor(torch.rand(1, 41, 30, 23), meta={"spatial_shape": np.array([41, 30, 23])})
+
+        clicks = [
+            {"spleen": [[10, 5, 7], [40, 29, 22]], "background": [[0, 0, 0]]},
+            {"spleen": [[10, 5, 7], [40, 29, 22], [21, 13, 3]], "background": [[0, 0, 0], [33, 1, 19]]},
+        ]
+        expected = [run({"image": image(), **c}, guidance)["guidance"] for c in clicks]
+
+        cache = SessionCacheDatad(keys="image")
+        request = {"session_id": "s5", "model": "deepedit", "image": "s5.nii.gz", "image_id": "s5"}
+        d = run(cache({**request, **clicks[0], "image": image()}), guidance)
+        self.assertEqual(d["session_cache"], "miss")
+        self.assertEqual(d["guidance"], expected[0])
+
+        d = run(cache.load({**request, **clicks[1]}), guidance)
+        self.assertEqual(d["session_cache"], "hit")
+        self.assertEqual(d["guidance"], expected[1])
+        self.assertEqual(tuple(d["image"].shape), (1, 16, 16, 8))
+
+
+if __name__ == "__main__":
+    unittest.main()
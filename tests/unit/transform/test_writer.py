@@ -14,12 +14,14 @@ import os
 import pathlib
 import unittest
 
+import nibabel as nib
 import nrrd
 import numpy as np
 import torch
 from parameterized import parameterized
 
-from monailabel.transform.writer import DetectionWriter, PolygonWriter, Writer
+from monailabel.interfaces.exception import MONAILabelError, MONAILabelException
+from monailabel.transform.writer import DetectionWriter, PolygonWriter, Writer, decode_rle, minimal_dtype
 
 WRITER_DATA = [
     {"label": "pred"},
@@ -32,6 +34,10 @@ WRITER_DATA = [
     },
 ]
 
+SPARSE_LABEL = np.zeros((32, 32, 16), dtype=np.float32)
+SPARSE_LABEL[4:10, 8:12, 2:5] = 1
+SPARSE_LABEL[6, 9, 3] = 2
+
 CHANNELS = 2
 WIDTH = 15
 HEIGHT = 10
@@ -160,6 +166,48 @@ class TestWriter(unittest.TestCase):
         file_ext = "".join(pathlib.Path(input_data["image_path"]).suffixes)
         self.assertIn(file_ext.lower(), [".nii", ".nii.gz"])
 
+    def test_encoding_rle(self):
+        input_data = {"pred": SPARSE_LABEL, "image_path": "fakepath.nii.gz", "result_encoding": "rle"}
+        input_data["pred_meta_dict"] = {"affine": np.identity(4)}
+
+        output_file, data = Writer(label="pred")(input_data)
+        self.assertIsNone(output_file)
+        self.assertEqual(data["label_encoding"]["shape"], [32, 32, 16])
+        self.assertEqual(data["label_encoding"]["dtype"], "uint8")
+        self.assertTrue(np.array_equal(decode_rle(data["label_encoding"]), SPARSE_LABEL))
+
+    def test_encoding_bbox(self):
+        input_data = {"pred": SPARSE_LABEL, "image_path": "fakepath.nii.gz", "result_encoding": "bbox"}
+        input_data["pred_meta_dict"] = {"affine": np.diag([2.0, 2.0, 3.0, 1.0])}
+
+        output_file, data = Writer(label="pred", nibabel=True)(input_data)
+        self.assertEqual(os.path.exists(output_file), True)
+        self.assertEqual(data["label_encoding"]["shape"], [32, 32, 16])
+        self.assertEqual(data["label_encoding"]["bbox"], [[4, 10], [8, 12], [2, 5]])
+
+        arr = nib.load(output_file)
+        self.assertEqual(arr.shape, (6, 4, 3))
+        self.assertEqual(arr.get_data_dtype(), np.uint8)
+        self.assertTrue(np.allclose(arr.affine[:3, 3], [8.0, 16.0, 6.0]))
+
+    def test_encoding_invalid(self):
+        input_data = {"pred": SPARSE_LABEL, "image_path": "fakepath.nii.gz", "result_encoding": "jpeg"}
+        with self.assertRaises(MONAILabelException) as e:
+            Writer(label="pred")(input_data)
+        self.assertEqual(e.exception.error, MONAILabelError.INVALID_INPUT)
+
+        # cropped/rle label can't be saved in datastore
+        input_data.update({"result_encoding": "bbox", "save_label": True})
+        with self.assertRaises(MONAILabelException) as e:
+            Writer(label="pred")(input_data)
+        self.assertEqual(e.exception.error, MONAILabelError.INVALID_INPUT)
+
+    def test_minimal_dtype(self):
+        self.assertEqual(minimal_dtype(SPARSE_LABEL), np.uint8)
+        self.assertEqual(minimal_dtype(np.array([0, 300], dtype=np.int64)), np.uint16)
+        self.assertEqual(minimal_dtype(np.array([-1, 2], dtype=np.int32)), np.int8)
+        # probabilities are never narrowed
+        self.assertEqual(minimal_dtype(np.array([0.0, 0.4], dtype=np.float32)), np.float32)
 
 class TestPolygonWriter(unittest.TestCase):
     @parameterized.expand([POLYGONWRITER_DATA])
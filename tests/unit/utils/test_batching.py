@@ -0,0 +1,74 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from monailabel.tasks.infer.batching import DynamicBatcher, get_batcher, register_batcher, unregister_batcher
+
+
+class TestDynamicBatcher(unittest.TestCase):
+    def test_batched(self):
+        batcher = DynamicBatcher(batch_size=4, max_wait=1.0)
+        sizes = []
+
+        def forward(x):
+            sizes.append(x.shape[0])
+            return {"pred": x * 2, "aux": [x + 1]}
+
+        def run(i):
+            x = torch.full((1, 3, 8, 8), float(i))
+            return batcher.run(("cpu", tuple(x.shape)), x, forward)
+
+        with ThreadPoolExecutor(4) as executor:
+            outputs = list(executor.map(run, range(8)))
+
+        self.assertEqual(sizes, [4, 4])
+        for i, out in enumerate(outputs):
+            self.assertEqual(out["pred"].shape, (1, 3, 8, 8))
+            self.assertTrue(torch.all(out["pred"] == 2 * i))
+            self.assertTrue(torch.all(out["aux"][0] == i + 1))
+        self.assertEqual(batcher.stats()["avg_batch"], 4)
+
+    def test_partial_batch(self):
+        batcher = DynamicBatcher(batch_size=4, max_wait=0.01)
+        x = torch.ones((1, 2))
+        out = batcher.run("k", x, lambda b: b + 1)
+        self.assertTrue(torch.equal(out, x + 1))
+        self.assertEqual(batcher.stats()["batches"], 1)
+
+    def test_error(self):
+        batcher = DynamicBatcher(batch_size=2, max_wait=1.0)
+
+        def forward(x):
+            raise RuntimeError("failed")
+
+        with ThreadPoolExecutor(2) as executor:
+            fs = [executor.submit(batcher.run, "k", torch.ones((1, 2)), forward) for _ in range(2)]
+        for f in fs:
+            self.assertRaises(RuntimeError, f.result)
+
+    def test_auto_and_registry(self):
+        batcher = DynamicBatcher(batch_size=0, max_batch_size=8)
+        self.assertEqual(batcher.resolve(lambda: 100), 8)
+        self.assertEqual(batcher.resolve(lambda: 2), 8)
+
+        batcher_id = register_batcher(batcher)
+        self.assertIs(get_batcher(batcher_id), batcher)
+        self.assertIs(unregister_batcher(batcher_id), batcher)
+        self.assertIsNone(get_batcher(batcher_id))
+        self.assertIsNone(get_batcher(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from monailabel.interfaces.exception import InsufficientMemoryException
+from monailabel.utils.others.memory import MemoryAdmission, MemoryMonitor, image_voxels
+
+MB = 1024 * 1024
+
+
+class TestMemoryMonitor(unittest.TestCase):
+    def test_stages(self):
+        monitor = MemoryMonitor("cpu", interval=0.001).start()
+        try:
+            with monitor.stage("pre"):
+                x = np.ones((64, MB), dtype=np.uint8)
+                time.sleep(0.01)
+            with monitor.stage("infer"):
+                del x
+        finally:
+            monitor.stop()
+
+        summary = monitor.summary()
+        self.assertEqual(list(summary["stages"].keys()), ["pre", "infer"])
+        self.assertIsNone(summary["device"])
+        self.assertGreaterEqual(summary["host_delta"], 32)
+        self.assertGreaterEqual(summary["host_peak"], summary["stages"]["pre"]["host"])
+
+
+class TestMemoryAdmission(unittest.TestCase):
+    def test_estimate(self):
+        admission = MemoryAdmission(headroom=0.0, decay=0.5, available=lambda _: 1000 * MB)
+        self.assertEqual(admission.estimate("m", 100), {})
+        ticket = admission.admit("m", 100)
+        self.assertEqual(ticket.need, {})
+        admission.release(ticket)
+
+        admission.learn("m", 100, 400)
+        self.assertEqual(admission.estimate("m", 200), {"host": 800})
+
+        # decaying max; smaller observations are not forgotten immediately
+        admission.learn("m", 100, 100)
+        self.assertEqual(admission.estimate("m", 100), {"host": 200})
+        admission.learn_from_result("m", 1, {"latencies": {"peak_memory": {"host_delta": 1.0, "device": None}}})
+        self.assertEqual(admission.estimate("m", 1), {"host": MB})
+
+    def test_queue_and_reject(self):
+        admission = MemoryAdmission(
+            headroom=0.0, timeout=0.2, available=lambda _: 100 * MB, capacity=lambda _: 100 * MB
+        )
+        admission.learn("m", 1, 60 * MB)
+
+        # can never fit
+        with self.assertRaises(InsufficientMemoryException):
+            admission.admit("m", 2)
+
+        ticket = admission.admit("m", 1)
+        self.assertEqual(admission.stats()["running"], 1)
+
+        # waits for the running request and fails after timeout
+        with self.assertRaises(InsufficientMemoryException):
+            admission.admit("m", 1)
+
+        # admitted once the running request releases memory
+        result = {}
+
+        def run():
+            result["ticket"] = admission.admit("m", 1, timeout=5)
+
+        t = threading.Thread(target=run)
+        t.start()
+        time.sleep(0.05)
+        admission.release(ticket)
+        t.join()
+        self.assertEqual(result["ticket"].need, {"host": 60 * MB})
+        admission.release(result["ticket"])
+        self.assertEqual(admission.stats()["running"], 0)
+
+    def test_in_use_not_double_counted(self):
+        free = {"v": 100 * MB}
+        admission = MemoryAdmission(headroom=0.0, timeout=0.1, available=lambda _: free["v"])
+        admission.learn("m", 1, 60 * MB)
+        admission.learn("n", 1, 35 * MB)
+        admission.learn("k", 1, 45 * MB)
+        ticket = admission.admit("m", 1)
+
+        # running request allocated 50 MB (already excluded from available); only 10 MB of it is still reserved
+        free["v"] = 50 * MB
+        with self.assertRaises(InsufficientMemoryException):
+            admission.admit("k", 1)
+        other = admission.admit("n", 1)
+        self.assertEqual(other.need, {"host": 35 * MB})
+
+        admission.release(other)
+        admission.release(ticket)
+        self.assertEqual(admission.stats()["running"], 0)
+
+    def test_wait_for_untracked(self):
+        # memory used by others (workers, training, other processes); waits instead of rejecting as too large
+        free = {"v": 10 * MB}
+        admission = MemoryAdmission(headroom=0.0, timeout=5, available=lambda _: free["v"])
+        admission.learn("m", 1, 60 * MB)
+
+        def release():
+            time.sleep(0.05)
+            free["v"] = 100 * MB
+
+        t = threading.Thread(target=release)
+        t.start()
+        ticket = admission.admit("m", 1)
+        t.join()
+        self.assertEqual(ticket.need, {"host": 60 * MB})
+        admission.release(ticket)
+
+        free["v"] = 10 * MB
+        with self.assertRaises(InsufficientMemoryException):
+            admission.admit("m", 1, timeout=0.1)
+
+    def test_learn_solo(self):
+        admission = MemoryAdmission(decay=0.0, available=lambda _: 1000 * MB)
+        first = admission.admit("m", 1)
+        second = admission.admit("m", 1)
+        admission.release(first)
+        admission.release(second)
+        third = admission.admit("m", 1)
+        admission.release(third)
+        self.assertFalse(first.solo)
+        self.assertFalse(second.solo)
+        self.assertTrue(third.solo)
+
+        result = {"latencies": {"peak_memory": {"host_delta": 5.0, "device": None}}}
+        admission.learn_from_result("m", 1, result, first)
+        self.assertEqual(admission.estimate("m", 1), {})
+        admission.learn_from_result("m", 1, result, third)
+        self.assertEqual(admission.estimate("m", 1), {"host": 5 * MB})
+
+    def test_learn_floor(self):
+        admission = MemoryAdmission(decay=0.0, available=lambda _: 1000 * MB)
+        latencies = {"peak_memory": {"host_delta": 0.0, "device": None}, "memory": {"input": 2.0}}
+        admission.learn_from_result("m", 1, {"latencies": latencies})
+        self.assertEqual(admission.estimate("m", 1), {"host": 2 * MB})
+
+    def test_image_voxels(self):
+        self.assertEqual(image_voxels({"image": "x.svs", "location": [0, 0], "size": [256, 512]}), 256 * 512)
+        self.assertEqual(image_voxels({"image": np.zeros((4, 5, 6))}), 120)
+        self.assertIsNone(image_voxels({"image": "/does/not/exist.nii.gz"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
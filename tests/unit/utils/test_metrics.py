@@ -0,0 +1,57 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import prometheus_client
+
+from monailabel.utils.others.metrics import generate_latest, observe_cache, observe_infer, track_inflight
+
+
+def _value(name, labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestServerMetrics(unittest.TestCase):
+    def test_observe_infer(self):
+        labels = {"model": "test_infer", "stage": "pre"}
+        count = _value("monailabel_infer_stage_seconds_count", labels)
+
+        latencies = {"pre": 0.2, "infer": 1.0, "total": 1.5, "transform": {"pre": {"LoadImaged": 0.1}}}
+        observe_infer("test_infer", {"latencies": latencies})
+        observe_infer("test_infer", {"latencies": latencies}, status="cache_hit")
+
+        self.assertEqual(_value("monailabel_infer_stage_seconds_count", labels), count + 1)
+        self.assertAlmostEqual(_value("monailabel_infer_stage_seconds_sum", labels), 0.2 * (count + 1))
+        self.assertEqual(
+            _value(
+                "monailabel_infer_transform_seconds_count",
+                {"model": "test_infer", "stage": "pre", "transform": "LoadImaged"},
+            ),
+            count + 1,
+        )
+        self.assertGreaterEqual(_value("monailabel_infer_requests_total", {"model": "test_infer", "status": "ok"}), 1)
+
+    def test_inflight(self):
+        labels = {"model": "test_inflight"}
+        with track_inflight("test_inflight"):
+            self.assertEqual(_value("monailabel_infer_inflight", labels), 1)
+        self.assertEqual(_value("monailabel_infer_inflight", labels), 0)
+
+    def test_generate(self):
+        observe_cache("test_cache", True)
+        content, media_type = generate_latest()
+        self.assertIn(b'monailabel_cache_requests_total{cache="test_cache",result="hit"}', content)
+        self.assertTrue(media_type.startswith("text/plain"))
+
+
+if __name__ == "__main__":
+    unittest.main()
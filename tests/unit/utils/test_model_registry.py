@@ -0,0 +1,140 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from monailabel.utils.others.model_registry import ModelRegistry, network_size
+
+
+class TestModelRegistry(unittest.TestCase):
+    def test_get_cached(self):
+        registry = ModelRegistry(watch=False)
+        calls = []
+
+        def loader(_):
+            calls.append(1)
+            return torch.nn.Linear(4, 4)
+
+        n1 = registry.get(("a", "cpu"), None, loader)
+        n2 = registry.get(("a", "cpu"), None, loader)
+        self.assertIs(n1, n2)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(registry.stats()["hits"], 1)
+
+    def test_lru_eviction(self):
+        size = network_size(torch.nn.Linear(256, 256))
+        registry = ModelRegistry(max_memory=1, watch=False)  # 1 MB; fits 3 networks of ~257 KB
+        count = (1024 * 1024) // size
+
+        for i in range(count + 1):
+            registry.get((f"m{i}", "cpu"), None, lambda _: torch.nn.Linear(256, 256))
+        registry.get(("m1", "cpu"), None, lambda _: torch.nn.Linear(256, 256))
+
+        stats = registry.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertNotIn(str(("m0", "cpu")), stats["models"])
+        self.assertIn(str(("m1", "cpu")), stats["models"])
+
+    def test_concurrent_load_once(self):
+        registry = ModelRegistry(watch=False)
+        calls = []
+        started = threading.Event()
+
+        def loader(_):
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return torch.nn.Linear(4, 4)
+
+        with ThreadPoolExecutor(4) as e:
+            networks = list(e.map(lambda _: registry.get(("a", "cpu"), None, loader), range(4)))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(n is networks[0] for n in networks))
+
+    def test_new_checkpoint_path_and_max_models(self):
+        registry = ModelRegistry(watch=False, max_models=2)
+
+        def load(p):
+            m = torch.nn.Linear(1, 1)
+            m.ckpt = p
+            return m
+
+        registry.get(("a", "cpu"), "v1.pt", load)
+        registry.get(("a", "cuda:0"), "v1.pt", load)
+
+        # new checkpoint path: current network is served until the new one is swapped in (background)
+        self.assertEqual(registry.get(("a", "cpu"), "v2.pt", load).ckpt, "v1.pt")
+        future = registry._pending.get(("a", "cpu"))
+        if future:
+            future.result()
+        self.assertEqual(registry.get(("a", "cpu"), "v2.pt", load).ckpt, "v2.pt")
+        self.assertEqual(registry.stats()["reloads"], 1)
+
+        registry.get(("b", "cpu"), None, load)
+        models = registry.stats()["models"]
+        self.assertEqual(len(models), 2)
+        self.assertNotIn(str(("a", "cuda:0")), models)
+
+    def test_reload_swap(self):
+        registry = ModelRegistry(watch=False)
+        versions = iter(range(10))
+
+        def load(_):
+            m = torch.nn.Linear(1, 1)
+            m.version = next(versions)
+            return m
+
+        current = registry.get(("a", "cpu", "eager", "int8_static"), None, load)
+        registry.get(("a", "cpu", "eager", "fp32"), None, load)
+        futures = registry.reload("a", lambda k: k[3] == "int8_static")
+        self.assertEqual(len(futures), 1)
+        self.assertIsNot(futures[0].result(), current)
+        self.assertEqual(current.version, 0)  # in-flight user of old network is not affected
+        self.assertEqual(registry.get(("a", "cpu", "eager", "int8_static"), None, load).version, 2)
+
+    def test_preload_and_reload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.pt")
+            torch.save({"v": 1}, path)
+            os.utime(path, (time.time() - 10, time.time() - 10))
+
+            registry = ModelRegistry(watch=False)
+            key = ("a", "cpu")
+
+            def loader(p):
+                m = torch.nn.Linear(1, 1)
+                m.version = torch.load(p)["v"]
+                return m
+
+            registry.preload(key, path, loader).result()
+            self.assertEqual(registry.get(key, path, loader).version, 1)
+
+            torch.save({"v": 2}, path)
+            os.utime(path, (time.time() - 5, time.time() - 5))
+
+            # stale network is returned while new one is loaded in background
+            self.assertEqual(registry.get(key, path, loader).version, 1)
+            future = registry._pending.get(key)
+            if future:
+                future.result()
+            self.assertEqual(registry.get(key, path, loader).version, 2)
+            self.assertEqual(registry.stats()["reloads"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
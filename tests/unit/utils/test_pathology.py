@@ -0,0 +1,183 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import os
+import unittest
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from monailabel.utils.others.pathology import (
+    AnnotationWriter,
+    ASAPAnnotationWriter,
+    DSAAnnotationWriter,
+    SeamMerger,
+    create_dsa_annotations_json,
+    filter_region,
+    format_points,
+)
+
+
+def tile_result(offset, labels=("Tumor", "Stroma")):
+    square = [[offset, offset], [offset + 10, offset], [offset + 10, offset + 10], [offset, offset + 10]]
+    return {
+        "annotation": {
+            "labels": {"Tumor": (255, 0, 0), "Stroma": (0, 255, 0)},
+            "elements": [{"label": label, "contours": [square, np.array(square) + 1]} for label in labels],
+        },
+        "latencies": {"total": 1},
+    }
+
+
+class TestAnnotationWriters(unittest.TestCase):
+    def test_format_points(self):
+        self.assertEqual(format_points([[1, 2], [3, 4]], "(%d,%d)", "(%r,%r)"), "(1,2)(3,4)")
+        self.assertEqual(format_points(np.array([[1.5, 2.0]]), "(%d,%d)", "(%r,%r)"), "(1.5,2.0)")
+        self.assertEqual(format_points([[5, 6]], "%d:%d,%d ", "", order=True), "0:5,6 ")
+        self.assertEqual(format_points([], "%d", "%r"), "")
+        self.assertEqual(format_points([[1.256, 2.0]], "(%d,%d)", "(%.2f,%.2f)"), "(1.26,2.00)")
+        for v in (np.nan, np.inf):
+            with self.assertRaises(ValueError):
+                format_points([[1.5, v]], "(%d,%d)", "(%.2f,%.2f)")
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            AnnotationWriter("test")
+
+    def test_non_finite(self):
+        writer = DSAAnnotationWriter("test")
+        res = tile_result(0, labels=("Tumor",))
+        res["annotation"]["elements"][0]["contours"].append([[0.5, 0.5], [np.nan, 1.0], [1.0, 1.0]])
+        self.assertEqual(writer.add(res), 2)
+        path, _ = writer.close()
+        with open(path) as fp:
+            data = json.load(fp)
+        os.unlink(path)
+        self.assertEqual(len(data["elements"]), 2)
+
+    def test_dsa(self):
+        for compress in (False, True):
+            writer = DSAAnnotationWriter("test", "desc", "model", [0, 0], [100, 100], compress=compress)
+            self.assertEqual(writer.add(tile_result(0)), 4)
+            self.assertEqual(writer.add(None), 0)
+            self.assertEqual(writer.add(tile_result(50, labels=("Tumor",))), 2)
+            path, count = writer.close({"total": 2})
+
+            self.assertEqual(count, 6)
+            self.assertEqual(path.endswith(".json.gz"), compress)
+            with (gzip.open(path, "rt") if compress else open(path)) as fp:
+                data = json.load(fp)
+            os.unlink(path)
+
+            self.assertEqual(data["name"], "test")
+            self.assertEqual(len(data["elements"]), 6)
+            self.assertEqual(data["elements"][0]["points"][1], [10, 0, 0])
+            self.assertEqual(data["elements"][1]["points"][0], [1, 1, 0])
+            self.assertEqual(data["elements"][4]["label"], {"value": "Tumor"})
+            self.assertEqual(json.loads(data["description"])["count"], 6)
+
+    def test_asap(self):
+        writer = ASAPAnnotationWriter("test", "desc", "model", compress=True)
+        writer.add(tile_result(0))
+        writer.add(tile_result(20))
+        path, count = writer.close()
+        with gzip.open(path, "rt") as fp:
+            root = ET.fromstring(fp.read())
+        os.unlink(path)
+
+        self.assertEqual(count, 8)
+        annotations = root.findall("./Annotations/Annotation")
+        self.assertEqual(len(annotations), 8)
+        self.assertEqual(annotations[4].attrib["PartOfGroup"], "Tumor")
+        coords = [c.attrib for c in annotations[4].findall("./Coordinates/Coordinate")]
+        self.assertEqual(coords[1], {"Order": "1", "X": "30", "Y": "20"})
+        self.assertEqual([g.attrib["Name"] for g in root.findall("./AnnotationGroups/Group")], ["Tumor", "Stroma"])
+
+    def test_create_dsa(self):
+        res_json = {"name": "test", "annotations": [tile_result(0), None, {}], "latencies": {"total": 1}}
+        path, count = create_dsa_annotations_json(res_json)
+        with open(path) as fp:
+            data = json.load(fp)
+        os.unlink(path)
+        self.assertEqual(count, 4)
+        self.assertEqual(len(data["elements"]), 4)
+        self.assertEqual(data["elements"][0]["group"], "Tumor")
+
+
+class TestSeamMerger(unittest.TestCase):
+    def test_merge(self):
+        merger = SeamMerger()
+        labels = {"Nuclei": (255, 0, 0)}
+
+        # object cut at seam x=100 (tile 0: x < 100; tile 1: x >= 100) and an object inside tile 0
+        left = [[90, 10], [99, 10], [99, 20], [90, 20]]
+        right = [[100, 10], [110, 10], [110, 20], [100, 20]]
+        inner = [[40, 40], [50, 40], [50, 50], [40, 50]]
+        far = [[100, 80], [105, 80], [105, 90], [100, 90]]
+
+        tile0 = {"annotation": {"labels": labels, "elements": [{"label": "Nuclei", "contours": [left, inner]}]}}
+        tile1 = {"annotation": {"labels": labels, "elements": [{"label": "Nuclei", "contours": [right, far]}]}}
+
+        res = merger.split((0, 0), (100, 100), tile0)
+        self.assertEqual(res["annotation"]["elements"][0]["contours"], [inner])
+        self.assertEqual(tile0["annotation"]["elements"][0]["contours"], [left, inner])
+
+        res = merger.split((100, 0), (100, 100), tile1)
+        self.assertEqual(res["annotation"]["elements"], [])
+
+        merged = merger.merge()
+        self.assertEqual(merged["labels"], labels)
+        contours = merged["elements"][0]["contours"]
+        self.assertEqual(len(contours), 2)
+
+        bounds = sorted((np.min(c, axis=0).tolist(), np.max(c, axis=0).tolist()) for c in contours)
+        self.assertEqual(bounds, [([90, 10], [110, 20]), ([100, 80], [105, 90])])
+        self.assertEqual(merger.stats(), {"held": 3, "merged": 2, "polygons": 2})
+
+    def test_same_tile(self):
+        merger = SeamMerger()
+        # nearby pieces at the border of the same tile are separate objects
+        a = [[97, 10], [99, 10], [99, 20], [97, 20]]
+        b = [[97, 21], [99, 21], [99, 30], [97, 30]]
+        res = {"annotation": {"elements": [{"label": "A", "contours": [a, b]}]}}
+        merger.split((0, 0), (100, 100), res)
+        self.assertEqual(len(merger.merge()["elements"][0]["contours"]), 2)
+        self.assertEqual(merger.stats()["merged"], 0)
+
+
+class TestFilterRegion(unittest.TestCase):
+    def test_filter(self):
+        inside = [[10, 10], [20, 10], [20, 20]]
+        crossing = [[45, 10], [55, 10], [55, 20]]
+        outside = [[60, 10], [70, 10], [70, 20]]
+        res = {
+            "annotation": {
+                "labels": {"A": (255, 0, 0)},
+                "elements": [
+                    {"label": "A", "contours": [inside, crossing, np.array(outside)]},
+                    {"label": "B", "contours": [outside]},
+                ],
+            },
+            "latencies": {"total": 1},
+        }
+
+        # requested region is (0, 0) - (50, 50) of an aligned tile (0, 0) - (100, 100)
+        filtered = filter_region(res, (0, 0), (50, 50))
+        self.assertEqual(filtered["annotation"]["elements"], [{"label": "A", "contours": [inside, crossing]}])
+        self.assertEqual(filtered["latencies"], {"total": 1})
+        self.assertEqual(len(res["annotation"]["elements"]), 2)
+        self.assertIsNone(filter_region(None, (0, 0), (50, 50)))
+
+
+if __name__ == "__main__":
+    unittest.main()
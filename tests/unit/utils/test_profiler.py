@@ -0,0 +1,87 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import time
+import unittest
+
+import torch
+
+from monailabel.utils.others.profiler import Profiler
+
+
+def _work():
+    x = torch.rand(64, 64)
+    for _ in range(20):
+        x = torch.matmul(x, x).clamp(0, 1)
+    time.sleep(0.05)
+    return x
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_capture(self):
+        p = Profiler(self.tmp.name, min_interval=0, stack_interval=0.005)
+        self.assertIsNone(p.capture("infer_seg", "seg", {}))
+
+        capture = p.capture("infer_seg", "seg", {"profile": "true", "image": "img1"})
+        with capture:
+            _work()
+
+        profiles = p.list()
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(profiles[0]["id"], capture.id)
+        self.assertGreater(profiles[0]["stack_samples"], 0)
+
+        path = p.get(capture.id)
+        for f in ("trace.json", "summary.txt", "stacks.txt", "info.json"):
+            self.assertTrue(os.path.exists(os.path.join(path, f)), f)
+
+        self.assertTrue(p.remove(capture.id))
+        self.assertEqual(p.list(), [])
+
+    def test_bounded(self):
+        p = Profiler(self.tmp.name, min_interval=3600)
+        capture = p.capture("infer_seg", "seg", {"profile": True})
+        self.assertIsNotNone(capture)
+
+        # one capture at a time; one capture per min_interval
+        self.assertIsNone(p.capture("infer_seg", "seg", {"profile": True}))
+        with capture:
+            pass
+        self.assertIsNone(p.capture("infer_seg", "seg", {"profile": True}))
+
+    def test_arm(self):
+        p = Profiler(self.tmp.name, min_interval=0, stack_interval=0)
+        p.arm("seg", 2)
+        self.assertIsNone(p.capture("infer_other", "other", {}))
+        for _ in range(2):
+            with p.capture("infer_seg", "seg", {}):
+                pass
+        self.assertIsNone(p.capture("infer_seg", "seg", {}))
+        self.assertEqual(p.armed(), {})
+
+    def test_max_files(self):
+        p = Profiler(self.tmp.name, min_interval=0, max_files=2, stack_interval=0)
+        for _ in range(3):
+            with p.capture("infer_seg", "seg", {"profile": True}):
+                pass
+        self.assertEqual(len(p.list()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+import unittest
+
+from monailabel.utils.async_tasks.progress import PROGRESS_PREFIX, ProgressTracker, parse_progress
+
+
+class TestProgressTracker(unittest.TestCase):
+    def test_publish(self):
+        tracker = ProgressTracker()
+        self.assertIsNone(tracker.publish("unknown", status="RUNNING"))
+
+        tracker.start("t1", "batch_infer")
+        event = tracker.publish("t1", status="RUNNING", done=5, total=20, unit="images", image="i5")
+        self.assertEqual(event["seq"], 2)
+        self.assertEqual(event["method"], "batch_infer")
+        self.assertEqual(event["progress"]["percent"], 25.0)
+        self.assertEqual(event["progress"]["image"], "i5")
+        self.assertIn("eta", event["progress"])
+
+        # progress is accumulated across events
+        event = tracker.publish("t1", done=10)
+        self.assertEqual(event["status"], "RUNNING")
+        self.assertEqual(event["progress"]["percent"], 50.0)
+        self.assertEqual(tracker.last("t1"), event)
+
+    def test_events(self):
+        tracker = ProgressTracker()
+        tracker.start("t1", "train")
+
+        def run():
+            for epoch in range(1, 4):
+                time.sleep(0.05)
+                tracker.publish("t1", status="RUNNING", done=epoch, total=3, unit="epochs")
+            tracker.publish("t1", status="DONE")
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        events = [e for e in tracker.events("t1", keepalive=0.01, timeout=10) if e]
+        thread.join()
+
+        self.assertEqual([e["seq"] for e in events], [1, 2, 3, 4, 5])
+        self.assertEqual(events[-1]["status"], "DONE")
+        self.assertEqual(events[-1]["progress"]["done"], 3)
+
+        # finished task; only events after since
+        self.assertEqual([e["seq"] for e in tracker.events("t1", since=3)], [4, 5])
+        self.assertEqual(list(tracker.events("unknown")), [])
+
+    def test_async_events(self):
+        tracker = ProgressTracker()
+        tracker.start("t1", "train")
+
+        def run():
+            for epoch in range(1, 4):
+                time.sleep(0.05)
+                tracker.publish("t1", status="RUNNING", done=epoch, total=3, unit="epochs")
+            tracker.publish("t1", status="DONE")
+
+        async def consume():
+            thread = threading.Thread(target=run)
+            thread.start()
+            events = [e async for e in tracker.aevents("t1", keepalive=5, timeout=10)]
+            thread.join()
+            return events
+
+        start = time.time()
+        events = asyncio.run(consume())
+        self.assertLess(time.time() - start, 5)  # woken up by publish (not keepalive)
+        self.assertEqual([e["seq"] for e in events], [1, 2, 3, 4, 5])
+        self.assertEqual(tracker._waiters, {})
+
+        async def collect(**kwargs):
+            return [e async for e in tracker.aevents(**kwargs)]
+
+        self.assertEqual([e["seq"] for e in asyncio.run(collect(task_id="t1", since=3))], [4, 5])
+        self.assertEqual(asyncio.run(collect(task_id="unknown")), [])
+
+    def test_cleanup(self):
+        tracker = ProgressTracker(max_tasks=2)
+        for i in range(3):
+            tracker.start(f"t{i}", "scoring")
+            tracker.publish(f"t{i}", status="DONE")
+        self.assertIsNone(tracker.last("t0"))
+        self.assertIsNotNone(tracker.last("t2"))
+
+    def test_parse_progress(self):
+        self.assertEqual(parse_progress(f'{PROGRESS_PREFIX}{{"done": 1, "total": 2}}'), {"done": 1, "total": 2})
+        self.assertIsNone(parse_progress("Epoch 1/2"))
+        self.assertIsNone(parse_progress(f"{PROGRESS_PREFIX}invalid"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from monailabel.utils.others import result_cache
+from monailabel.utils.others.result_cache import ResultCache, content_digest, slide_fingerprint
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.label = os.path.join(self.tmp.name, "label.nii.gz")
+        with open(self.label, "wb") as f:
+            f.write(b"x" * 1024)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key(self):
+        cache = ResultCache(os.path.join(self.tmp.name, "cache"))
+        k1 = cache.key("seg", "v1", "img", {"model": "seg", "image": "a", "device": "cuda", "sw_overlap": 0.5})
+        k2 = cache.key("seg", "v1", "img", {"sw_overlap": 0.5, "model": "seg", "image": "b", "device": "cpu"})
+        k3 = cache.key("seg", "v1", "img", {"model": "seg", "sw_overlap": 0.25})
+        self.assertEqual(k1, k2)
+        self.assertNotEqual(k1, k3)
+        self.assertIsNone(cache.key("seg", "v1", "img", {"points": object()}))
+
+    def test_put_get(self):
+        path = os.path.join(self.tmp.name, "cache")
+        cache = ResultCache(path)
+        key = cache.key("seg", "v1", "img", {})
+        self.assertIsNone(cache.get(key))
+
+        cache.put(key, "seg", "v1", self.label, {"label_names": ["spleen"]})
+        result_file, result_json = cache.get(key)
+        self.assertTrue(result_file.endswith(".nii.gz"))
+        self.assertEqual(os.path.getsize(result_file), 1024)
+        self.assertEqual(result_json["label_names"], ["spleen"])
+
+        # caller can update/remove returned file (or its own result file); cached one is not shared
+        with open(result_file, "ab") as f:
+            f.write(b"y")
+        with open(self.label, "ab") as f:
+            f.write(b"y")
+        os.unlink(result_file)
+        result_file, _ = ResultCache(path).get(key)
+        self.assertEqual(os.path.getsize(result_file), 1024)
+
+    def test_invalidate_on_new_version(self):
+        cache = ResultCache(os.path.join(self.tmp.name, "cache"))
+        k1 = cache.key("seg", "v1", "img", {})
+        k2 = cache.key("seg", "v2", "img", {})
+        cache.put(k1, "seg", "v1", self.label, {})
+        cache.put(k2, "seg", "v2", self.label, {})
+        self.assertIsNone(cache.get(k1))
+        self.assertIsNotNone(cache.get(k2))
+
+    def test_eviction(self):
+        cache = ResultCache(os.path.join(self.tmp.name, "cache"), max_size=1)
+        with open(self.label, "wb") as f:
+            f.write(b"x" * 400 * 1024)
+
+        keys = [cache.key(f"m{i}", "v1", "img", {}) for i in range(3)]
+        for i, k in enumerate(keys):
+            cache.put(k, f"m{i}", "v1", self.label, {})
+
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_tile_key(self):
+        cache = ResultCache(os.path.join(self.tmp.name, "tiles"))
+        tile = {"model": "nuclei", "level": 0, "location": (1024, 0), "size": (1024, 1024), "min_poly_area": 80}
+        k1 = cache.tile_key("nuclei", "v1", "slide", {**tile, "id": 3, "device": "cuda:0", "output": "dsa"})
+        k2 = cache.tile_key("nuclei", "v1", "slide", {**tile, "id": 0, "device": "cuda:1", "output": "asap"})
+        self.assertEqual(k1, k2)
+        self.assertNotEqual(k1, cache.tile_key("nuclei", "v1", "slide", {**tile, "location": (0, 0)}))
+        self.assertNotEqual(k1, cache.tile_key("nuclei", "v1", "slide", {**tile, "level": 1}))
+        self.assertNotEqual(k1, cache.tile_key("nuclei", "v1", "slide2", tile))
+
+        # compact (contours only) results
+        cache.put(k1, "nuclei", "v1", None, {"annotation": {"elements": [{"label": "N", "contours": [[[0, 0]]]}]}})
+        result_file, result_json = cache.get(k2)
+        self.assertIsNone(result_file)
+        self.assertEqual(result_json["annotation"]["elements"][0]["label"], "N")
+
+    def test_content_digest(self):
+        d1 = content_digest(self.label)
+        self.assertEqual(d1, content_digest(self.label))
+        with open(self.label, "ab") as f:
+            f.write(b"y")
+        self.assertNotEqual(d1, content_digest(self.label))
+
+    def test_content_digest_lru(self):
+        files = [os.path.join(self.tmp.name, f"image{i}.nii.gz") for i in range(3)]
+        for i, f in enumerate(files):
+            with open(f, "wb") as fc:
+                fc.write(bytes([i]) * 1024)
+
+        with mock.patch.object(result_cache, "MAX_DIGESTS", 2):
+            digests = [content_digest(f) for f in files]
+            self.assertEqual(len(set(digests)), 3)
+            self.assertEqual(list(result_cache._digests)[-2:], files[1:])
+            self.assertLessEqual(len(result_cache._digests), 2)
+
+    def test_slide_fingerprint(self):
+        slide = os.path.join(self.tmp.name, "slide.tif")
+        with open(slide, "wb") as f:
+            f.write(os.urandom(1024 * 1024))
+        f1 = slide_fingerprint(slide, chunk=1024, samples=4)
+        self.assertEqual(f1, slide_fingerprint(slide, chunk=1024, samples=4))
+
+        stat = os.stat(slide)
+        with open(slide, "r+b") as f:
+            f.write(b"header")
+        os.utime(slide, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertNotEqual(f1, slide_fingerprint(slide, chunk=1024, samples=4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from monailabel.utils.others.slides import SlidePool, TileReadAhead, TissueDetector, TissueMask, otsu_threshold
+
+
+class FakeSlide:
+    opened = 0
+
+    def __init__(self, path):
+        FakeSlide.opened += 1
+        self.path = path
+        self.dimensions = (1000, 800)
+        self.reads = []
+        self.closed = False
+
+    def read_region(self, location, level, size):
+        assert not self.closed
+        self.reads.append((location, level, size))
+        return {"location": location, "size": size}
+
+    def get_thumbnail(self, size):
+        # left half is tissue (pink); right half is glass (white)
+        img = np.full((80, 100, 3), 240, dtype=np.uint8)
+        img[:, :50] = (200, 80, 160)
+        return Image.fromarray(img)
+
+    def close(self):
+        self.closed = True
+
+
+class TestSlidePool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.tmpdir.name, f"s{i}.svs")
+            with open(path, "w") as f:
+                f.write("x")
+            self.paths.append(path)
+        FakeSlide.opened = 0
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_reuse_and_lru(self):
+        pool = SlidePool(max_open=2, opener=FakeSlide)
+        self.assertEqual(pool.dimensions(self.paths[0]), (1000, 800))
+        pool.read_region(self.paths[0], (0, 0), 0, (10, 10))
+        self.assertEqual(FakeSlide.opened, 1)
+
+        with pool.open(self.paths[1]) as s1:
+            pool.dimensions(self.paths[2])  # evicts s0 (lru); s1 is in use
+            pool.dimensions(self.paths[0])  # evicts s1; closed only when released
+            self.assertFalse(s1.closed)
+        self.assertTrue(s1.closed)
+        self.assertEqual(pool.stats()["open"], 2)
+
+        # modified file is re-opened
+        opened = FakeSlide.opened
+        with open(self.paths[0], "w") as f:
+            f.write("modified")
+        pool.dimensions(self.paths[0])
+        self.assertEqual(FakeSlide.opened, opened + 1)
+
+        pool.clear()
+        self.assertEqual(pool.stats()["open"], 0)
+
+    def test_no_pool(self):
+        pool = SlidePool(max_open=0, opener=FakeSlide)
+        with pool.open(self.paths[0]) as s:
+            pass
+        self.assertTrue(s.closed)
+        pool.dimensions(self.paths[0])
+        self.assertEqual(FakeSlide.opened, 2)
+
+    def test_read_ahead(self):
+        pool = SlidePool(max_open=2, opener=FakeSlide)
+        tasks = [{"id": i, "image": self.paths[0], "location": (i * 10, 0), "size": (10, 10)} for i in range(6)]
+
+        read_ahead = TileReadAhead(tasks, depth=2, pool=pool).start()
+        for t in tasks:
+            read_ahead.advance(t["id"])
+            r = pool.read_region(t["image"], t["location"], 0, t["size"])
+            self.assertEqual(r["location"], t["location"])
+        read_ahead.close()
+
+        stats = pool.stats()
+        self.assertEqual(stats["prefetched"], 6)
+        self.assertEqual(stats["prefetch_hits"], 6)
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(FakeSlide.opened, 1)
+
+    def test_read_ahead_unused(self):
+        pool = SlidePool(max_open=2, opener=FakeSlide)
+        tasks = [{"id": i, "image": self.paths[0], "location": (i * 10, 0), "size": (10, 10)} for i in range(10)]
+
+        read_ahead = TileReadAhead(tasks, depth=2, pool=pool).start()
+        for t in tasks:
+            read_ahead.advance(t["id"])
+        self.assertLess(pool.stats()["prefetched"], 10)
+        self.assertEqual(pool.stats()["pending"], 0)
+
+
+class TestTissue(unittest.TestCase):
+    def test_otsu(self):
+        values = np.concatenate([np.full(100, 10), np.full(100, 200)]).astype(np.uint8)
+        t = otsu_threshold(values)
+        self.assertTrue(10 <= t < 200)
+
+    def test_mask(self):
+        mask = TissueMask(np.array([[1, 0], [1, 0]], dtype=bool), (10.0, 10.0))
+        self.assertEqual(mask.fraction((0, 0), (10, 20)), 1.0)
+        self.assertEqual(mask.fraction((10, 0), (10, 20)), 0.0)
+        self.assertEqual(mask.fraction((0, 0), (20, 20)), 0.5)
+        self.assertEqual(mask.fraction((100, 100), (10, 10)), 0.0)
+
+    def test_detector(self):
+        with tempfile.NamedTemporaryFile(suffix=".svs") as f:
+            detector = TissueDetector(SlidePool(opener=FakeSlide))
+            m = detector.detect(f.name)
+            self.assertIs(detector.detect(f.name), m)
+            self.assertAlmostEqual(m.tissue, 0.5)
+            self.assertGreater(m.fraction((0, 0), (400, 800)), 0.9)
+            self.assertLess(m.fraction((600, 0), (400, 800)), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from monailabel.utils.others.planner import HeuristicPlanner, SlidingWindowPlanner, _num_windows
+
+
+class TestSlidingWindowPlanner(unittest.TestCase):
+    def test_overlap(self):
+        planner = SlidingWindowPlanner()
+        # 0.25 overlap needs 3 windows; plan keeps 2 windows with the max possible overlap
+        self.assertEqual(_num_windows(225, 128, 0.25), 3)
+        overlap = planner._overlap(225, 128, 0.25)
+        self.assertLess(overlap, 0.25)
+        self.assertEqual(_num_windows(225, 128, overlap), 2)
+
+        self.assertEqual(planner._overlap(300, 128, 0.25), 0.25)
+        self.assertEqual(planner._overlap(100, 128, 0.25), 0.0)
+
+    def test_plan(self):
+        planner = SlidingWindowPlanner(max_batch_size=4)
+        network = torch.nn.Conv3d(1, 3, 3, padding=1).eval()
+
+        plan = planner.plan("m", network, (1, 200, 200, 40), (64, 64, 64), "cpu")
+        self.assertListEqual(plan["roi_size"], [64, 64, 48])
+        self.assertEqual(plan["device"], "cpu")
+        self.assertGreaterEqual(plan["sw_batch_size"], 1)
+        self.assertLessEqual(plan["sw_batch_size"], 4)
+        self.assertEqual(len(planner._measurements), 1)
+
+        planner.plan("m", network, (1, 300, 300, 40), (64, 64, 64), "cpu")
+        self.assertEqual(len(planner._measurements), 1)
+
+        planner.clear("m")
+        self.assertEqual(len(planner._measurements), 0)
+
+    def test_heuristic_spatial_size(self):
+        planner = SlidingWindowPlanner(spatial_size=(32, 32, 16))
+        self.assertIsInstance(planner, HeuristicPlanner)
+
+        network = torch.nn.Conv3d(1, 3, 3, padding=1).eval()
+        plan = planner.plan("m", network, (1, 100, 100, 40), None, "cpu")
+        self.assertListEqual(plan["roi_size"], [32, 32, 16])
+
+    def test_measure_cpu_activations(self):
+        planner = SlidingWindowPlanner()
+        network = torch.nn.Sequential(torch.nn.Conv3d(1, 8, 3, padding=1), torch.nn.ReLU()).eval()
+        m = planner.measure("m", network, 1, (32, 32, 32), "cpu")
+        # input + conv output + relu output (allocator reuse does not hide activations on cpu)
+        self.assertEqual(m["window"], 4 * 32**3 * (1 + 8 + 8))
+
+        plan = planner.plan("m", network, (1, 32, 32, 32), (32, 32, 32), "cpu")
+        self.assertEqual(plan["window_mb"], round(m["window"] / (1024 * 1024), 2))
+
+    def test_measure_once_per_key(self):
+        planner = SlidingWindowPlanner()
+        calls = []
+        lock = threading.Lock()
+
+        class Net(torch.nn.Module):
+            def forward(self, x):
+                with lock:
+                    calls.append(1)
+                return x
+
+        network = Net()
+        with ThreadPoolExecutor(4) as e:
+            list(e.map(lambda _: planner.measure("m", network, 1, (8, 8, 8), "cpu"), range(4)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(planner._key_locks), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+from monailabel.utils.async_tasks.trigger import CoalescingTrigger
+
+
+class TestCoalescingTrigger(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runs = []
+        self.ran = threading.Event()
+
+    def run_fn(self, key, images):
+        self.runs.append((key, images))
+        self.ran.set()
+
+    def test_coalesce(self):
+        trigger = CoalescingTrigger(self.run_fn, debounce=0.05, min_interval=0)
+        trigger.trigger("dice", ["b"])
+        trigger.trigger("dice", ["a", "b"])
+        trigger.trigger("sum", ["c"])
+        self.assertTrue(self.ran.wait(2))
+        time.sleep(0.1)
+
+        self.assertEqual(sorted(self.runs), [("dice", ["a", "b"]), ("sum", ["c"])])
+        self.assertEqual(trigger.stats(), {"triggers": 3, "runs": 2, "coalesced": 1, "skipped": 0, "pending": 0})
+
+    def test_all_images(self):
+        trigger = CoalescingTrigger(self.run_fn, debounce=10, min_interval=0)
+        trigger.trigger("dice", ["a"])
+        trigger.trigger("dice")
+        trigger.trigger("dice", ["b"])
+        trigger.flush()
+        self.assertEqual(self.runs, [("dice", None)])
+
+    def test_rate_limit_and_busy(self):
+        busy = [True]
+        trigger = CoalescingTrigger(self.run_fn, debounce=0.01, min_interval=10, busy=lambda k: busy[0])
+        trigger.flush()  # nothing pending
+        self.assertEqual(self.runs, [])
+
+        trigger.trigger("dice", ["a"])
+        time.sleep(0.1)
+        self.assertEqual(self.runs, [])  # postponed while busy
+
+        busy[0] = False
+        self.assertTrue(self.ran.wait(3))
+        self.assertEqual(self.runs, [("dice", ["a"])])
+
+        # next run is not before min_interval
+        self.assertGreater(trigger._delay("dice"), 5)
+        trigger.trigger("dice", ["b"])
+        time.sleep(0.1)
+        self.assertEqual(len(self.runs), 1)
+        trigger.cancel()
+        self.assertEqual(trigger.stats()["pending"], 0)
+
+    def test_skipped_run(self):
+        trigger = CoalescingTrigger(lambda k, images: False, debounce=10, min_interval=10)
+        trigger.trigger("epistemic", ["a"])
+        trigger.flush()
+        self.assertEqual(trigger.stats(), {"triggers": 1, "runs": 0, "coalesced": 0, "skipped": 1, "pending": 0})
+        # nothing was run; so next run is not rate limited
+        self.assertEqual(trigger._delay("epistemic"), 10)
+        self.assertNotIn("epistemic", trigger._last_run)
+
+
+if __name__ == "__main__":
+    unittest.main()
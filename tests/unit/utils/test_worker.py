@@ -0,0 +1,84 @@
+# Copyright (c) MONAI Consortium
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import unittest
+
+from monailabel.utils.async_tasks.worker import TASK_DONE_PREFIX, TASK_START_PREFIX, WorkerPool, parse_task_done
+
+# minimal worker: echoes the task between start/done lines (ERROR if request asks to fail); logs outside tasks
+WORKER = f"""
+import json, os, sys
+print("ready", flush=True)
+for line in sys.stdin:
+    m = json.loads(line)
+    print("{TASK_START_PREFIX}" + json.dumps({{"id": m["id"]}}), flush=True)
+    print("running", m["id"], m["method"], os.getpid(), flush=True)
+    status = "ERROR" if m["request"].get("fail") else "DONE"
+    print("{TASK_DONE_PREFIX}" + json.dumps({{"id": m["id"], "status": status}}), flush=True)
+    print("idle", m["id"], flush=True)
+"""
+
+
+def run_task(pool, task_id, request=None):
+    worker = pool.acquire("scoring", dict(os.environ))
+    worker.submit(task_id, "scoring", request if request else {})
+    lines = []
+    while True:
+        line = worker.readline().rstrip()
+        done = parse_task_done(line)
+        if done:
+            break
+        lines.append(line)
+    pool.release(worker, ok=done["status"] == "DONE")
+    return worker, lines, done
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = WorkerPool(max_tasks=3, idle_timeout=0, cmd=[sys.executable, "-c", WORKER])
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+
+    def test_reuse_and_recycle(self):
+        w1, lines, done = run_task(self.pool, "t1")
+        self.assertEqual(done, {"id": "t1", "status": "DONE"})
+        self.assertEqual(lines[0].split()[:3], ["running", "t1", "scoring"])
+
+        # output printed between tasks is not attributed to the next task
+        w2, lines, _ = run_task(self.pool, "t2")
+        self.assertIs(w1, w2)
+        self.assertEqual([line.split()[:2] for line in lines], [["running", "t2"]])
+        self.assertTrue(w1.alive())
+
+        w3, _, _ = run_task(self.pool, "t3")
+        self.assertIs(w1, w3)
+        self.assertFalse(w3.alive())  # recycled after max tasks
+
+        w4, _, _ = run_task(self.pool, "t4")
+        self.assertIsNot(w1, w4)
+        self.assertNotEqual(w1.pid, w4.pid)
+
+    def test_recycle_on_failure(self):
+        w1, _, done = run_task(self.pool, "t1", {"fail": True})
+        self.assertEqual(done["status"], "ERROR")
+        self.assertFalse(w1.alive())
+        self.assertEqual(self.pool.stats(), {})
+
+    def test_parse(self):
+        self.assertIsNone(parse_task_done("some log line"))
+        self.assertIsNone(parse_task_done(TASK_DONE_PREFIX + "{bad"))
+
+
+if __name__ == "__main__":
+    unittest.main()